@@ -82,9 +82,18 @@ class DriverUnsupportedState(LoopsterException):
     msg_template = "Driver %(driver)r doesn't support %(state)r state."
 
 
+class DriverNotFound(LoopsterException):
+
+    msg_template = "Driver with %(name)r name is not found."
+
+
 class ServiceWaitTimeoutError(LoopsterException):
     msg_template = "Service %(target_uuid)s wait timed out after %(timeout)d."
 
 
 class UnexpectedServiceState(LoopsterException):
     msg_template = "Service %(target_uuid)s is in illegal state %(state)s."
+
+
+class StepTimeout(LoopsterException):
+    msg_template = "Step execution deadline is exceeded."
@@ -18,7 +18,11 @@
 import copy
 import logging
 
+import six
+
 from loopster import exceptions
+from loopster.hubs.drivers import multi
+from loopster.services import schedulers
 from loopster.services import softirq
 from loopster import states
 from loopster import units
@@ -26,43 +30,71 @@ from loopster import units
 
 LOG = logging.getLogger(__name__)
 
+# fractional part of the golden ratio, consecutive multiples of it are
+# spread evenly over [0, 1) for any number of units
+GOLDEN_RATIO_FRACTION = 0.6180339887498949
+
 
 class BaseHub(softirq.SoftIrqService):
     """This object can manage many services with one strategy by driver.
 
     BaseHub is a SoftIrqService too itself.
 
-    :param driver: preferred driver to use
-    :type driver: class:`loopster.hubs.drivers.base.BaseDriver`
+    :param driver: preferred driver to use or drivers by name, units are
+        routed to them by their `driver` attribute
+    :type driver: class:`loopster.hubs.drivers.base.BaseDriver` or dict
     :param controller: preferred controller to use
     :type controller: class:`loopster.hubs.controllers.base.AbstractController`
     :param step_period: minimal period of step before start next one,
         defaults to 1
     :type step_period: float, optional
-    :param loop_period: pause between each steps, defaults to 0.1
+    :param loop_period: max pause between checks of the step schedule,
+        defaults to 0 - wait for the next step or a wakeup
     :type loop_period: float, optional
+    :param schedule_mode: step scheduling mode, defaults to `fixed_rate`
+    :type schedule_mode: str, optional
     :param sender: Sender to use in Camel
     :type sender: class:`camel.senders.DPPSender`, optional
     :param event_type: Event type for camel sender
     :type event_type: str, optional
     :param error_event_type: Error event type for camel sender
     :type error_event_type: str, optional
+    :param phase_spread: spread start phases of soft IRQ services evenly
+        over their step periods, so they don't run steps simultaneously,
+        defaults to False
+    :type phase_spread: bool, optional
+    :param shutdown_timeout: overall time given to services to stop on
+        shutdown, they are stopped and waited for concurrently and the ones
+        still running after it are killed, defaults to None - stop and wait
+        for services one by one
+    :type shutdown_timeout: float, optional
     """
 
-    def __init__(self, driver, controller, step_period=1, loop_period=0.1,
-                 sender=None, event_type=None, error_event_type=None,
-                 watchdog=None):
+    def __init__(self, driver, controller, step_period=1, loop_period=0,
+                 schedule_mode=schedulers.FIXED_RATE, sender=None,
+                 event_type=None, error_event_type=None, watchdog=None,
+                 phase_spread=False, shutdown_timeout=None):
         super(BaseHub, self).__init__(
             step_period=step_period,
             loop_period=loop_period,
+            schedule_mode=schedule_mode,
             sender=sender,
             event_type=event_type,
             error_event_type=error_event_type,
             watchdog=watchdog,
         )
         self._units = {}
+        if isinstance(driver, dict):
+            driver = multi.MultiDriver(drivers=driver)
         self._driver = driver
         self._controller = controller
+        self._phase_spread = phase_spread
+        self._next_phase = 0.0
+        self._shutdown_timeout = shutdown_timeout
+        exit_fd = driver.fileno()
+        if exit_fd is not None:
+            # react on service exits without waiting for the next step
+            self._waker.add_reader(exit_fd, self._on_service_exit)
 
     def _get_unit(self, unit_uuid):
         try:
@@ -77,6 +109,32 @@ class BaseHub(softirq.SoftIrqService):
         """
         return {unit.uuid: unit.state for unit in self._units.values()}
 
+    def get_unit_stats(self):
+        """Get step statistics of units
+
+        Statistics are read from shared memory of services, so this call
+        doesn't communicate with service processes.
+
+        :return: a Dict with {unit.uuid: stats} key: values, where stats
+            contain count, overruns, skipped, mean, max and p50/p90/p99 step
+            durations in seconds
+        """
+        return self._driver.get_services_stats()
+
+    def _get_svc_kwargs(self, unit):
+        """Complete service kwargs with scheduling parameters of the unit"""
+        if not issubclass(unit.svc_class, softirq.SoftIrqService):
+            return unit.svc_kwargs
+        svc_kwargs = dict(unit.svc_kwargs)
+        if svc_kwargs.get('jitter_mode') == schedulers.JITTER_HASH:
+            svc_kwargs.setdefault('jitter_key', str(unit.uuid))
+        if self._phase_spread and 'start_delay' not in svc_kwargs:
+            svc_kwargs['start_delay'] = (
+                self._next_phase * svc_kwargs.get('step_period', 1))
+            self._next_phase = (
+                self._next_phase + GOLDEN_RATIO_FRACTION) % 1
+        return svc_kwargs
+
     def add_unit(self, unit):
         """Add unit to serve
 
@@ -87,8 +145,18 @@ class BaseHub(softirq.SoftIrqService):
             raise exceptions.UnitExists(unit_uuid=unit.uuid)
         self._driver.validate_target_state(unit.state)
         new_unit = copy.copy(unit)
+        extra = {}
+        if new_unit.recycle is not None:
+            extra['recycle'] = new_unit.recycle
+        if new_unit.driver is not None:
+            if not isinstance(self._driver, multi.MultiDriver):
+                raise ValueError(
+                    "Unit %s is routed to %r driver, but the hub has no "
+                    "named drivers" % (new_unit.uuid, new_unit.driver))
+            extra['driver'] = new_unit.driver
         self._driver.add_service(
-            new_unit.uuid, new_unit.svc_class, new_unit.svc_kwargs)
+            new_unit.uuid, new_unit.svc_class, self._get_svc_kwargs(new_unit),
+            **extra)
         self._units[unit.uuid] = new_unit
         self._l(LOG).info("Unit was added: %r", new_unit)
         return copy.copy(self._units[unit.uuid])
@@ -126,10 +194,19 @@ class BaseHub(softirq.SoftIrqService):
         del self._units[unit.uuid]
         self._l(LOG).info("Unit was removed: %r", unit)
 
+    def _on_service_exit(self):
+        exited = self._driver.collect_exits()
+        if exited and self._has_running:
+            self._l(LOG).info("Targets %s have exited, managing state now",
+                              ', '.join(str(u) for u in exited))
+            self._next_step_delta = 0
+
     def _step(self):
         self._l(LOG).debug("Managing state...")
         try:
             self._controller.manage(self, self._driver)
+            if self._has_running:
+                self._driver.recycle_services()
         except exceptions.StopHub as e:
             self._l(LOG).info(e)
             self.stop()
@@ -155,6 +232,15 @@ class BaseHub(softirq.SoftIrqService):
 
     def _shutdown(self):
         self._l(LOG).info("Shutting down...")
+        if self._shutdown_timeout is not None:
+            self._l(LOG).info("Shutting down all services in %ss...",
+                              self._shutdown_timeout)
+            report = self._driver.shutdown_all_services(
+                timeout=self._shutdown_timeout)
+            for target_uuid, target_report in six.iteritems(report):
+                self._l(LOG).info("Target %s has been shut down: %s",
+                                  target_uuid, target_report)
+            return
         self._l(LOG).info("Stopping all services...")
         self._driver.stop_all_services()
         self._l(LOG).info("Waiting all services...")
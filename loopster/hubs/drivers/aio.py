@@ -0,0 +1,219 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import logging
+import threading
+import time
+
+from loopster.hubs.drivers import launch as launch_driver
+from loopster.services import softirq_async
+from loopster import states
+
+
+LOG = logging.getLogger(__name__)
+
+SERVICE_KEY = launch_driver.SERVICE_KEY
+LAUNCH_KEY = 'launch'
+# keys of the launch state shared with the event loop thread
+TASK_KEY = 'task'
+DONE_KEY = 'done'
+ERRORS_KEY = 'errors'
+# period of event loop lag measurement
+LOOP_LAG_INTERVAL = 0.1
+# time to wait for a cancelled task
+KILL_TIMEOUT = 0.1
+
+
+class AsyncioDriver(launch_driver.LaunchDriver):
+    """Driver to serve coroutine services as tasks of one event loop
+
+    Services must be subclasses of
+    class:`loopster.services.softirq_async.AsyncSoftIrqService`, they are
+    served by `serve_operational_async()` as tasks of the event loop run by
+    the driver in a thread of the hub process, so hundreds of small
+    services cost neither a process nor a thread each.
+
+    A stopped service gets `stop_timeout` seconds to finish gracefully and
+    then its task is cancelled, a task of a NUMB service is cancelled at
+    once. Watchdogs of services are loop-lag-aware: heartbeats are stale
+    for all services when the loop itself is blocked (e.g. by synchronous
+    code of one of them), so services aren't treated as NUMB while the lag
+    of the loop exceeds `max_loop_lag`.
+
+    :param stop_timeout: time given to a service to finish after stop
+        before its task is cancelled, None waits without limit, defaults
+        to 0
+    :type stop_timeout: float, optional
+    :param max_loop_lag: max lag of the event loop to trust watchdogs of
+        services, defaults to 1
+    :type max_loop_lag: float, optional
+    """
+
+    def __init__(self, stop_timeout=0, max_loop_lag=1):
+        super(AsyncioDriver, self).__init__(stop_timeout=stop_timeout)
+        self._max_loop_lag = max_loop_lag
+        self._loop_lag = 0
+        self._loop_tick_at = time.monotonic()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop,
+                                        name='loopster-asyncio-driver')
+        self._thread.daemon = True
+        self._thread.start()
+
+    # event loop thread
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.create_task(self._measure_loop_lag())
+        self._loop.run_forever()
+
+    async def _measure_loop_lag(self):
+        while True:
+            started_at = time.monotonic()
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self._loop_tick_at = time.monotonic()
+            self._loop_lag = (self._loop_tick_at - started_at
+                              - LOOP_LAG_INTERVAL)
+
+    async def _run_service(self, target_uuid, svc, launch):
+        try:
+            await svc.serve_operational_async()
+        except asyncio.CancelledError:
+            self._l(LOG).info("Task of target %s has been cancelled",
+                              target_uuid)
+        except Exception as e:
+            launch[ERRORS_KEY].append(e)
+            self._l(LOG).exception("Service of target %s has failed",
+                                   target_uuid)
+
+    def _create_task(self, target_uuid, svc, launch):
+        task = self._loop.create_task(
+            self._run_service(target_uuid, svc, launch))
+        task.add_done_callback(lambda _: launch[DONE_KEY].set())
+        launch[TASK_KEY] = task
+
+    def _cancel_task(self, launch, delay=0):
+        task = launch[TASK_KEY]
+        if delay:
+            self._loop.call_later(delay, task.cancel)
+        else:
+            task.cancel()
+
+    def get_loop_lag(self):
+        """Return current lag of the event loop in seconds
+
+        The lag grows while the loop is blocked, even before it's measured.
+        """
+        return max(self._loop_lag,
+                   time.monotonic() - self._loop_tick_at - LOOP_LAG_INTERVAL)
+
+    def close(self):
+        """Stop the event loop, running tasks of services are cancelled"""
+        if self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        if hasattr(asyncio, 'all_tasks'):
+            tasks = asyncio.all_tasks(self._loop)
+        else:
+            # asyncio.all_tasks() appeared in Python 3.7
+            tasks = asyncio.Task.all_tasks(self._loop)
+        for task in tasks:
+            task.cancel()
+        self._loop.run_until_complete(
+            asyncio.gather(*tasks, return_exceptions=True))
+        self._loop.close()
+
+    # utility methods
+
+    def _init_service(self, target_uuid, svc_storage):
+        super(AsyncioDriver, self)._init_service(target_uuid, svc_storage)
+        svc = svc_storage[launch_driver.SERVICE_CLASS_KEY](
+            **svc_storage[launch_driver.SERVICE_KWARGS_KEY])
+        svc.unit_uuid = target_uuid
+        # the hub must not be killed when the event loop thread exits
+        svc.pdeathsig = False
+        svc_storage.update({
+            SERVICE_KEY: svc,
+            # launch state is replaced on restart, so callbacks of the
+            # previous task don't affect the next one
+            LAUNCH_KEY: None,
+        })
+
+    # launch implementation
+
+    def _start_launch(self, target_uuid, svc_storage):
+        launch = {
+            TASK_KEY: None,
+            DONE_KEY: threading.Event(),
+            ERRORS_KEY: [],
+        }
+        svc_storage[LAUNCH_KEY] = launch
+        self._loop.call_soon_threadsafe(
+            self._create_task, target_uuid, svc_storage[SERVICE_KEY], launch)
+
+    def _get_launch_state(self, svc_storage):
+        launch = svc_storage[LAUNCH_KEY]
+        if launch is None:
+            return states.State.INITIAL
+        if not launch[DONE_KEY].is_set():
+            return states.State.RUNNING
+        if launch[ERRORS_KEY]:
+            return states.State.FAILED
+        return states.State.STOPPED
+
+    def _join_launch(self, svc_storage, timeout):
+        return svc_storage[LAUNCH_KEY][DONE_KEY].wait(timeout)
+
+    def _is_numb(self, target_uuid, svc_storage):
+        if not super(AsyncioDriver, self)._is_numb(target_uuid, svc_storage):
+            return False
+        loop_lag = self.get_loop_lag()
+        if loop_lag <= self._max_loop_lag:
+            return True
+        self._l(LOG).warning(
+            "Event loop lags for %0.3f seconds, watchdog of target "
+            "%s isn't trusted", loop_lag, target_uuid)
+        return False
+
+    # service management (from hub/controller)
+
+    def _add_service(self, target_uuid, svc_storage):
+        if not issubclass(svc_storage[launch_driver.SERVICE_CLASS_KEY],
+                          softirq_async.AsyncSoftIrqService):
+            raise ValueError("Service class must be a subclass of "
+                             "AsyncSoftIrqService: %r"
+                             % svc_storage[launch_driver.SERVICE_CLASS_KEY])
+        super(AsyncioDriver, self)._add_service(target_uuid, svc_storage)
+
+    def _stop_service(self, target_uuid, svc_storage):
+        super(AsyncioDriver, self)._stop_service(target_uuid, svc_storage)
+        svc_storage[SERVICE_KEY].stop()
+        launch = svc_storage[LAUNCH_KEY]
+        if launch is not None and self._stop_timeout is not None:
+            self._loop.call_soon_threadsafe(self._cancel_task, launch,
+                                            self._stop_timeout)
+
+    def _kill_service(self, target_uuid, svc_storage):
+        launch = svc_storage[LAUNCH_KEY]
+        self._l(LOG).warning("Cancelling task of target %s...", target_uuid)
+        self._loop.call_soon_threadsafe(self._cancel_task, launch)
+        if not launch[DONE_KEY].wait(KILL_TIMEOUT):
+            self._l(LOG).error("Task of target %s hasn't been cancelled in "
+                               "%ss", target_uuid, KILL_TIMEOUT)
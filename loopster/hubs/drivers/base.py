@@ -17,6 +17,7 @@
 
 import abc
 import logging
+import time
 
 from loopster.common import obj
 import six
@@ -43,7 +44,7 @@ class AbstractDriver(obj.BaseObject):
         return NotImplementedError()
 
     @abc.abstractmethod
-    def add_service(self, target_uuid, svc_class, svc_kwargs):
+    def add_service(self, target_uuid, svc_class, svc_kwargs, recycle=None):
         return NotImplementedError()
 
     @abc.abstractmethod
@@ -66,6 +67,59 @@ class AbstractDriver(obj.BaseObject):
     def wait_all_services(self):
         return NotImplementedError()
 
+    def wakeup_all_services(self):
+        """Interrupt waiting of all services (e.g. to notice signum)"""
+        pass
+
+    def get_services_stats(self):
+        """Return statistics of services which support it
+
+        return: a Dict with uuid:service_stats
+        """
+        return {}
+
+    def recycle_services(self):
+        """Replace services exceeding limits of their recycle policies"""
+        pass
+
+    def fileno(self):
+        """Return descriptor readable on service exits
+
+        The descriptor may be waited for by the hub to collect exits with
+        `collect_exits()` without delay.
+
+        :return: the descriptor or None if exits are noticed by polling only
+        """
+        return None
+
+    def collect_exits(self):
+        """Collect exits of services notified since the last call
+
+        return: a List of uuids of exited services
+        """
+        return []
+
+    def shutdown_all_services(self, timeout=None):
+        """Stop all services and wait for them within overall deadline
+
+        The default implementation can't interrupt services, so it stops
+        them and waits for all of them without limit.
+
+        :param timeout: overall time given to services to stop
+        :type timeout: float, optional
+
+        return: a Dict with uuid:report, where report contains the final
+            `state`, `duration` of the stop in seconds and `killed` flag
+        """
+        started_at = time.monotonic()
+        self.stop_all_services()
+        self.wait_all_services()
+        duration = time.monotonic() - started_at
+        return {target_uuid: {'state': state,
+                              'killed': False,
+                              'duration': duration}
+                for target_uuid, state in six.iteritems(self.get_states())}
+
 
 @six.add_metaclass(abc.ABCMeta)
 class BaseDriver(AbstractDriver):
@@ -137,7 +191,7 @@ class BaseDriver(AbstractDriver):
     def _add_service(self, target_uuid, svc_storage):
         raise NotImplementedError()
 
-    def add_service(self, target_uuid, svc_class, svc_kwargs):
+    def add_service(self, target_uuid, svc_class, svc_kwargs, recycle=None):
         """Add new service and store it inside driver
 
         :param target_uuid: Target UUID
@@ -146,6 +200,9 @@ class BaseDriver(AbstractDriver):
         :type svc_class: class:`loopster.services.base.AbstractService`
         :param svc_kwargs: optional keyword arguments for the service instance
         :type svc_kwargs: dict, optional
+        :param recycle: limits of service launches, they are applied by
+            drivers supporting recycling
+        :type recycle: class:`loopster.units.RecyclePolicy`, optional
         """
         if target_uuid in self._services:
             raise exceptions.ServiceExists(target_uuid=target_uuid)
@@ -153,6 +210,7 @@ class BaseDriver(AbstractDriver):
         svc_storage = {
             'svc_class': svc_class,
             'svc_kwargs': svc_kwargs,
+            'recycle': recycle,
         }
         self._add_service(target_uuid, svc_storage)
         self._services[target_uuid] = svc_storage
@@ -203,6 +261,51 @@ class BaseDriver(AbstractDriver):
         self._l(LOG).info("Waiting target %s...", target_uuid)
         self._wait_service(target_uuid, self._services[target_uuid])
 
+    def _get_shutdown_report(self, target_uuid, svc_storage):
+        return {
+            'state': self._get_service_state(target_uuid, svc_storage),
+            'killed': False,
+        }
+
+    def shutdown_all_services(self, timeout=None):
+        """Stop all services and wait for them within overall deadline
+
+        This driver can't interrupt services, so it stops them and waits for
+        them one by one without limit.
+
+        :param timeout: overall time given to services to stop
+        :type timeout: float, optional
+
+        return: a Dict with uuid:report, where report contains the final
+            `state`, `duration` of the stop in seconds and `killed` flag
+        """
+        started_at = time.monotonic()
+        self.stop_all_services()
+        report = {}
+        for target_uuid, svc_storage in six.iteritems(self._services):
+            self._wait_service(target_uuid, svc_storage)
+            report[target_uuid] = self._get_shutdown_report(target_uuid,
+                                                            svc_storage)
+            report[target_uuid]['duration'] = time.monotonic() - started_at
+        return report
+
+    def get_services_stats(self):
+        """Return statistics of services which support it
+
+        return: a Dict with uuid:service_stats
+        """
+        stats = {}
+        for target_uuid, svc_storage in six.iteritems(self._services):
+            svc_stats = self._get_service(target_uuid, svc_storage).get_stats()
+            if svc_stats is not None:
+                stats[target_uuid] = svc_stats
+        return stats
+
+    def wakeup_all_services(self):
+        """Interrupt waiting of all services (e.g. to notice signum)"""
+        for target_uuid, svc_storage in six.iteritems(self._services):
+            self._get_service(target_uuid, svc_storage).wakeup()
+
     def wait_all_services(self):
         """Wait all existing services to stop"""
         self._l(LOG).info("Waiting all targets...")
@@ -0,0 +1,116 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+from multiprocessing import util as mp_util
+import os
+import selectors
+
+
+LOG = logging.getLogger(__name__)
+
+_HAS_PIDFD = hasattr(os, 'pidfd_open')
+
+
+class ExitNotifier(object):
+    """Notifier of child process exits
+
+    Every watched process is represented by a descriptor which gets
+    readable when the process exits: its pidfd where it's supported or its
+    multiprocessing sentinel otherwise. Descriptors are registered in a
+    selector (epoll on Linux), so exits of any number of processes are
+    collected by a single system call and the selector itself may be waited
+    for by a serving loop.
+
+    Forked children close their copies of the descriptors.
+    """
+
+    def __init__(self):
+        super(ExitNotifier, self).__init__()
+        self._selector = selectors.DefaultSelector()
+        # key: (fd, is the fd owned by the notifier)
+        self._fds = {}
+        mp_util.register_after_fork(self, ExitNotifier._close_after_fork)
+
+    def fileno(self):
+        """Return descriptor readable on exits or None if not supported"""
+        fileno = getattr(self._selector, 'fileno', None)
+        return fileno() if fileno is not None else None
+
+    @staticmethod
+    def _open_fd(process):
+        if _HAS_PIDFD:
+            try:
+                return os.pidfd_open(process.pid), True
+            except OSError as e:
+                LOG.debug("pidfd isn't available for pid=%s: %r",
+                          process.pid, e)
+        return process.sentinel, False
+
+    def watch(self, key, process):
+        """Watch exit of the started process
+
+        :param key: key of the process returned by `poll()`
+        :param process: started process
+        :type process: class:`multiprocessing.Process`
+        """
+        self.unwatch(key)
+        fd, owned = self._open_fd(process)
+        try:
+            self._selector.register(fd, selectors.EVENT_READ, key)
+        except Exception:
+            if owned:
+                os.close(fd)
+            raise
+        self._fds[key] = (fd, owned)
+
+    def unwatch(self, key):
+        fd_info = self._fds.pop(key, None)
+        if fd_info is None:
+            return
+        fd, owned = fd_info
+        self._selector.unregister(fd)
+        if owned:
+            os.close(fd)
+
+    def is_watched(self, key):
+        return key in self._fds
+
+    def poll(self):
+        """Return keys of exited processes without waiting
+
+        Exited processes aren't watched anymore.
+        """
+        exited = [key.data for key, _ in self._selector.select(0)]
+        for key in exited:
+            self.unwatch(key)
+        return exited
+
+    def close(self):
+        for key in list(self._fds):
+            self.unwatch(key)
+        self._selector.close()
+
+    def _close_after_fork(self):
+        # the selector is shared with the parent, so the descriptors are
+        # closed without unregistering
+        for fd, owned in self._fds.values():
+            if owned:
+                os.close(fd)
+        self._fds = {}
+        self._selector.close()
@@ -0,0 +1,250 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import abc
+import collections
+import logging
+import time
+
+import six
+
+from loopster import exceptions
+from loopster.hubs.drivers import base
+from loopster import states
+
+
+LOG = logging.getLogger(__name__)
+
+FORCIBLY_STOPPED_KEY = 'forcibly_stopped'
+SERVICE_KEY = 'service'
+SERVICE_CLASS_KEY = 'svc_class'
+SERVICE_KWARGS_KEY = 'svc_kwargs'
+STOP_REQUESTED_AT_KEY = 'stop_requested_at'
+
+
+@six.add_metaclass(abc.ABCMeta)
+class LaunchDriver(base.BaseDriver):
+    """Base driver serving every start of a service by a new launch
+
+    A launch (a thread, a task or a child command) is owned by the hub
+    process, it can't be reused after exit, so a new service instance and
+    a new launch are created on every restart. The driver keeps the state
+    machine, stop timeouts and shutdown common for such drivers, the
+    subclasses implement launches.
+
+    :param stop_timeout: time given to a launch to finish after stop when
+        it's waited for, then it's killed, defaults to None - wait without
+        limit
+    :type stop_timeout: float, optional
+    """
+    __target_states__ = {states.State.RUNNING,
+                         states.State.STOPPED}
+
+    def __init__(self, stop_timeout=None):
+        super(LaunchDriver, self).__init__()
+        self._stop_timeout = stop_timeout
+        self._state_map = collections.defaultdict(
+            lambda: collections.defaultdict(
+                lambda: self._default_state_handler))
+        self._state_map.update({
+            states.State.INITIAL: {
+                states.State.RUNNING: self._start_state_handler,
+                states.State.STOPPED: self._set_stopped_state_handler,
+            },
+            states.State.RUNNING: {
+                states.State.STOPPED: self._stop_state_handler,
+            },
+            states.State.STOPPED: {
+                states.State.RUNNING: self._start_again_state_handler,
+            },
+            states.State.FAILED: {
+                states.State.RUNNING: self._start_again_state_handler,
+                states.State.STOPPED: self._set_stopped_state_handler,
+            },
+            states.State.NUMB: {
+                states.State.RUNNING: self._kill_and_restart_handler,
+                states.State.STOPPED: self._kill_state_handler,
+            },
+        })
+
+    # launch implementation
+
+    @abc.abstractmethod
+    def _start_launch(self, target_uuid, svc_storage):
+        """Start the launch prepared by `_init_service()`"""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _get_launch_state(self, svc_storage):
+        """Return INITIAL, RUNNING, STOPPED or FAILED state of the launch"""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _join_launch(self, svc_storage, timeout):
+        """Wait for the started launch to finish
+
+        :param timeout: time to wait, None waits without limit
+        :type timeout: float
+        :return: True if the launch has finished
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def _kill_service(self, target_uuid, svc_storage):
+        raise NotImplementedError()
+
+    def _is_numb(self, target_uuid, svc_storage):
+        svc = self._get_service(target_uuid, svc_storage)
+        return not svc.get_watchdog().is_alive()
+
+    # utility methods
+
+    def _init_service(self, target_uuid, svc_storage):
+        """Prepare a new launch, subclasses add the service and the launch"""
+        svc_storage.update({
+            FORCIBLY_STOPPED_KEY: False,
+            STOP_REQUESTED_AT_KEY: None,
+        })
+
+    def _get_service(self, target_uuid, svc_storage):
+        return svc_storage[SERVICE_KEY]
+
+    # worker & state transition processing
+
+    def _set_state(self, target_uuid, old_state, new_state, svc_storage):
+        self._state_map[old_state][new_state](
+            target_uuid, old_state, new_state, svc_storage)
+
+    def _default_state_handler(
+            self, target_uuid, old_state, new_state, svc_storage):
+        raise NotImplementedError()
+
+    def _start_state_handler(
+            self, target_uuid, old_state, new_state, svc_storage):
+        self._start_launch(target_uuid, svc_storage)
+
+    def _start_again_state_handler(
+            self, target_uuid, old_state, new_state, svc_storage):
+        cur_state = self._get_launch_state(svc_storage)
+        if cur_state is states.State.RUNNING:
+            raise exceptions.UnexpectedServiceState(target_uuid=target_uuid,
+                                                    state=cur_state)
+        self._init_service(target_uuid, svc_storage)
+        self._start_state_handler(
+            target_uuid, old_state, new_state, svc_storage)
+
+    def _set_stopped_state_handler(
+            self, target_uuid, old_state, new_state, svc_storage):
+        svc_storage[FORCIBLY_STOPPED_KEY] = True
+
+    def _stop_state_handler(
+            self, target_uuid, old_state, new_state, svc_storage):
+        self._stop_service(target_uuid, svc_storage)
+
+    def _kill_state_handler(
+            self, target_uuid, old_state, new_state, svc_storage):
+        if self._get_launch_state(svc_storage) is not states.State.RUNNING:
+            self._l(LOG).error(
+                'Tried to kill and restart an innocent service')
+            return
+        self._kill_service(target_uuid, svc_storage)
+
+    def _kill_and_restart_handler(
+            self, target_uuid, old_state, new_state, svc_storage):
+        self._kill_state_handler(
+            target_uuid, old_state, new_state, svc_storage)
+        svc_state = self._get_launch_state(svc_storage)
+        if svc_state is states.State.RUNNING:
+            raise exceptions.UnexpectedServiceState(target_uuid=target_uuid,
+                                                    state=svc_state)
+        self._init_service(target_uuid, svc_storage)
+        self._start_state_handler(
+            target_uuid, old_state, new_state, svc_storage)
+
+    # sensor
+
+    def _get_service_state(self, target_uuid, svc_storage):
+        svc_state = self._get_launch_state(svc_storage)
+        if (svc_storage[FORCIBLY_STOPPED_KEY]
+                and svc_state is not states.State.RUNNING):
+            return states.State.STOPPED
+        if (svc_state is states.State.RUNNING
+                and self._is_numb(target_uuid, svc_storage)):
+            return states.State.NUMB
+        return svc_state
+
+    # service management (from hub/controller)
+
+    def _add_service(self, target_uuid, svc_storage):
+        self._init_service(target_uuid, svc_storage)
+
+    def _stop_service(self, target_uuid, svc_storage):
+        """Request the launch to stop, subclasses deliver the request"""
+        if svc_storage.get(STOP_REQUESTED_AT_KEY) is None:
+            svc_storage[STOP_REQUESTED_AT_KEY] = time.monotonic()
+
+    def _join_service(self, target_uuid, svc_storage, deadline):
+        """Wait for the launch, kill it after the deadline
+
+        :return: True if the launch has been killed
+        """
+        if self._get_launch_state(svc_storage) is states.State.INITIAL:
+            return False
+        if self._join_launch(svc_storage,
+                             None if deadline is None
+                             else max(deadline - time.monotonic(), 0)):
+            return False
+        self._kill_service(target_uuid, svc_storage)
+        svc_storage[FORCIBLY_STOPPED_KEY] = True
+        return True
+
+    def _wait_service(self, target_uuid, svc_storage, timeout=None):
+        if timeout is None and self._stop_timeout is not None:
+            stop_requested_at = (svc_storage.get(STOP_REQUESTED_AT_KEY)
+                                 or time.monotonic())
+            timeout = (stop_requested_at + self._stop_timeout
+                       - time.monotonic())
+        self._join_service(
+            target_uuid, svc_storage,
+            None if timeout is None else time.monotonic() + timeout)
+
+    def shutdown_all_services(self, timeout=None):
+        """Stop all services and wait for them within overall deadline
+
+        Launches still running after `timeout` seconds are killed.
+
+        :param timeout: overall time given to services to stop, defaults
+            to `stop_timeout` of the driver, None waits without limit
+        :type timeout: float, optional
+
+        return: a Dict with uuid:report, where report contains the final
+            `state`, `duration` of the stop in seconds and `killed` flag
+        """
+        if timeout is None:
+            timeout = self._stop_timeout
+        started_at = time.monotonic()
+        deadline = None if timeout is None else started_at + timeout
+        self.stop_all_services()
+        report = {}
+        for target_uuid, svc_storage in six.iteritems(self._services):
+            killed = self._join_service(target_uuid, svc_storage, deadline)
+            report[target_uuid] = self._get_shutdown_report(target_uuid,
+                                                            svc_storage)
+            report[target_uuid]['killed'] = killed
+            report[target_uuid]['duration'] = time.monotonic() - started_at
+        return report
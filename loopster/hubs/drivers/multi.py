@@ -0,0 +1,240 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+from multiprocessing import util as mp_util
+import selectors
+import time
+
+import six
+
+from loopster import exceptions
+from loopster.hubs.drivers import base
+
+
+LOG = logging.getLogger(__name__)
+
+
+class MultiDriver(base.AbstractDriver):
+    """Driver routing every service to one of named drivers
+
+    It lets a single hub mix isolated heavy services (e.g. processes of
+    `ProcessDriver`) with lightweight ones (threads or tasks), while
+    controllers see a unified view of all services.
+
+    A service goes to the driver named explicitly on adding (`driver`
+    attribute of a unit), otherwise to the one returned by `route`
+    callable, otherwise to the default driver.
+
+    :param drivers: drivers by name
+    :type drivers: dict
+    :param default: name of the driver for services without explicit
+        route, defaults to the only driver if there is one
+    :type default: str, optional
+    :param route: callable taking a service class and kwargs and returning
+        name of the driver or None for the default one
+    :type route: callable, optional
+    """
+
+    def __init__(self, drivers, default=None, route=None):
+        super(MultiDriver, self).__init__()
+        if not drivers:
+            raise ValueError("At least one driver is required")
+        if default is None and len(drivers) == 1:
+            default = next(iter(drivers))
+        if default is not None and default not in drivers:
+            raise exceptions.DriverNotFound(name=default)
+        self._drivers = dict(drivers)
+        self._default = default
+        self._route = route
+        # target_uuid: name of the driver
+        self._targets = {}
+        self._selector = None
+        self._init_selector()
+
+    def _init_selector(self):
+        # descriptors of drivers are waited for through one selector, so
+        # exits of all of them are noticed by the hub without delay
+        exit_fds = {name: driver.fileno()
+                    for name, driver in six.iteritems(self._drivers)}
+        exit_fds = {name: fd for name, fd in six.iteritems(exit_fds)
+                    if fd is not None}
+        if not exit_fds:
+            return
+        self._selector = selectors.DefaultSelector()
+        if getattr(self._selector, 'fileno', None) is None:
+            self._selector.close()
+            self._selector = None
+            return
+        for name, fd in six.iteritems(exit_fds):
+            self._selector.register(fd, selectors.EVENT_READ, name)
+        mp_util.register_after_fork(self, MultiDriver._close_after_fork)
+
+    def _close_after_fork(self):
+        self._selector.close()
+        self._selector = None
+
+    @property
+    def drivers(self):
+        return dict(self._drivers)
+
+    def get_driver(self, name):
+        try:
+            return self._drivers[name]
+        except KeyError:
+            raise exceptions.DriverNotFound(name=name)
+
+    def get_target_driver_name(self, target_uuid):
+        try:
+            return self._targets[target_uuid]
+        except KeyError:
+            raise exceptions.ServiceNotFound(target_uuid=target_uuid)
+
+    def _get_target_driver(self, target_uuid):
+        return self._drivers[self.get_target_driver_name(target_uuid)]
+
+    def _select_driver_name(self, svc_class, svc_kwargs, driver=None):
+        name = driver
+        if name is None and self._route is not None:
+            name = self._route(svc_class, svc_kwargs)
+        if name is None:
+            name = self._default
+        if name is None:
+            raise ValueError("No driver to route %r service to, neither "
+                             "explicit nor default one" % svc_class)
+        if name not in self._drivers:
+            raise exceptions.DriverNotFound(name=name)
+        return name
+
+    def validate_target_state(self, state):
+        """Validate if state is acceptable for all drivers
+
+        :param state: State
+        :type state: enum:`loopster.states.State`
+
+        :return: DriverUnsupportedState() on error
+        """
+        for driver in self._drivers.values():
+            driver.validate_target_state(state)
+
+    def get_states(self):
+        """Return states of services of all drivers
+
+        return: a Dict with uuid:service_state
+        """
+        states_dict = {}
+        for driver in self._drivers.values():
+            states_dict.update(driver.get_states())
+        return states_dict
+
+    def set_state(self, target_uuid, old_state, new_state):
+        self._get_target_driver(target_uuid).set_state(
+            target_uuid, old_state, new_state)
+
+    def add_service(self, target_uuid, svc_class, svc_kwargs, recycle=None,
+                    driver=None):
+        """Add new service to the driver it's routed to
+
+        :param driver: name of the driver to use, defaults to the one
+            chosen by the route or the default one
+        :type driver: str, optional
+
+        Other parameters are the same as of
+        meth:`loopster.hubs.drivers.base.BaseDriver.add_service`.
+        """
+        if target_uuid in self._targets:
+            raise exceptions.ServiceExists(target_uuid=target_uuid)
+        name = self._select_driver_name(svc_class, svc_kwargs, driver)
+        extra = {}
+        if recycle is not None:
+            extra['recycle'] = recycle
+        self._drivers[name].add_service(target_uuid, svc_class, svc_kwargs,
+                                        **extra)
+        self._targets[target_uuid] = name
+        self._l(LOG).info("Target %s has been routed to %r driver",
+                          target_uuid, name)
+
+    def remove_service(self, target_uuid):
+        self._get_target_driver(target_uuid).remove_service(target_uuid)
+        del self._targets[target_uuid]
+
+    def stop_service(self, target_uuid):
+        self._get_target_driver(target_uuid).stop_service(target_uuid)
+
+    def stop_all_services(self):
+        for driver in self._drivers.values():
+            driver.stop_all_services()
+
+    def wait_service(self, target_uuid):
+        self._get_target_driver(target_uuid).wait_service(target_uuid)
+
+    def wait_all_services(self):
+        for driver in self._drivers.values():
+            driver.wait_all_services()
+
+    def shutdown_all_services(self, timeout=None):
+        """Stop services of all drivers and wait within overall deadline
+
+        Services of all drivers are stopped first, so they stop
+        concurrently, then every driver shuts its services down within the
+        rest of the deadline.
+
+        :param timeout: overall time given to services to stop
+        :type timeout: float, optional
+
+        return: a Dict with uuid:report, where report contains the final
+            `state`, `duration` of the stop in seconds and `killed` flag
+        """
+        started_at = time.monotonic()
+        deadline = None if timeout is None else started_at + timeout
+        self.stop_all_services()
+        report = {}
+        for driver in self._drivers.values():
+            driver_report = driver.shutdown_all_services(
+                timeout=(None if deadline is None
+                         else max(deadline - time.monotonic(), 0)))
+            for target_report in driver_report.values():
+                target_report['duration'] = time.monotonic() - started_at
+            report.update(driver_report)
+        return report
+
+    def get_services_stats(self):
+        stats = {}
+        for driver in self._drivers.values():
+            stats.update(driver.get_services_stats())
+        return stats
+
+    def fileno(self):
+        """Return descriptor readable on exits of services of any driver"""
+        if self._selector is None:
+            return None
+        return self._selector.fileno()
+
+    def collect_exits(self):
+        exited = []
+        for driver in self._drivers.values():
+            exited.extend(driver.collect_exits())
+        return exited
+
+    def recycle_services(self):
+        for driver in self._drivers.values():
+            driver.recycle_services()
+
+    def wakeup_all_services(self):
+        for driver in self._drivers.values():
+            driver.wakeup_all_services()
@@ -17,13 +17,23 @@
 #    under the License.
 
 import collections
+import gc
+import importlib
 import logging
 import multiprocessing as mp
+from multiprocessing import connection as mp_connection
 import os
+import resource
+import signal
 import sys
+import time
+
+from loopster.common import exc
+import six
 
 from loopster import exceptions
 from loopster.hubs.drivers import base
+from loopster.hubs.drivers import exits
 from loopster import states
 
 
@@ -34,19 +44,59 @@ SERVICE_KEY = 'service'
 SERVICE_CLASS_KEY = 'svc_class'
 SERVICE_KWARGS_KEY = 'svc_kwargs'
 PROCESS_KEY = 'process'
+STARTED_AT_KEY = 'started_at'
+RECYCLE_KEY = 'recycle'
+RECYCLE_SCALE_KEY = 'recycle_scale'
+PENDING_KEY = 'pending'
+RETIRING_KEY = 'retiring'
+STOP_REQUESTED_AT_KEY = 'stop_requested_at'
+# state of the watched process, it's updated on exit notification
+PROCESS_STATE_KEY = 'process_state'
+PAGE_SIZE = resource.getpagesize()
 FORK_START_METHOD = 'fork'
 # In Python 3.8 default start method at Mac was changed from 'fork' to 'spawn'
 PYTHON_VERSION_CHANGED_START_METHOD = (3, 8)
 
 
 class ProcessDriver(base.BaseDriver):
-    """Driver to serve services as via child processes"""
+    """Driver to serve services as via child processes
+
+    Exits of service processes are notified via pidfds (or multiprocessing
+    sentinels) registered in epoll, so states of running processes are
+    checked only after their exits instead of every call of `get_states()`.
+
+    :param stop_timeout: time given to a service process to exit after
+        SIGTERM when it's waited for, then it's killed with SIGKILL,
+        defaults to None - wait without limit
+    :type stop_timeout: float, optional
+    :param preload_modules: names of modules to import before the first
+        fork, so children share them instead of importing on their own
+    :type preload_modules: list of str, optional
+    :param preload: callable to warm the hub process up after imports,
+        e.g. to fill caches
+    :type preload: callable, optional
+    :param gc_freeze: collect garbage once and freeze all objects of the
+        hub after the warm-up, so the garbage collector of children doesn't
+        touch them and their memory pages stay shared (copy-on-write),
+        defaults to False
+    :type gc_freeze: bool, optional
+    """
     __target_states__ = {states.State.RUNNING,
                          states.State.STOPPED}
 
-    def __init__(self):
+    def __init__(self, stop_timeout=None, preload_modules=(), preload=None,
+                 gc_freeze=False):
         super(ProcessDriver, self).__init__()
+        self._stop_timeout = stop_timeout
+        self._preload_modules = list(preload_modules)
+        self._preload = preload
+        self._gc_freeze = gc_freeze
+        self._exit_notifier = exits.ExitNotifier()
         self._setup()
+        if self._preload_modules or self._preload is not None:
+            self._warm_up(reload=False)
+        if self._gc_freeze:
+            self._freeze_objects()
         self._state_map = collections.defaultdict(
             lambda: collections.defaultdict(
                 lambda: self._default_state_handler))
@@ -86,10 +136,59 @@ class ProcessDriver(base.BaseDriver):
                 and sys.version_info >= PYTHON_VERSION_CHANGED_START_METHOD):
             mp.set_start_method(FORK_START_METHOD)
 
+    def _warm_up(self, reload):
+        started_at = time.monotonic()
+        importlib.invalidate_caches()
+        for name in self._preload_modules:
+            module = sys.modules.get(name)
+            if module is None:
+                importlib.import_module(name)
+            elif reload:
+                importlib.reload(module)
+        if self._preload is not None:
+            self._preload()
+        self._l(LOG).info("Hub process has been warmed up in %0.3f "
+                          "seconds, preloaded modules: %s",
+                          time.monotonic() - started_at,
+                          ', '.join(self._preload_modules) or '-')
+
+    def _freeze_objects(self):
+        if not hasattr(gc, 'freeze'):
+            self._l(LOG).warning("gc.freeze() appeared in Python 3.7, "
+                                 "objects of the hub aren't frozen")
+            return
+        gc.collect()
+        # objects of the hub are moved to the permanent generation, so
+        # the child's collector doesn't write to (and copy) their pages,
+        # the hub's collector keeps freeing objects created afterwards
+        gc.freeze()
+        self._l(LOG).info("%d objects of the hub have been frozen",
+                          gc.get_freeze_count())
+
     # utility methods
 
-    @staticmethod
-    def _init_service(target_uuid, svc_storage):
+    def _create_process(self, svc):
+        return mp.Process(target=svc.serve)
+
+    def _create_service(self, target_uuid, svc_storage):
+        """Create service and its (not started) process
+
+        :return: internal state of the service launch
+        """
+        svc = svc_storage[SERVICE_CLASS_KEY](**svc_storage[SERVICE_KWARGS_KEY])
+        svc.unit_uuid = target_uuid
+        recycle = svc_storage.get(RECYCLE_KEY)
+        return {
+            SERVICE_KEY: svc,
+            PROCESS_KEY: self._create_process(svc),
+            FORCIBLY_STOPPED_KEY: False,
+            STARTED_AT_KEY: None,
+            STOP_REQUESTED_AT_KEY: None,
+            PROCESS_STATE_KEY: None,
+            RECYCLE_SCALE_KEY: recycle.get_scale() if recycle else 1,
+        }
+
+    def _init_service(self, target_uuid, svc_storage):
         """Prepares service constrictor and initializes it in subprocess.
 
         Passes talkback_channel only to services subclassed from SoftIrqService
@@ -98,13 +197,24 @@ class ProcessDriver(base.BaseDriver):
         :param target_uuid:
         :param svc_storage:
         """
-        svc = svc_storage[SERVICE_CLASS_KEY](**svc_storage[SERVICE_KWARGS_KEY])
-        int_state = {
-            SERVICE_KEY: svc,
-            PROCESS_KEY: mp.Process(target=svc.serve),
-            FORCIBLY_STOPPED_KEY: False,
-        }
-        svc_storage.update(int_state)
+        self._discard_pending_service(target_uuid, svc_storage)
+        self._exit_notifier.unwatch(target_uuid)
+        svc_storage.update(self._create_service(target_uuid, svc_storage))
+
+    def _start_process(self, int_state):
+        int_state[PROCESS_KEY].start()
+        int_state[STARTED_AT_KEY] = time.monotonic()
+
+    def _watch_process(self, target_uuid, svc_storage):
+        """Watch exit of the started process instead of polling its state"""
+        try:
+            self._exit_notifier.watch(target_uuid, svc_storage[PROCESS_KEY])
+        except Exception as e:
+            self._l(LOG).warning("Failed to watch exit of target %s, its "
+                                 "state will be polled: %r", target_uuid, e)
+            svc_storage[PROCESS_STATE_KEY] = None
+            return
+        svc_storage[PROCESS_STATE_KEY] = states.State.RUNNING
 
     def _get_service(self, target_uuid, svc_storage):
         return svc_storage[SERVICE_KEY]
@@ -121,7 +231,8 @@ class ProcessDriver(base.BaseDriver):
 
     def _start_state_handler(
             self, target_uuid, old_state, new_state, svc_storage):
-        svc_storage[PROCESS_KEY].start()
+        self._start_process(svc_storage)
+        self._watch_process(target_uuid, svc_storage)
 
     def _start_again_state_handler(
             self, target_uuid, old_state, new_state, svc_storage):
@@ -205,18 +316,234 @@ class ProcessDriver(base.BaseDriver):
         return real_state
 
     def _get_service_state(self, target_uuid, svc_storage):
-        svc_state = self._get_process_state(svc_storage[PROCESS_KEY])
+        svc_state = svc_storage.get(PROCESS_STATE_KEY)
+        if svc_state is None:
+            svc_state = self._get_process_state(svc_storage[PROCESS_KEY])
         svc_state = self._override_service_state(
             target_uuid, svc_storage, svc_state)
         return svc_state
 
+    def fileno(self):
+        return self._exit_notifier.fileno()
+
+    def collect_exits(self):
+        exited = self._exit_notifier.poll()
+        for target_uuid in exited:
+            svc_storage = self._services.get(target_uuid)
+            if svc_storage is not None:
+                svc_storage[PROCESS_STATE_KEY] = None
+        return exited
+
+    def get_states(self):
+        self.collect_exits()
+        return super(ProcessDriver, self).get_states()
+
+    # recycling
+
+    @staticmethod
+    def _get_process_rss(pid):
+        try:
+            with open('/proc/%d/statm' % pid, 'rb') as f:
+                return int(f.read().split()[1]) * PAGE_SIZE
+        except (IOError, OSError, IndexError, ValueError):
+            return None
+
+    def _get_recycle_reason(self, svc_storage):
+        stats = svc_storage[SERVICE_KEY].get_stats()
+        iterations = (stats['count'] + stats['skipped']
+                      if stats is not None else None)
+        return svc_storage[RECYCLE_KEY].get_reason(
+            iterations=iterations,
+            rss=self._get_process_rss(svc_storage[PROCESS_KEY].pid),
+            lifetime=time.monotonic() - svc_storage[STARTED_AT_KEY],
+            scale=svc_storage[RECYCLE_SCALE_KEY])
+
+    @staticmethod
+    def _is_service_ready(int_state):
+        """Check if the service is healthy and has made the first step"""
+        svc = int_state[SERVICE_KEY]
+        if not svc.get_watchdog().is_alive():
+            return False
+        stats = svc.get_stats()
+        return stats is None or stats['count'] + stats['skipped'] > 0
+
+    def _retire_process(self, svc_storage, process):
+        try:
+            process.terminate()
+        except OSError as e:
+            self._l(LOG).warning("Failed to terminate process pid=%s: %r",
+                                 process.pid, e)
+        svc_storage.setdefault(RETIRING_KEY, []).append(process)
+
+    def _reap_retired_processes(self, target_uuid, svc_storage):
+        retiring = svc_storage.get(RETIRING_KEY)
+        if not retiring:
+            return
+        for process in list(retiring):
+            if process.exitcode is not None:
+                process.join()
+                retiring.remove(process)
+                self._l(LOG).info(
+                    "Retired process pid=%s of target %s has exited with %s",
+                    process.pid, target_uuid, process.exitcode)
+
+    def _discard_pending_service(self, target_uuid, svc_storage):
+        pending = svc_storage.pop(PENDING_KEY, None)
+        if pending is not None:
+            self._l(LOG).info("Discarding replacement of target %s...",
+                              target_uuid)
+            self._retire_process(svc_storage, pending[PROCESS_KEY])
+
+    def _replace_service(self, target_uuid, svc_storage, pending):
+        old_process = svc_storage[PROCESS_KEY]
+        del svc_storage[PENDING_KEY]
+        svc_storage.update(pending)
+        self._watch_process(target_uuid, svc_storage)
+        self._retire_process(svc_storage, old_process)
+        self._l(LOG).info(
+            "Target %s has been replaced: pid=%s -> pid=%s",
+            target_uuid, old_process.pid, svc_storage[PROCESS_KEY].pid)
+
+    def _recycle_service(self, target_uuid, svc_storage):
+        pending = svc_storage.get(PENDING_KEY)
+        if pending is None:
+            if (self._get_service_state(target_uuid, svc_storage)
+                    is not states.State.RUNNING):
+                return
+            reason = self._get_recycle_reason(svc_storage)
+            if reason is not None:
+                self._l(LOG).info("Recycling target %s: %s",
+                                  target_uuid, reason)
+                pending = self._create_service(target_uuid, svc_storage)
+                svc_storage[PENDING_KEY] = pending
+                self._start_process(pending)
+            return
+
+        pending_state = self._get_process_state(pending[PROCESS_KEY])
+        if (pending_state is states.State.RUNNING
+                and self._is_service_ready(pending)):
+            self._replace_service(target_uuid, svc_storage, pending)
+        elif pending_state is not states.State.RUNNING:
+            self._l(LOG).error("Replacement of target %s has exited with %s",
+                               target_uuid, pending[PROCESS_KEY].exitcode)
+            self._discard_pending_service(target_uuid, svc_storage)
+        elif (time.monotonic() - pending[STARTED_AT_KEY]
+              > svc_storage[RECYCLE_KEY].start_timeout):
+            self._l(LOG).error("Replacement of target %s hasn't got healthy "
+                               "in time", target_uuid)
+            self._discard_pending_service(target_uuid, svc_storage)
+
+    def recycle_services(self):
+        """Gracefully replace services exceeding their recycle limits
+
+        A new process is started first, the old one is terminated once the
+        new one is healthy and has made its first step.
+        """
+        for target_uuid, svc_storage in six.iteritems(self._services):
+            self._reap_retired_processes(target_uuid, svc_storage)
+            if svc_storage.get(RECYCLE_KEY) is None:
+                continue
+            with exc.suppress_any(adapter=self._l):
+                self._recycle_service(target_uuid, svc_storage)
+
     # service management (from hub/controller)
 
     def _add_service(self, target_uuid, svc_storage):
         self._init_service(target_uuid, svc_storage)
 
+    def _get_shutdown_report(self, target_uuid, svc_storage):
+        report = super(ProcessDriver, self)._get_shutdown_report(
+            target_uuid, svc_storage)
+        process = svc_storage[PROCESS_KEY]
+        report['pid'] = process.pid
+        report['exitcode'] = process.exitcode
+        return report
+
+    def _wait_processes(self, processes, deadline):
+        """Wait for exits of processes concurrently until the deadline
+
+        :param processes: a Dict with sentinel:(uuid, process), exited
+            processes are removed from it
+        :return: a Dict with uuid:exit time
+        """
+        exited_at = {}
+        while processes:
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+            for sentinel in mp_connection.wait(list(processes), timeout):
+                target_uuid, _ = processes.pop(sentinel)
+                exited_at[target_uuid] = time.monotonic()
+        return exited_at
+
+    def shutdown_all_services(self, timeout=None):
+        """Stop all services and wait for them within overall deadline
+
+        All service processes get SIGTERM at once and are waited for
+        concurrently, processes still alive after `timeout` seconds are
+        killed with SIGKILL.
+
+        :param timeout: overall time given to services to stop, defaults
+            to `stop_timeout` of the driver, None waits without limit
+        :type timeout: float, optional
+
+        return: a Dict with uuid:report, where report contains the final
+            `state`, `pid`, `exitcode`, `duration` of the stop in seconds
+            and `killed` flag
+        """
+        if timeout is None:
+            timeout = self._stop_timeout
+        started_at = time.monotonic()
+        deadline = None if timeout is None else started_at + timeout
+        self.stop_all_services()
+
+        processes = {}
+        for target_uuid, svc_storage in six.iteritems(self._services):
+            for process in ([svc_storage[PROCESS_KEY]]
+                            + list(svc_storage.get(RETIRING_KEY, ()))):
+                if process.pid is not None and process.exitcode is None:
+                    processes[process.sentinel] = (target_uuid, process)
+        exited_at = self._wait_processes(processes, deadline)
+
+        killed = set()
+        for target_uuid, process in processes.values():
+            self._l(LOG).warning(
+                "Process pid=%s of target %s hasn't exited in %ss after "
+                "SIGTERM, killing it...", process.pid, target_uuid, timeout)
+            try:
+                os.kill(process.pid, signal.SIGKILL)
+            except OSError as e:
+                self._l(LOG).warning("Failed to kill process pid=%s: %r",
+                                     process.pid, e)
+            killed.add(target_uuid)
+
+        report = {}
+        for target_uuid, svc_storage in six.iteritems(self._services):
+            self._wait_service(target_uuid, svc_storage)
+            if target_uuid in killed:
+                svc_storage[FORCIBLY_STOPPED_KEY] = True
+            report[target_uuid] = self._get_shutdown_report(target_uuid,
+                                                            svc_storage)
+            report[target_uuid]['killed'] = target_uuid in killed
+            finished_at = (time.monotonic() if target_uuid in killed
+                           else exited_at.get(target_uuid, started_at))
+            report[target_uuid]['duration'] = finished_at - started_at
+        self._l(LOG).info(
+            "%d targets have been shut down in %0.3f seconds, %d killed",
+            len(report), time.monotonic() - started_at, len(killed))
+        return report
+
+    def remove_service(self, target_uuid):
+        super(ProcessDriver, self).remove_service(target_uuid)
+        self._exit_notifier.unwatch(target_uuid)
+
     def _stop_service(self, target_uuid, svc_storage):
+        self._discard_pending_service(target_uuid, svc_storage)
         process = svc_storage[PROCESS_KEY]
+        if svc_storage.get(STOP_REQUESTED_AT_KEY) is None:
+            svc_storage[STOP_REQUESTED_AT_KEY] = time.monotonic()
         try:
             process.terminate()
         except OSError as e:  # Process doesn't exist
@@ -234,7 +561,61 @@ class ProcessDriver(base.BaseDriver):
                 "Failed to kill process pid=%s, service=%r: %r",
                 process.pid, self._get_service(target_uuid, svc_storage), e)
 
+    def _join_or_kill_process(self, target_uuid, process, deadline):
+        """Join the process, kill it if it's still alive after the deadline
+
+        :return: True if the process has been killed
+        """
+        process.join(timeout=max(deadline - time.monotonic(), 0))
+        if not process.is_alive():
+            return False
+        self._l(LOG).warning(
+            "Process pid=%s of target %s hasn't exited in %ss after "
+            "SIGTERM, killing it...", process.pid, target_uuid,
+            self._stop_timeout)
+        try:
+            os.kill(process.pid, signal.SIGKILL)
+        except OSError as e:
+            self._l(LOG).warning("Failed to kill process pid=%s: %r",
+                                 process.pid, e)
+        process.join()
+        return True
+
+    def _drain_service(self, target_uuid, svc_storage):
+        """Wait for the stopped service escalating SIGTERM to SIGKILL"""
+        stop_requested_at = (svc_storage.get(STOP_REQUESTED_AT_KEY)
+                             or time.monotonic())
+        deadline = stop_requested_at + self._stop_timeout
+        for retired_process in list(svc_storage.get(RETIRING_KEY, ())):
+            self._join_or_kill_process(target_uuid, retired_process, deadline)
+        self._reap_retired_processes(target_uuid, svc_storage)
+        process = svc_storage[PROCESS_KEY]
+        if process.pid is None:
+            return
+        if self._join_or_kill_process(target_uuid, process, deadline):
+            svc_storage[FORCIBLY_STOPPED_KEY] = True
+        self._l(LOG).info(
+            "Process pid=%s of target %s has exited with %s in %0.3f seconds "
+            "after stop request", process.pid, target_uuid, process.exitcode,
+            time.monotonic() - stop_requested_at)
+
     def _wait_service(self, target_uuid, svc_storage, timeout=None):
+        try:
+            self._join_service(target_uuid, svc_storage, timeout)
+        finally:
+            process = svc_storage[PROCESS_KEY]
+            if process.pid is not None and not process.is_alive():
+                # the exit is known already, don't wait for notification
+                self._exit_notifier.unwatch(target_uuid)
+                svc_storage[PROCESS_STATE_KEY] = None
+
+    def _join_service(self, target_uuid, svc_storage, timeout=None):
+        if timeout is None and self._stop_timeout is not None:
+            self._drain_service(target_uuid, svc_storage)
+            return
+        for retired_process in svc_storage.get(RETIRING_KEY, ()):
+            retired_process.join(timeout=timeout)
+        self._reap_retired_processes(target_uuid, svc_storage)
         process = svc_storage[PROCESS_KEY]
         try:
             process.join(timeout=timeout)
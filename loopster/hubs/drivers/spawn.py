@@ -0,0 +1,209 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+import signal
+import subprocess
+import threading
+
+from loopster.common import obj
+from loopster.hubs.drivers import launch
+from loopster import states
+
+
+LOG = logging.getLogger(__name__)
+
+SERVICE_KEY = launch.SERVICE_KEY
+POPEN_KEY = 'popen'
+# time to wait for a killed process
+KILL_TIMEOUT = 0.1
+
+
+class Command(obj.BaseObject):
+    """External command served by `SubprocessDriver`
+
+    It's used as a service class of units, its kwargs are the unit's
+    `svc_kwargs`.
+
+    :param argv: program and its arguments
+    :type argv: list
+    :param env: environment of the command, defaults to the hub one
+    :type env: dict, optional
+    :param cwd: working directory of the command
+    :type cwd: str, optional
+    :param stop_signal: signal to stop the command gracefully, the command
+        killed by it is treated as STOPPED, defaults to SIGTERM
+    :type stop_signal: int, optional
+    """
+
+    def __init__(self, argv, env=None, cwd=None, stop_signal=signal.SIGTERM):
+        super(Command, self).__init__()
+        if not argv:
+            raise ValueError("argv must not be empty")
+        self.argv = list(argv)
+        self.env = env
+        self.cwd = cwd
+        self.stop_signal = stop_signal
+
+
+class SubprocessDriver(launch.LaunchDriver):
+    """Driver to supervise external commands as child processes
+
+    Units are served by `Command` service class. Commands are started by
+    `subprocess.Popen`, which closes descriptors inherited from the hub
+    and uses `vfork()` on Python 3.10+, so the heap of the hub isn't
+    copied for every start there.
+
+    Exit code 0 or death by the stop signal means STOPPED, other exits mean
+    FAILED. Lines of stdout and stderr of commands are logged with INFO and
+    WARNING levels by a reader thread per stream, so the hub loop is never
+    blocked by output. Commands have no watchdogs, so they are never NUMB.
+
+    :param stop_timeout: time given to a command to exit after the stop
+        signal when it's waited for, then it's killed with SIGKILL,
+        defaults to None - wait without limit
+    :type stop_timeout: float, optional
+    """
+
+    # utility methods
+
+    def _log_stream(self, target_uuid, pid, stream, level):
+        try:
+            with stream:
+                for line in iter(stream.readline, b''):
+                    self._l(LOG).log(
+                        level, "[%s pid=%s] %s", target_uuid, pid,
+                        line.rstrip(b'\n').decode('utf-8', 'replace'))
+        except Exception:
+            self._l(LOG).exception("Failed to read output of pid=%s", pid)
+
+    def _start_log_thread(self, target_uuid, popen, stream, level):
+        thread = threading.Thread(
+            target=self._log_stream,
+            args=(target_uuid, popen.pid, stream, level),
+            name="output-%s" % popen.pid)
+        thread.daemon = True
+        thread.start()
+
+    def _init_service(self, target_uuid, svc_storage):
+        super(SubprocessDriver, self)._init_service(target_uuid, svc_storage)
+        svc_storage.update({
+            SERVICE_KEY: svc_storage[launch.SERVICE_CLASS_KEY](
+                **svc_storage[launch.SERVICE_KWARGS_KEY]),
+            POPEN_KEY: None,
+        })
+
+    # launch implementation
+
+    def _start_launch(self, target_uuid, svc_storage):
+        command = svc_storage[SERVICE_KEY]
+        popen = subprocess.Popen(
+            command.argv, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, env=command.env, cwd=command.cwd)
+        svc_storage[POPEN_KEY] = popen
+        self._l(LOG).info("Command %r of target %s has been started with "
+                          "pid=%s", command.argv, target_uuid, popen.pid)
+        self._start_log_thread(target_uuid, popen, popen.stdout,
+                               logging.INFO)
+        self._start_log_thread(target_uuid, popen, popen.stderr,
+                               logging.WARNING)
+
+    def _get_launch_state(self, svc_storage):
+        popen = svc_storage[POPEN_KEY]
+        if popen is None:
+            return states.State.INITIAL
+        code = popen.poll()
+        if code is None:
+            return states.State.RUNNING
+        # correct stop is only exit 0 or the stop signal from driver
+        elif code in (0, -svc_storage[SERVICE_KEY].stop_signal):
+            return states.State.STOPPED
+        else:
+            return states.State.FAILED
+
+    def _join_launch(self, svc_storage, timeout):
+        try:
+            svc_storage[POPEN_KEY].wait(timeout)
+            return True
+        except subprocess.TimeoutExpired:
+            return False
+
+    def _is_numb(self, target_uuid, svc_storage):
+        return False
+
+    # service management (from hub/controller)
+
+    def _add_service(self, target_uuid, svc_storage):
+        if not issubclass(svc_storage[launch.SERVICE_CLASS_KEY], Command):
+            raise ValueError("Service class must be a subclass of Command: %r"
+                             % svc_storage[launch.SERVICE_CLASS_KEY])
+        super(SubprocessDriver, self)._add_service(target_uuid, svc_storage)
+
+    def _get_shutdown_report(self, target_uuid, svc_storage):
+        report = super(SubprocessDriver, self)._get_shutdown_report(
+            target_uuid, svc_storage)
+        popen = svc_storage[POPEN_KEY]
+        report['pid'] = popen.pid if popen is not None else None
+        report['exitcode'] = popen.returncode if popen is not None else None
+        return report
+
+    def _stop_service(self, target_uuid, svc_storage):
+        popen = svc_storage[POPEN_KEY]
+        if popen is None or popen.poll() is not None:
+            return
+        super(SubprocessDriver, self)._stop_service(target_uuid, svc_storage)
+        try:
+            popen.send_signal(svc_storage[SERVICE_KEY].stop_signal)
+        except OSError as e:
+            self._l(LOG).warning("Failed to stop process pid=%s of target "
+                                 "%s: %r", popen.pid, target_uuid, e)
+
+    def _kill_service(self, target_uuid, svc_storage):
+        popen = svc_storage[POPEN_KEY]
+        self._l(LOG).warning("Killing process pid=%s of target %s...",
+                             popen.pid, target_uuid)
+        try:
+            popen.kill()
+            popen.wait(KILL_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self._l(LOG).warning("Failed to kill process pid=%s: %r",
+                                 popen.pid, e)
+
+    def shutdown_all_services(self, timeout=None):
+        """Stop all commands and wait for them within overall deadline
+
+        All commands get the stop signal at once, the ones still running
+        after `timeout` seconds are killed with SIGKILL.
+
+        :param timeout: overall time given to commands to stop, defaults
+            to `stop_timeout` of the driver, None waits without limit
+        :type timeout: float, optional
+
+        return: a Dict with uuid:report, where report contains the final
+            `state`, `pid`, `exitcode`, `duration` of the stop in seconds
+            and `killed` flag
+        """
+        return super(SubprocessDriver, self).shutdown_all_services(timeout)
+
+    def get_services_stats(self):
+        # commands don't share step statistics
+        return {}
+
+    def wakeup_all_services(self):
+        # commands can't be woken up, signums aren't delivered to them
+        pass
@@ -0,0 +1,128 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+import threading
+
+from loopster.hubs.drivers import launch
+from loopster.services import deadlines
+from loopster import states
+
+
+LOG = logging.getLogger(__name__)
+
+SERVICE_KEY = launch.SERVICE_KEY
+THREAD_KEY = 'thread'
+ERRORS_KEY = 'errors'
+# time to wait for a killed thread
+KILL_TIMEOUT = 0.1
+
+
+class ThreadDriver(launch.LaunchDriver):
+    """Driver to serve services as threads of the hub process
+
+    It suits lightweight I/O-bound services: they don't cost a process
+    each, but share GIL, memory and fate of the hub. Services don't
+    subscribe to signals (it's possible in the main thread only), signums
+    and wakeups work as usual.
+
+    A thread can't be killed, so a thread of a stuck (NUMB) service or
+    the one which hasn't stopped in time is asked to stop once more and
+    then interrupted by asynchronous `SystemExit`, which is delivered only
+    when the thread executes Python code.
+
+    :param stop_timeout: time given to a service thread to finish after
+        stop when it's waited for, then it's interrupted, defaults to
+        None - wait without limit
+    :type stop_timeout: float, optional
+    """
+
+    # utility methods
+
+    def _run_service(self, target_uuid, svc, errors):
+        try:
+            svc.serve()
+        except BaseException as e:
+            errors.append(e)
+            self._l(LOG).exception("Service of target %s has failed",
+                                   target_uuid)
+
+    def _init_service(self, target_uuid, svc_storage):
+        super(ThreadDriver, self)._init_service(target_uuid, svc_storage)
+        svc = svc_storage[launch.SERVICE_CLASS_KEY](
+            **svc_storage[launch.SERVICE_KWARGS_KEY])
+        svc.unit_uuid = target_uuid
+        # signal handlers may be set from the main thread only
+        svc.subscribe_signals = False
+        # the hub must not be killed when the serving thread exits
+        svc.pdeathsig = False
+        # errors are kept per launch, so an abandoned thread doesn't affect
+        # the next one
+        errors = []
+        svc_storage.update({
+            SERVICE_KEY: svc,
+            THREAD_KEY: threading.Thread(
+                target=self._run_service, args=(target_uuid, svc, errors),
+                name="%s-%s" % (type(svc).__name__, target_uuid)),
+            ERRORS_KEY: errors,
+        })
+        svc_storage[THREAD_KEY].daemon = True
+
+    # launch implementation
+
+    def _start_launch(self, target_uuid, svc_storage):
+        svc_storage[THREAD_KEY].start()
+
+    def _get_launch_state(self, svc_storage):
+        thread = svc_storage[THREAD_KEY]
+        if thread.ident is None:
+            return states.State.INITIAL
+        if thread.is_alive():
+            return states.State.RUNNING
+        if svc_storage[ERRORS_KEY]:
+            return states.State.FAILED
+        return states.State.STOPPED
+
+    def _join_launch(self, svc_storage, timeout):
+        thread = svc_storage[THREAD_KEY]
+        thread.join(timeout=timeout)
+        return not thread.is_alive()
+
+    # service management (from hub/controller)
+
+    def _stop_service(self, target_uuid, svc_storage):
+        super(ThreadDriver, self)._stop_service(target_uuid, svc_storage)
+        svc_storage[SERVICE_KEY].stop()
+
+    def _kill_service(self, target_uuid, svc_storage):
+        thread = svc_storage[THREAD_KEY]
+        # the exception may interrupt library code holding a lock (e.g. of
+        # a logging handler) for good, so a thread still running its loop
+        # gets a chance to exit on its own
+        svc_storage[SERVICE_KEY].stop()
+        thread.join(timeout=KILL_TIMEOUT)
+        if not thread.is_alive():
+            return
+        self._l(LOG).warning("Interrupting thread %s of target %s...",
+                             thread.name, target_uuid)
+        deadlines.set_async_exc(thread.ident, SystemExit)
+        thread.join(timeout=KILL_TIMEOUT)
+        if thread.is_alive():
+            self._l(LOG).error("Thread %s of target %s hasn't been "
+                               "interrupted in %ss", thread.name,
+                               target_uuid, KILL_TIMEOUT)
@@ -0,0 +1,86 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+import logging
+import multiprocessing as mp
+import sys
+
+import six
+
+from loopster.hubs.drivers import process
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ZygoteProcessDriver(process.ProcessDriver):
+    """Process driver forking services from a pre-warmed hub process
+
+    The hub process is the zygote: application modules are imported and
+    warmed up in it once, and every service process (including restarts)
+    is forked from it, so children don't repeat expensive imports and lazy
+    initialization. Processes are always forked, whatever the default
+    start method of multiprocessing is.
+
+    The zygote lives in the hub rather than in a separate fork server,
+    because services share memory with the hub (watchdogs, statistics,
+    signums) which is allocated after the fork server would be started.
+
+    Parameters are the same as of
+    class:`loopster.hubs.drivers.process.ProcessDriver`, modules to import
+    into the zygote are set by `preload_modules` and warm-up by `preload`.
+    """
+
+    def __init__(self, **kwargs):
+        super(ZygoteProcessDriver, self).__init__(**kwargs)
+        self._context = mp.get_context(process.FORK_START_METHOD)
+
+    def _create_process(self, svc):
+        return self._context.Process(target=svc.serve)
+
+    def _rebind_service_classes(self):
+        for target_uuid, svc_storage in six.iteritems(self._services):
+            svc_class = svc_storage[process.SERVICE_CLASS_KEY]
+            if svc_class.__module__ not in self._preload_modules:
+                continue
+            try:
+                new_class = functools.reduce(
+                    getattr, svc_class.__qualname__.split('.'),
+                    sys.modules[svc_class.__module__])
+            except AttributeError:
+                self._l(LOG).warning("Service class %r of target %s has "
+                                     "gone on reload", svc_class,
+                                     target_uuid)
+                continue
+            svc_storage[process.SERVICE_CLASS_KEY] = new_class
+
+    def reload_zygote(self):
+        """Reload preloaded modules and warm the zygote up again
+
+        Service classes defined in preloaded modules are rebound to their
+        reloaded versions, so processes started afterwards run the new
+        code, running ones keep the old code until they are restarted
+        (e.g. recycled).
+        """
+        self._l(LOG).info("Reloading zygote...")
+        self._warm_up(reload=True)
+        if self._gc_freeze:
+            # reloaded modules are frozen as well
+            self._freeze_objects()
+        self._rebind_service_classes()
@@ -24,11 +24,23 @@ from loopster.hubs.drivers import process
 
 
 class ProcessHub(BaseHub):
-    """A class for managing services with one strategy by driver."""
+    """A class for managing services with one strategy by driver.
 
-    def __init__(self, controller):
-        super(ProcessHub, self).__init__(driver=process.ProcessDriver(),
-                                         controller=controller)
+    :param controller: controller of service states
+    :param stop_timeout: time given to services to exit on shutdown before
+        they are killed, defaults to None - wait without limit
+    :type stop_timeout: float, optional
+    :param shutdown_timeout: overall time given to all services to exit on
+        shutdown before the rest are killed, defaults to None - wait for
+        services one by one
+    :type shutdown_timeout: float, optional
+    """
+
+    def __init__(self, controller, stop_timeout=None, shutdown_timeout=None):
+        super(ProcessHub, self).__init__(
+            driver=process.ProcessDriver(stop_timeout=stop_timeout),
+            controller=controller,
+            shutdown_timeout=shutdown_timeout)
         self._signums = []
 
     def _subscribe_signals(self, handlers):
@@ -36,6 +48,8 @@ class ProcessHub(BaseHub):
 
         handlers[signal.SIGHUP] = self._sighup_handler
         handlers[signal.SIGUSR1] = self._sigusr1_handler
+        handlers[signal.SIGUSR2] = self._sigusr2_handler
+        handlers[signal.SIGPROF] = self._sigprof_handler
         return super(ProcessHub, self)._subscribe_signals(handlers)
 
     def _sighup_handler(self, sig, frame):
@@ -50,6 +64,18 @@ class ProcessHub(BaseHub):
         with self._set_signums(sig):
             self._on_sigusr1()
 
+    def _sigusr2_handler(self, sig, frame):
+        """Send signum SIGUSR2 to subprocesses."""
+
+        with self._set_signums(sig):
+            self._on_sigusr2()
+
+    def _sigprof_handler(self, sig, frame):
+        """Send signum SIGPROF to subprocesses."""
+
+        with self._set_signums(sig):
+            self._on_sigprof()
+
     @property
     def signum(self):
         """Return a signum for a subprocess."""
@@ -60,10 +86,11 @@ class ProcessHub(BaseHub):
 
     @contextlib.contextmanager
     def _set_signums(self, sig):
-        """Set signal values to signums."""
+        """Set signal values to signums and wake services up."""
 
         try:
             yield
         finally:
             for signum in self._signums:
                 signum.value = sig.value
+            self._driver.wakeup_all_services()
@@ -0,0 +1,135 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+
+from loopster.common import obj
+
+
+LOG = logging.getLogger(__name__)
+
+
+class SamplingProfiler(obj.BaseObject):
+    """Low-overhead stack sampling profiler
+
+    A background thread samples stacks of all other threads of the process
+    every `interval` seconds for `duration` seconds (or until `stop()`)
+    and writes them in collapsed format (`thread;frame;frame count`),
+    which is consumed by flamegraph.pl, speedscope and similar tools.
+
+    The profiler may be created in a hub and passed to services, it's
+    started in the process which calls `start()`.
+
+    :param output_dir: directory for profiles
+    :type output_dir: str
+    :param duration: max profiling time in seconds, defaults to 30
+    :type duration: float, optional
+    :param interval: sampling interval in seconds, defaults to 0.005
+    :type interval: float, optional
+    """
+
+    def __init__(self, output_dir, duration=30, interval=0.005):
+        super(SamplingProfiler, self).__init__()
+        self._output_dir = output_dir
+        self._duration = duration
+        self._interval = interval
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._stacks = collections.Counter()
+        self._path = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @staticmethod
+    def _format_frame(frame):
+        code = frame.f_code
+        return "%s:%s" % (code.co_filename, code.co_name)
+
+    def _sample(self):
+        own_ident = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._format_frame(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, str(ident)))
+            self._stacks[';'.join(reversed(stack))] += 1
+
+    def _write(self):
+        os.makedirs(self._output_dir, exist_ok=True)
+        tmp_path = self._path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for stack, count in self._stacks.most_common():
+                f.write("%s %d\n" % (stack, count))
+        os.rename(tmp_path, self._path)
+
+    def _run(self):
+        deadline = time.monotonic() + self._duration
+        try:
+            while (not self._stop_event.wait(self._interval)
+                   and time.monotonic() < deadline):
+                self._sample()
+            self._write()
+            self._l(LOG).info("Profile has been written to %s: %d samples",
+                              self._path, sum(self._stacks.values()))
+        except Exception:
+            self._l(LOG).exception("Profiling has failed")
+
+    def start(self, name):
+        """Start profiling in background
+
+        :param name: prefix of the profile file name, e.g. unit uuid
+        :type name: str
+        :return: path of the profile to be written
+        """
+        if self.is_running:
+            raise RuntimeError("Profiler is running already")
+        self._path = os.path.join(
+            self._output_dir, "%s.%d.%s.collapsed"
+            % (name, os.getpid(), time.strftime('%Y%m%d-%H%M%S')))
+        self._stacks = collections.Counter()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name='loopster-profiler')
+        self._thread.daemon = True
+        self._thread.start()
+        self._l(LOG).info("Profiling for %ss into %s...",
+                          self._duration, self._path)
+        return self._path
+
+    def stop(self):
+        """Stop profiling and wait for the profile to be written
+
+        :return: path of the profile or None if it hasn't been started
+        """
+        if self._thread is None:
+            return None
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        return self._path
@@ -0,0 +1,209 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import logging
+import os
+import threading
+import time
+
+from loopster.common import obj
+
+
+LOG = logging.getLogger(__name__)
+
+DROP_OLDEST = 'drop_oldest'
+BLOCK = 'block'
+
+VALID_OVERFLOW_POLICIES = (DROP_OLDEST, BLOCK)
+
+
+class BufferedSender(obj.BaseObject):
+    """Asynchronous batching wrapper for event senders
+
+    Events are put into a bounded in-process queue and sent by a background
+    thread, so a slow event backend doesn't inflate step latency. Batches
+    are sent via `sender.send_events(events)` if the wrapped sender
+    supports it, otherwise event by event.
+
+    The thread is started lazily in the process which sends events, so the
+    wrapper may be created in a hub and passed to services as `sender=`.
+
+    :param sender: wrapped sender with `send_event(event_data)` method
+    :type sender: class:`camel.senders.DPPSender`
+    :param max_queue_size: max number of queued events, defaults to 10000
+    :type max_queue_size: int, optional
+    :param flush_interval: max time to wait for a full batch, defaults to 1
+    :type flush_interval: float, optional
+    :param flush_size: max number of events in one batch, defaults to 100
+    :type flush_size: int, optional
+    :param overflow_policy: `drop_oldest` drops the oldest queued event on
+        overflow, `block` blocks the caller for `block_timeout` and drops
+        the new event on timeout, defaults to `drop_oldest`
+    :type overflow_policy: str, optional
+    :param block_timeout: max time to block on overflow, None blocks until
+        there is room for the event, defaults to None
+    :type block_timeout: float, optional
+    :param flush_timeout: default timeout of `flush()`, defaults to 5
+    :type flush_timeout: float, optional
+    """
+
+    def __init__(self, sender, max_queue_size=10000, flush_interval=1,
+                 flush_size=100, overflow_policy=DROP_OLDEST,
+                 block_timeout=None, flush_timeout=5):
+        super(BufferedSender, self).__init__()
+        if overflow_policy not in VALID_OVERFLOW_POLICIES:
+            raise ValueError(
+                "Unknown overflow policy %r, allowed policies: %s"
+                % (overflow_policy, ", ".join(VALID_OVERFLOW_POLICIES)))
+        self._sender = sender
+        self._max_queue_size = max_queue_size
+        self._flush_interval = flush_interval
+        self._flush_size = flush_size
+        self._overflow_policy = overflow_policy
+        self._block_timeout = block_timeout
+        self._flush_timeout = flush_timeout
+        self._pid = None
+        # steps of concurrent services send events from several threads
+        self._start_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # NOTE: lock, queue and thread don't survive fork, the child starts
+        #       with its own empty state
+        self._cond = threading.Condition(threading.Lock())
+        self._queue = collections.deque()
+        self._in_flight = 0
+        self._flushing = 0
+        self._thread = None
+        self._sent = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            pid = os.getpid()
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                self._reset()
+            self._thread = threading.Thread(target=self._run,
+                                            name="loopster-buffered-sender")
+            self._thread.daemon = True
+            self._thread.start()
+            self._pid = pid
+
+    def _wait_batch(self):
+        deadline = time.monotonic() + self._flush_interval
+        while len(self._queue) < self._flush_size:
+            if self._flushing and self._queue:
+                break
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            self._cond.wait(timeout)
+        size = min(len(self._queue), self._flush_size)
+        batch = [self._queue.popleft() for _ in range(size)]
+        self._in_flight = size
+        # there is room for blocked callers
+        self._cond.notify_all()
+        return batch
+
+    def _send_batch(self, batch):
+        send_events = getattr(self._sender, 'send_events', None)
+        if send_events is not None:
+            try:
+                send_events(batch)
+                return len(batch), 0
+            except Exception:
+                self._l(LOG).exception("Failed to send batch of %d events:",
+                                       len(batch))
+                return 0, len(batch)
+
+        sent = 0
+        for event_data in batch:
+            try:
+                self._sender.send_event(event_data)
+                sent += 1
+            except Exception:
+                self._l(LOG).exception("Failed to send event %r:",
+                                       event_data)
+        return sent, len(batch) - sent
+
+    def _run(self):
+        while True:
+            with self._cond:
+                batch = self._wait_batch()
+            sent, failed = self._send_batch(batch) if batch else (0, 0)
+            with self._cond:
+                self._sent += sent
+                self._failed += failed
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def send_event(self, event_data):
+        """Queue event to send"""
+        self._ensure_started()
+        with self._cond:
+            if len(self._queue) >= self._max_queue_size:
+                if self._overflow_policy == DROP_OLDEST:
+                    self._queue.popleft()
+                    self._dropped += 1
+                elif not self._cond.wait_for(
+                        lambda: len(self._queue) < self._max_queue_size,
+                        self._block_timeout):
+                    self._dropped += 1
+                    return
+            self._queue.append(event_data)
+            if len(self._queue) >= self._flush_size:
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until all queued events are processed
+
+        :param timeout: max time to wait, defaults to `flush_timeout`
+        :type timeout: float, optional
+        :return: True if all events have been processed
+        """
+        if self._pid != os.getpid():
+            return True
+        timeout = self._flush_timeout if timeout is None else timeout
+        with self._cond:
+            # don't wait for the rest of flush interval
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                flushed = self._cond.wait_for(
+                    lambda: not (self._queue or self._in_flight), timeout)
+            finally:
+                self._flushing -= 1
+        if not flushed:
+            self._l(LOG).warning("Timed out flushing events after %ss",
+                                 timeout)
+        return flushed
+
+    def get_stats(self):
+        """Return counters of queued, sent, failed and dropped events"""
+        with self._cond:
+            return {
+                'queued': len(self._queue) + self._in_flight,
+                'sent': self._sent,
+                'failed': self._failed,
+                'dropped': self._dropped,
+            }
@@ -46,6 +46,9 @@ class AbstractService(obj.BaseObject):
         self._subscribe_signals_flag = True
         self._watchdog = copy.copy(watchdog) or wd_base.WatchDogBase()
         self._operate = operate
+        # uuid of the unit served by the service, it's set by drivers
+        self.unit_uuid = None
+        self._pdeathsig_flag = True
 
     def get_watchdog(self):
         return self._watchdog
@@ -64,6 +67,22 @@ class AbstractService(obj.BaseObject):
         self._l(LOG).info("Setting subscribe_signals=%r...", value)
         self._subscribe_signals_flag = value
 
+    @property
+    def pdeathsig(self):
+        return self._pdeathsig_flag
+
+    @pdeathsig.setter
+    def pdeathsig(self, value):
+        """Set flag to kill the serving process on death of its parent
+
+        Drivers serving the service inside the hub process reset it.
+
+        :param value: parent death signal flag
+        :type value: bool
+        """
+        self._l(LOG).info("Setting pdeathsig=%r...", value)
+        self._pdeathsig_flag = value
+
     def _setup(self):
         pass
 
@@ -115,6 +134,14 @@ class AbstractService(obj.BaseObject):
         """Stop service"""
         raise NotImplementedError()
 
+    def wakeup(self):
+        """Interrupt waiting of the serving loop if it's supported"""
+        pass
+
+    def get_stats(self):
+        """Return service statistics if it's supported"""
+        return None
+
     # signals
 
     def _get_signal_handlers(self):
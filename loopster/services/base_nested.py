@@ -44,6 +44,16 @@ class BaseNestedService(base.AbstractService):
         self._l(LOG).info(msg, value)
         self._nested_service.subscribe_signals = value
 
+    @property
+    def pdeathsig(self):
+        return False
+
+    @pdeathsig.setter
+    def pdeathsig(self, value):
+        msg = "Proxying 'pdeathsig=%r' request to nested service..."
+        self._l(LOG).info(msg, value)
+        self._nested_service.pdeathsig = value
+
     def _serve(self):
         self._l(LOG).info("Serving nested service...")
         self._nested_service.serve()
@@ -51,3 +61,9 @@ class BaseNestedService(base.AbstractService):
     def stop(self):
         self._l(LOG).info("Stopping nested service...")
         self._nested_service.stop()
+
+    def wakeup(self):
+        self._nested_service.wakeup()
+
+    def get_stats(self):
+        return self._nested_service.get_stats()
@@ -0,0 +1,188 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+import ctypes
+import signal
+import threading
+import time
+
+from loopster import exceptions
+
+
+# min timer value, zero disarms timers
+MIN_TIMEOUT = 0.000001
+
+
+def set_async_exc(thread_id, exc):
+    """Raise `exc` in the thread when it executes Python code next time
+
+    :param thread_id: identifier of the thread
+    :type thread_id: int
+    :param exc: exception class or None to drop the pending one
+    """
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id),
+        ctypes.py_object(exc) if exc is not None else None)
+
+
+class AlarmDeadline(object):
+    """Abort the block with `StepTimeout` raised from SIGALRM handler
+
+    Works in the main thread only. The signal interrupts blocking system
+    calls, so the block is aborted even if it waits for I/O. The previous
+    SIGALRM handler is restored on exit. If the block swallows the
+    exception, it's raised again on exit.
+
+    :param timeout: timeout in seconds, None - expire only by `expire_in()`
+    :type timeout: float
+    """
+
+    def __init__(self, timeout):
+        super(AlarmDeadline, self).__init__()
+        self._timeout = timeout
+        self._armed = False
+        self._fired = False
+        self._prev_handler = None
+
+    def expire_in(self, timeout):
+        """Abort the block in `timeout` seconds unless it expires earlier
+
+        May be called from a signal handler of the main thread.
+        """
+        if not self._armed:
+            return
+        remaining = signal.getitimer(signal.ITIMER_REAL)[0]
+        if remaining == 0 or timeout < remaining:
+            signal.setitimer(signal.ITIMER_REAL, max(timeout, MIN_TIMEOUT))
+
+    def _on_alarm(self, signum, frame):
+        if self._armed:
+            self._armed = False
+            self._fired = True
+            raise exceptions.StepTimeout()
+
+    def __enter__(self):
+        self._prev_handler = signal.signal(signal.SIGALRM, self._on_alarm)
+        self._fired = False
+        self._armed = True
+        if self._timeout:
+            signal.setitimer(signal.ITIMER_REAL, self._timeout)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self._armed = False
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._prev_handler)
+        if self._fired and exc_type is None:
+            raise exceptions.StepTimeout()
+
+
+class ThreadDeadline(object):
+    """Abort the block with `StepTimeout` raised asynchronously by a timer
+
+    Works in any thread, but the exception is delivered only when the
+    thread executes Python code, so a block stuck in a blocking call is
+    aborted right after the call returns.
+
+    :param timeout: timeout in seconds, None - expire only by `expire_in()`
+    :type timeout: float
+    """
+
+    def __init__(self, timeout):
+        super(ThreadDeadline, self).__init__()
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._thread_id = None
+        self._armed = False
+        self._fired = False
+        self._timer = None
+        self._expires_at = None
+
+    def _start_timer(self, timeout):
+        self._expires_at = time.monotonic() + timeout
+        self._timer = threading.Timer(timeout, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def expire_in(self, timeout):
+        """Abort the block in `timeout` seconds unless it expires earlier
+
+        May be called from any thread.
+        """
+        with self._lock:
+            if not self._armed or self._fired:
+                return
+            if (self._expires_at is not None
+                    and self._expires_at <= time.monotonic() + timeout):
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._start_timer(timeout)
+
+    def _on_timer(self):
+        with self._lock:
+            if self._armed:
+                self._fired = True
+                set_async_exc(self._thread_id, exceptions.StepTimeout)
+
+    def __enter__(self):
+        self._thread_id = threading.current_thread().ident
+        with self._lock:
+            self._armed = True
+            self._fired = False
+            self._timer = None
+            self._expires_at = None
+            if self._timeout:
+                self._start_timer(self._timeout)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._armed = False
+            if not self._fired:
+                return None
+            # drop the exception if it hasn't been delivered yet
+            set_async_exc(self._thread_id, None)
+        if exc_type is None:
+            raise exceptions.StepTimeout()
+
+
+@contextlib.contextmanager
+def _no_deadline():
+    yield
+
+
+def get_deadline(timeout, expirable=False):
+    """Return context manager aborting its block after `timeout` seconds
+
+    :param timeout: timeout in seconds, None or 0 disables the deadline
+    :type timeout: float
+    :param expirable: return a deadline supporting `expire_in()` even if
+        `timeout` is disabled, defaults to False
+    :type expirable: bool, optional
+    """
+    if not timeout and not expirable:
+        return _no_deadline()
+    if threading.current_thread() is threading.main_thread():
+        return AlarmDeadline(timeout)
+    return ThreadDeadline(timeout)
@@ -0,0 +1,512 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import abc
+import datetime
+import hashlib
+import logging
+import numbers
+import random
+import time
+
+from loopster.common import obj
+import six
+
+
+LOG = logging.getLogger(__name__)
+
+FIXED_RATE = 'fixed_rate'
+FIXED_DELAY = 'fixed_delay'
+
+VALID_SCHEDULE_MODES = (FIXED_RATE, FIXED_DELAY)
+
+JITTER_UNIFORM = 'uniform'
+JITTER_HASH = 'hash'
+
+VALID_JITTER_MODES = (JITTER_UNIFORM, JITTER_HASH)
+
+# what to do with ticks missed by overrunning steps
+CATCH_UP_SKIP = 'skip'
+CATCH_UP_COALESCE = 'coalesce'
+CATCH_UP_BURST = 'burst'
+
+VALID_CATCH_UP_POLICIES = (CATCH_UP_SKIP, CATCH_UP_COALESCE, CATCH_UP_BURST)
+
+# `_step()` results interpreted by period policies, any other number is an
+# explicit delay before the next step
+STEP_BUSY = True
+STEP_IDLE = False
+
+monotonic = time.monotonic
+wall_time = time.time
+
+if hasattr(time, 'monotonic_ns'):
+    monotonic_ns = time.monotonic_ns
+    wall_time_ns = time.time_ns
+else:
+    # integer nanosecond clocks appeared in Python 3.7
+    def monotonic_ns():
+        return int(monotonic() * 1000000000)
+
+    def wall_time_ns():
+        return int(wall_time() * 1000000000)
+
+CRON_ALIASES = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *',
+}
+# (name, min, max) of cron expression fields
+_CRON_FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 7),
+)
+# give up searching for the next cron time after this number of years
+_CRON_MAX_YEARS = 5
+
+
+def hash_fraction(key):
+    """Return stable fraction in [0, 1) derived from the key"""
+    digest = hashlib.sha1(str(key).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') / float(1 << 64)
+
+
+@six.add_metaclass(abc.ABCMeta)
+class AbstractScheduler(obj.BaseObject):
+    """Step deadline calculator based on monotonic clock
+
+    All time values are seconds of `time.monotonic()`, so wall-clock
+    jumps and NTP slews don't affect the step cadence.
+
+    Jitter delays steps to spread services sharing the same period: the
+    first step is delayed by up to `start_jitter` seconds, every next one
+    by up to `period_jitter` seconds (the tick grid itself isn't shifted).
+    `uniform` jitter is random, `hash` jitter is a stable offset derived
+    from `jitter_key` (e.g. unit uuid).
+
+    :param period: period between steps
+    :type period: float
+    :param start_delay: delay of the first step, defaults to 0
+    :type start_delay: float, optional
+    :param start_jitter: max random delay of the first step, defaults to 0
+    :type start_jitter: float, optional
+    :param period_jitter: max random delay of every step, defaults to 0
+    :type period_jitter: float, optional
+    :param jitter_mode: `uniform` or `hash`, defaults to `uniform`
+    :type jitter_mode: str, optional
+    :param jitter_key: key of `hash` jitter
+    :type jitter_key: str, optional
+    :param catch_up: policy for ticks missed by overrunning steps (if the
+        scheduler has a fixed grid): `skip` waits for the next tick,
+        `coalesce` runs one step at once, `burst` runs steps for up to
+        `max_burst` missed ticks back to back, defaults to `coalesce`
+    :type catch_up: str, optional
+    :param max_burst: max number of backlog steps of `burst` policy,
+        defaults to 10
+    :type max_burst: int, optional
+    """
+
+    def __init__(self, period, start_delay=0, start_jitter=0,
+                 period_jitter=0, jitter_mode=JITTER_UNIFORM,
+                 jitter_key=None, catch_up=CATCH_UP_COALESCE, max_burst=10):
+        super(AbstractScheduler, self).__init__()
+        if catch_up not in VALID_CATCH_UP_POLICIES:
+            raise ValueError(
+                "Unknown catch-up policy %r, allowed policies: %s"
+                % (catch_up, ", ".join(VALID_CATCH_UP_POLICIES)))
+        if max_burst < 1:
+            raise ValueError("max_burst must be positive: %r" % max_burst)
+        if jitter_mode not in VALID_JITTER_MODES:
+            raise ValueError("Unknown jitter mode %r, allowed modes: %s"
+                             % (jitter_mode, ", ".join(VALID_JITTER_MODES)))
+        if jitter_mode == JITTER_HASH and jitter_key is None:
+            raise ValueError("jitter_key is required for hash jitter")
+        self._period = period
+        self._start_delay = start_delay
+        self._start_jitter = start_jitter
+        self._period_jitter = period_jitter
+        self._jitter_mode = jitter_mode
+        self._jitter_key = jitter_key
+        self._catch_up = catch_up
+        self._max_burst = max_burst
+        self._missed = 0
+        # `_tick` is the point of the schedule grid, `_offset` is its jitter
+        self._tick = None
+        self._offset = 0
+
+    def _get_jitter(self, max_jitter, salt):
+        if max_jitter <= 0:
+            return 0
+        if self._jitter_mode == JITTER_HASH:
+            return max_jitter * hash_fraction(
+                "%s:%s" % (self._jitter_key, salt))
+        return random.uniform(0, max_jitter)
+
+    @property
+    def period(self):
+        return self._period
+
+    @period.setter
+    def period(self, value):
+        self._period = value
+
+    @property
+    def deadline(self):
+        """Monotonic time of the next step"""
+        return self._tick + self._offset
+
+    @property
+    def missed(self):
+        """Number of ticks dropped before the next step"""
+        return self._missed
+
+    def start(self, now):
+        """Start scheduling, the first step is due after the start delay"""
+        self._tick = now + self._start_delay + self._get_jitter(
+            self._start_jitter, 'start')
+        self._offset = 0
+        self._missed = 0
+
+    def reschedule(self, now, delta):
+        """Move the next step to `delta` seconds from `now` exactly"""
+        self._tick = now + delta
+        self._offset = 0
+        self._missed = 0
+
+    def step_finished(self, now):
+        """Calculate the next deadline once the step has finished"""
+        self._tick, self._missed = self._get_next_tick(now)
+        self._offset = self._get_jitter(self._period_jitter, 'period')
+
+    def is_overrun(self, duration):
+        """Check if the step has taken longer than the period
+
+        :param duration: duration of the step in seconds
+        :type duration: float
+        """
+        return 0 < self._period < duration
+
+    @abc.abstractmethod
+    def _get_next_tick(self, now):
+        """Return the next tick and the number of ticks missed before it"""
+        raise NotImplementedError()
+
+
+class FixedRateScheduler(AbstractScheduler):
+    """Steps are anchored to the first tick without cumulative drift
+
+    Ticks missed by overrunning steps are handled according to the
+    catch-up policy keeping the original grid.
+    """
+
+    def _get_next_tick(self, now):
+        if self._period <= 0:
+            return now, 0
+        tick = self._tick + self._period
+        if tick >= now:
+            return tick, 0
+        # ticks in [tick, now] are overdue
+        overdue = int((now - tick) // self._period) + 1
+        if self._catch_up == CATCH_UP_SKIP:
+            dropped = overdue
+        elif self._catch_up == CATCH_UP_BURST:
+            dropped = max(overdue - self._max_burst, 0)
+        else:
+            dropped = overdue - 1
+        return tick + dropped * self._period, dropped
+
+
+class FixedDelayScheduler(AbstractScheduler):
+    """Period is measured from the end of the previous step"""
+
+    def _get_next_tick(self, now):
+        return now + self._period, 0
+
+
+class AbstractCalendarScheduler(AbstractScheduler):
+    """Steps are scheduled at wall-clock times of a calendar
+
+    Ticks are kept as wall-clock timestamps and the monotonic deadline is
+    recalculated from them on every check. The deadline isn't checked
+    while the service sleeps, so a wall-clock adjustment during the sleep
+    is noticed only after the service wakes up. The first step waits for
+    the first tick, ticks missed by overrunning steps are skipped. Start
+    delay and start jitter are not applied.
+
+    :param tz: time zone of the calendar (e.g. `zoneinfo.ZoneInfo`, a
+        fixed offset or a pytz zone), defaults to the local one
+    :type tz: class:`datetime.tzinfo`, optional
+
+    Other parameters (jitter) are the same as of
+    class:`AbstractScheduler`.
+    """
+
+    def __init__(self, tz=None, **kwargs):
+        super(AbstractCalendarScheduler, self).__init__(period=0, **kwargs)
+        self._tz = tz
+
+    def _get_local_datetime(self, timestamp):
+        if self._tz is None:
+            return datetime.datetime.fromtimestamp(timestamp).astimezone()
+        return datetime.datetime.fromtimestamp(timestamp, self._tz)
+
+    def _get_timestamp(self, naive_datetime):
+        if self._tz is None:
+            # naive datetime is treated as local time by timestamp()
+            return naive_datetime.timestamp()
+        if hasattr(self._tz, 'localize'):
+            # offsets of pytz zones depend on the date, the zone itself
+            # has the offset of the local mean time
+            return self._tz.localize(naive_datetime).timestamp()
+        return naive_datetime.replace(tzinfo=self._tz).timestamp()
+
+    @abc.abstractmethod
+    def _get_next_time(self, timestamp):
+        """Return the first tick timestamp after the given one"""
+        raise NotImplementedError()
+
+    @property
+    def deadline(self):
+        return monotonic() + (self._tick + self._offset - wall_time())
+
+    def start(self, now):
+        self._tick = self._get_next_time(wall_time())
+        self._offset = self._get_jitter(self._period_jitter, 'period')
+        self._missed = 0
+
+    def reschedule(self, now, delta):
+        self._tick = wall_time() + delta
+        self._offset = 0
+        self._missed = 0
+
+    def is_overrun(self, duration):
+        """Check if the step of the current tick has lasted past the next one
+
+        It's called before `step_finished()`, the duration isn't used as
+        intervals between ticks of a calendar vary.
+        """
+        return self._get_next_time(self._tick) <= wall_time()
+
+    def _get_next_tick(self, now):
+        return self._get_next_time(max(wall_time(), self._tick)), 0
+
+
+class AlignedIntervalScheduler(AbstractCalendarScheduler):
+    """Steps run at multiples of the interval since the local midnight
+
+    E.g. `interval=300` runs steps every 5 minutes on the minute (xx:00,
+    xx:05...), `interval=3600, offset=900` runs them at xx:15 every hour.
+    Every day starts the grid anew, so with an interval not dividing a day
+    (e.g. 7 hours) the last interval of the day is shorter.
+
+    :param interval: interval between steps in seconds
+    :type interval: float
+    :param offset: shift of ticks from the interval boundaries in seconds,
+        defaults to 0
+    :type offset: float, optional
+    """
+
+    def __init__(self, interval, offset=0, **kwargs):
+        super(AlignedIntervalScheduler, self).__init__(**kwargs)
+        if interval <= 0:
+            raise ValueError("interval must be positive: %r" % interval)
+        self._period = interval
+        self._interval = interval
+        self._offset_time = offset
+
+    def _get_next_time(self, timestamp):
+        midnight = self._get_local_datetime(timestamp).replace(
+            tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+        start = self._get_timestamp(midnight) + self._offset_time
+        tick = start + ((timestamp - start) // self._interval + 1) * (
+            self._interval)
+        next_start = self._get_timestamp(
+            midnight + datetime.timedelta(days=1)) + self._offset_time
+        return min(tick, next_start)
+
+
+def _parse_cron_field(field, low, high):
+    values = set()
+    for part in field.split(','):
+        value_range, has_step, step = part.partition('/')
+        step = int(step) if has_step else 1
+        if value_range == '*':
+            start, end = low, high
+        elif '-' in value_range:
+            start, end = (int(v) for v in value_range.split('-', 1))
+        else:
+            start = int(value_range)
+            end = high if has_step else start
+        if not (low <= start <= end <= high and step > 0):
+            raise ValueError("Invalid cron field %r" % field)
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronScheduler(AbstractCalendarScheduler):
+    """Steps run at times matching a cron expression
+
+    Standard 5-field expressions are supported: minute, hour, day of month,
+    month and day of week (0 or 7 is Sunday) with `*`, lists, ranges and
+    steps (e.g. `*/15 9-18 * * 1-5`), as well as `@hourly`, `@daily`,
+    `@weekly`, `@monthly` and `@yearly` aliases. If both day of month and
+    day of week are restricted, a day matching either of them matches.
+
+    :param expression: cron expression
+    :type expression: str
+    """
+
+    def __init__(self, expression, **kwargs):
+        super(CronScheduler, self).__init__(**kwargs)
+        self._expression = expression
+        fields = CRON_ALIASES.get(expression, expression).split()
+        if len(fields) != len(_CRON_FIELDS):
+            raise ValueError("Invalid cron expression %r" % expression)
+        try:
+            (self._minutes, self._hours, self._days, self._months,
+             weekdays) = [_parse_cron_field(field, low, high)
+                          for field, (_, low, high) in zip(fields,
+                                                           _CRON_FIELDS)]
+        except ValueError:
+            raise ValueError("Invalid cron expression %r" % expression)
+        self._weekdays = frozenset(d % 7 for d in weekdays)
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+        # fail fast on expressions like "0 0 30 2 *"
+        self._get_next_time(wall_time())
+
+    def _match_day(self, dt):
+        day = dt.day in self._days
+        # cron weekdays start from Sunday
+        weekday = (dt.weekday() + 1) % 7 in self._weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def _get_next_time(self, timestamp):
+        dt = self._get_local_datetime(timestamp).replace(
+            tzinfo=None, second=0, microsecond=0)
+        max_year = dt.year + _CRON_MAX_YEARS
+        dt += datetime.timedelta(minutes=1)
+        while dt.year <= max_year:
+            if dt.month not in self._months:
+                dt = (dt.replace(day=1, hour=0, minute=0)
+                      + datetime.timedelta(days=32)).replace(day=1)
+            elif not self._match_day(dt):
+                dt = (dt.replace(hour=0, minute=0)
+                      + datetime.timedelta(days=1))
+            elif dt.hour not in self._hours:
+                dt = dt.replace(minute=0) + datetime.timedelta(hours=1)
+            elif dt.minute not in self._minutes:
+                dt += datetime.timedelta(minutes=1)
+            else:
+                result = self._get_timestamp(dt)
+                # skip times repeated or missing due to DST switches
+                if result > timestamp:
+                    return result
+                dt += datetime.timedelta(minutes=1)
+        raise ValueError("Cron expression %r never matches"
+                         % self._expression)
+
+
+@six.add_metaclass(abc.ABCMeta)
+class AbstractPeriodPolicy(obj.BaseObject):
+    """Step period calculator driven by `_step()` results"""
+
+    @abc.abstractmethod
+    def get_period(self, step_result):
+        """Return period before the next step
+
+        :param step_result: value returned by `_step()`, None if the step
+            has failed or hasn't been run
+        """
+        raise NotImplementedError()
+
+
+class AdaptivePeriodPolicy(AbstractPeriodPolicy):
+    """Adapt period between min and max according to the step workload
+
+    `STEP_BUSY` makes the next step run after `min_period`, `STEP_IDLE`
+    backs the period off exponentially up to `max_period`, a number is an
+    explicit delay before the next step and None keeps the current period.
+    Other results are ignored and keep the current period too.
+
+    :param min_period: period after a step which did some work
+    :type min_period: float
+    :param max_period: max period of idle steps
+    :type max_period: float
+    :param backoff_factor: period multiplier on idle steps, defaults to 2
+    :type backoff_factor: float, optional
+    :param idle_period: period after the first idle step, defaults to
+        `min_period` or 1/64 of `max_period` if `min_period` is zero
+    :type idle_period: float, optional
+    """
+
+    def __init__(self, min_period, max_period, backoff_factor=2,
+                 idle_period=None):
+        super(AdaptivePeriodPolicy, self).__init__()
+        if not 0 <= min_period <= max_period:
+            raise ValueError("Invalid period range: %r..%r"
+                             % (min_period, max_period))
+        self._min_period = min_period
+        self._max_period = max_period
+        self._backoff_factor = backoff_factor
+        self._idle_period = min(idle_period or min_period or max_period / 64.0,
+                                max_period)
+        self._period = min_period
+
+    def get_period(self, step_result):
+        if step_result is None:
+            return self._period
+        if step_result is STEP_BUSY:
+            self._period = self._min_period
+            return self._period
+        if step_result is STEP_IDLE:
+            self._period = min(
+                max(self._period * self._backoff_factor, self._idle_period),
+                self._max_period)
+            return self._period
+        if not isinstance(step_result, numbers.Real):
+            self._l(LOG).warning("Ignoring step result %r of %s type, it's "
+                                 "neither a flag nor a delay",
+                                 step_result, type(step_result).__name__)
+            return self._period
+        delay = max(float(step_result), 0)
+        self._period = min(max(delay, self._min_period), self._max_period)
+        return delay
+
+
+def get_scheduler(schedule_mode, period, **kwargs):
+    """Return scheduler of requested mode.
+
+    Keyword arguments (start delay, jitter, catch-up policy) are passed to
+    the scheduler.
+    """
+    if schedule_mode == FIXED_RATE:
+        return FixedRateScheduler(period=period, **kwargs)
+    elif schedule_mode == FIXED_DELAY:
+        return FixedDelayScheduler(period=period, **kwargs)
+
+    raise ValueError("Unknown schedule mode %r, allowed modes: %s"
+                     % (schedule_mode, ", ".join(VALID_SCHEDULE_MODES)))
@@ -21,17 +21,22 @@ import contextlib
 import ctypes
 import ctypes.util
 import datetime
+import importlib
 import logging
 import os
+import resource
 import signal
 import sys
-import time
 import uuid
 
 from loopster.common import exc as iaas_exc
 import six
 
 from loopster.services import base
+from loopster.services import deadlines
+from loopster.services import schedulers
+from loopster import stats
+from loopster import wakeup
 from loopster.watchdogs import exceptions as wd_exc
 
 try:
@@ -42,28 +47,130 @@ except ImportError:
 
 LOG = logging.getLogger(__name__)
 
+PAGE_SIZE = resource.getpagesize()
+# number of frames stored by tracemalloc for allocations
+TRACEMALLOC_FRAMES = 1
+# number of top growing allocation sites to log
+TRACEMALLOC_TOP = 10
 
-@contextlib.contextmanager
-def _measure(step_info):
-    start = datetime.datetime.utcnow()
+
+def _get_tracemalloc():
+    """Import tracemalloc on demand, return None if it's unavailable"""
     try:
-        yield
-    finally:
-        end = datetime.datetime.utcnow()
-        step_info['start'] = start
-        step_info['end'] = end
-        step_info['timestamp'] = end
-        step_info['duration'] = end - start
+        return importlib.import_module('tracemalloc')
+    except ImportError:
+        return None
 
 
-@contextlib.contextmanager
-def _excs(excs):
-    try:
-        yield
-    except Exception:
-        exc_info = sys.exc_info()
-        excs.append(exc_info)
-        raise
+class StepInfo(object):
+    """Compact record of a single step
+
+    Timestamps are kept as integer nanoseconds and materialised into
+    datetime objects only on demand (e.g. for the event dict). It supports
+    dict-like access to be compatible with `_wrapped_step(step_info)`
+    implementations, unknown keys are stored separately.
+    """
+
+    __slots__ = ('iteration', 'step_period', 'effective_period', 'service',
+                 'service_type', 'pid', 'launch_id', 'skipped', 'missed',
+                 'start_ns', 'end_ns', 'wall_start_ns', '_extra')
+
+    _FIELDS = frozenset(('iteration', 'step_period', 'effective_period',
+                         'service', 'service_type', 'pid', 'launch_id',
+                         'skipped', 'missed'))
+    _TIME_FIELDS = frozenset(('start', 'end', 'timestamp', 'duration'))
+
+    def __init__(self, iteration, step_period, service, service_type, pid,
+                 launch_id, missed=0):
+        self.iteration = iteration
+        self.step_period = step_period
+        self.effective_period = step_period
+        self.service = service
+        self.service_type = service_type
+        self.pid = pid
+        self.launch_id = launch_id
+        self.skipped = True
+        self.missed = missed
+        self.start_ns = None
+        self.end_ns = None
+        self.wall_start_ns = None
+        self._extra = None
+
+    def __repr__(self):
+        return "StepInfo(%r)" % self.to_dict()
+
+    def start(self):
+        self.wall_start_ns = schedulers.wall_time_ns()
+        self.start_ns = schedulers.monotonic_ns()
+
+    def finish(self):
+        self.end_ns = schedulers.monotonic_ns()
+
+    @property
+    def duration_ns(self):
+        if self.end_ns is None:
+            return None
+        return self.end_ns - self.start_ns
+
+    def _get_time_field(self, key):
+        if self.end_ns is None:
+            raise KeyError(key)
+        duration = datetime.timedelta(microseconds=self.duration_ns / 1000.0)
+        if key == 'duration':
+            return duration
+        start = datetime.datetime.utcfromtimestamp(
+            self.wall_start_ns / 1000000000.0)
+        return start if key == 'start' else start + duration
+
+    def __getitem__(self, key):
+        if key in self._FIELDS:
+            return getattr(self, key)
+        if key in self._TIME_FIELDS:
+            return self._get_time_field(key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._FIELDS:
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __contains__(self, key):
+        return (key in self._FIELDS
+                or (key in self._TIME_FIELDS and self.end_ns is not None)
+                or (self._extra is not None and key in self._extra))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def to_dict(self):
+        """Materialise step info into event dict"""
+        result = {key: getattr(self, key) for key in self._FIELDS}
+        if self.end_ns is not None:
+            duration = datetime.timedelta(
+                microseconds=self.duration_ns / 1000.0)
+            start = datetime.datetime.utcfromtimestamp(
+                self.wall_start_ns / 1000000000.0)
+            result['start'] = start
+            result['end'] = result['timestamp'] = start + duration
+            result['duration'] = duration
+        if self._extra is not None:
+            result.update(self._extra)
+        return result
+
+    copy = to_dict
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -80,9 +187,60 @@ class SoftIrqService(base.AbstractService):
     :param step_period: minimal period of step before start next one,
         defaults to 1
     :type step_period: float, optional
-    :param loop_period: pause between each steps, defaults to 0.1
+    :param loop_period: max pause between checks of the step schedule,
+        defaults to 0 - wait for the next step or a wakeup (stop, reschedule
+        or signum)
     :type loop_period: float, optional
-    :param sender: Sender to use in Camel
+    :param schedule_mode: `fixed_rate` anchors steps to the first tick,
+        `fixed_delay` measures the period from the end of previous step,
+        defaults to `fixed_rate`
+    :type schedule_mode: str, optional
+    :param period_policy: policy adapting the period before the next step
+        to `_step()` results, the result is ignored by default
+    :type period_policy:
+        class:`loopster.services.schedulers.AbstractPeriodPolicy`, optional
+    :param step_timeout: max duration of a step, the stuck step is aborted
+        with class:`loopster.exceptions.StepTimeout` and reported as failed,
+        defaults to None - no limit
+    :type step_timeout: float, optional
+    :param drain_timeout: grace time of the running step on stop, the step
+        which hasn't finished in time is aborted with
+        class:`loopster.exceptions.StepTimeout`, defaults to None - wait for
+        the step without limit
+    :type drain_timeout: float, optional
+    :param start_delay: delay of the first step, defaults to 0
+    :type start_delay: float, optional
+    :param start_jitter: max jitter of the first step delay, defaults to 0
+    :type start_jitter: float, optional
+    :param period_jitter: max jitter of every step delay, defaults to 0
+    :type period_jitter: float, optional
+    :param jitter_mode: `uniform` (random) or `hash` (stable offsets derived
+        from `jitter_key`), defaults to `uniform`
+    :type jitter_mode: str, optional
+    :param jitter_key: key of `hash` jitter, e.g. unit uuid
+    :type jitter_key: str, optional
+    :param catch_up: policy for `fixed_rate` ticks missed by overrunning
+        steps: `skip` them and wait for the next tick, `coalesce` them into
+        one step or `burst` - run up to `max_burst` backlog steps, the number
+        of dropped ticks is passed in `missed` field of step info, defaults
+        to `coalesce`
+    :type catch_up: str, optional
+    :param max_burst: max number of backlog steps of `burst` policy,
+        defaults to 10
+    :type max_burst: int, optional
+    :param schedule: scheduler to use instead of the one defined by
+        `schedule_mode` and the parameters above, e.g. a calendar one
+    :type schedule: class:`loopster.services.schedulers.CronScheduler` or
+        class:`loopster.services.schedulers.AlignedIntervalScheduler`,
+        optional
+    :param profiler: sampling profiler toggled by SIGUSR2 signum
+    :type profiler: class:`loopster.profiler.SamplingProfiler`, optional
+    :param memory_accounting: add RSS and the number of allocated Python
+        memory blocks after the step and their deltas to the step event,
+        defaults to False
+    :type memory_accounting: bool, optional
+    :param sender: Sender to use in Camel, it may be wrapped into
+        class:`loopster.senders.BufferedSender` to send events asynchronously
     :type sender: class:`camel.senders.DPPSender`, optional
     :param event_type: Event type for camel sender
     :type event_type: str, optional
@@ -99,15 +257,45 @@ class SoftIrqService(base.AbstractService):
 
     PR_SET_PDEATHSIG = 1
 
-    def __init__(self, step_period=1, loop_period=0.1, sender=None,
-                 event_type=None, error_event_type=None, watchdog=None,
-                 operate=True, signum=None):
+    def __init__(self, step_period=1, loop_period=0,
+                 schedule_mode=schedulers.FIXED_RATE, period_policy=None,
+                 step_timeout=None, drain_timeout=None, start_delay=0,
+                 start_jitter=0,
+                 period_jitter=0, jitter_mode=schedulers.JITTER_UNIFORM,
+                 jitter_key=None, catch_up=schedulers.CATCH_UP_COALESCE,
+                 max_burst=10, schedule=None, profiler=None,
+                 memory_accounting=False, sender=None, event_type=None,
+                 error_event_type=None, watchdog=None, operate=True,
+                 signum=None):
         super(SoftIrqService, self).__init__(watchdog=watchdog,
                                              operate=operate)
         self._has_running = False
         self._next_step_delta = None
         self._step_period = step_period
+        self._service_name = type(self).__name__
         self._loop_period = loop_period
+        self._scheduler = schedule or schedulers.get_scheduler(
+            schedule_mode,
+            period=step_period,
+            start_delay=start_delay,
+            start_jitter=start_jitter,
+            period_jitter=period_jitter,
+            jitter_mode=jitter_mode,
+            jitter_key=jitter_key,
+            catch_up=catch_up,
+            max_burst=max_burst)
+        self._period_policy = period_policy
+        self._profiler = profiler
+        self._memory_accounting = memory_accounting
+        self._tracemalloc_armed = False
+        self._tracemalloc_started = False
+        self._tracemalloc_snapshot = None
+        self._step_timeout = step_timeout
+        self._drain_timeout = drain_timeout
+        self._step_deadlines = set()
+        self._stop_requested_at = None
+        self._waker = wakeup.Waker()
+        self._histogram = stats.StepHistogram()
         self._launch_id = None
         self._pid = None
         self._iteration_number = 0
@@ -119,6 +307,8 @@ class SoftIrqService(base.AbstractService):
         self._signum_handlers = {
             signal.SIGHUP: self._on_sighup,
             signal.SIGUSR1: self._on_sigusr1,
+            signal.SIGUSR2: self._on_sigusr2,
+            signal.SIGPROF: self._on_sigprof,
         }
 
     def _set_pdeathsig(self):
@@ -156,149 +346,321 @@ class SoftIrqService(base.AbstractService):
         else:
             self._sender.send_event(event_data)
 
-    def _send_step_event(self, event_data):
-        event_data.setdefault('event_type', self._event_type)
+    def _send_step_info_event(self, step_info, event_type, fields):
+        # fast path: don't materialise step info when nobody consumes it
+        if self._sender is None:
+            return
+        event_data = step_info.to_dict()
+        event_data.update(fields)
+        event_data.setdefault('event_type', event_type)
         self._send_event(event_data)
 
-    def _send_exc_step_event(self, exc_event_data):
-        exc_event_data.setdefault('event_type', self._error_event_type)
-        self._send_event(exc_event_data)
+    def _send_step_event(self, step_info, **fields):
+        self._send_step_info_event(step_info, self._event_type, fields)
 
-    def _send_wd_error_event(self, wderr_event_data):
-        wderr_event_data.setdefault('event_type', self._wderr_event_type)
-        self._send_event(wderr_event_data)
+    def _send_exc_step_event(self, step_info, **fields):
+        self._send_step_info_event(step_info, self._error_event_type, fields)
+
+    def _send_wd_error_event(self, step_info, **fields):
+        self._send_step_info_event(step_info, self._wderr_event_type, fields)
 
     def _make_step_info(self):
-        return {
-            'iteration': self._iteration_number,
-            'step_period': self._step_period,
-            'service': type(self).__name__,
-            'service_type': self.SERVICE_TYPE,
-            'pid': self._pid,
-            'launch_id': self._launch_id,
-            'skipped':  True,
-        }
+        return StepInfo(self._iteration_number, self._step_period,
+                        self._service_name, self.SERVICE_TYPE, self._pid,
+                        self._launch_id, missed=self._scheduler.missed)
 
     def _sentry_capture_exception(self, error):
         if sentry_sdk:
             sentry_sdk.capture_exception(error)
 
-    def _loop_step(self):
-        iteration = self._iteration_number
-        step_info = self._make_step_info()
+    def _adapt_period(self, step_info, step_result):
+        if self._period_policy is None:
+            return
+        period = self._period_policy.get_period(step_result)
+        self._scheduler.period = period
+        step_info.effective_period = period
+
+    def _record_step(self, step_info):
+        if step_info.missed:
+            self._histogram.record_missed(step_info.missed)
+        if step_info.skipped:
+            self._histogram.record_skipped()
+            return
+        duration_ns = step_info.duration_ns
+        self._histogram.record(
+            duration_ns,
+            overrun=self._scheduler.is_overrun(duration_ns / 1e9))
+
+    def get_stats(self):
+        """Return step duration statistics (p50/p90/p99/max...)"""
+        return self._histogram.snapshot()
+
+    @staticmethod
+    def _get_memory_usage():
+        """Return RSS in bytes and number of allocated Python blocks"""
+        try:
+            with open('/proc/self/statm', 'rb') as f:
+                rss = int(f.read().split()[1]) * PAGE_SIZE
+        except (IOError, OSError):
+            # peak RSS in KiB is the best approximation on other systems
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return rss, sys.getallocatedblocks()
+
+    def _account_memory(self, step_info, usage_before):
+        rss, blocks = self._get_memory_usage()
+        step_info['rss'] = rss
+        step_info['rss_delta'] = rss - usage_before[0]
+        step_info['heap_blocks'] = blocks
+        step_info['heap_blocks_delta'] = blocks - usage_before[1]
+
+    def _trace_memory(self):
+        """Take tracemalloc snapshot, log top growth since the previous one"""
+        tracemalloc = _get_tracemalloc()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+        if self._tracemalloc_snapshot is None:
+            self._tracemalloc_snapshot = snapshot
+            return
+        top_stats = snapshot.compare_to(self._tracemalloc_snapshot,
+                                        'lineno')[:TRACEMALLOC_TOP]
+        self._l(LOG).warning(
+            "Top %d growing allocation sites:\n%s", len(top_stats),
+            "\n".join(str(stat) for stat in top_stats))
+        self._tracemalloc_armed = False
+        self._tracemalloc_snapshot = None
+        if self._tracemalloc_started:
+            self._tracemalloc_started = False
+            tracemalloc.stop()
+
+    def _generate_heartbeat(self):
+        with iaas_exc.suppress_any():
+            self._watchdog.generate_heartbeat()
+
+    def _handle_step_error(self, step_info, exc_info, excs):
+        """Log & report step or watchdog error, return watchdog error"""
+        iteration = step_info.iteration
+        wd_error = None
+
+        # <watchdog exception>
+        #
+        # watchdog error conditions & states:
+        #     "__enter__ exception"
+        #   or
+        #     "__exit__ exception when step succeeded"
+        #   or
+        #     "__exit__ exception when step failed" (different exceptions)
+        if (step_info.skipped
+                or (not excs)
+                or (exc_info[1] is not excs[0][1])):
+            wd_error = exc_info
+            # ignore minor exception & generate heartbeat
+            if isinstance(wd_error[1], wd_exc.WatchDogMinorException):
+                self._l(LOG).debug(
+                    "Ignoring minor watchdog error on iteration %d: %r",
+                    iteration, wd_error[1])
+                self._generate_heartbeat()
+            # log critical or unknown exceptions but do NOT heartbeat
+            else:
+                self._l(LOG).log(
+                    logging.ERROR,
+                    "Unexpected watchdog exception within iteration %d:",
+                    iteration,
+                    exc_info=wd_error)
+                self._sentry_capture_exception(wd_error[1])
+
+        # <step exception>
+        if excs:
+            self._l(LOG).log(
+                logging.ERROR,
+                "Unexpected step error during iteration number %d",
+                iteration,
+                exc_info=excs[0])
+            self._sentry_capture_exception(excs[0][1])
+
+        return wd_error
+
+    def _finish_step(self, step_info, result, excs, wd_error):
+        """Account finished step and send its events"""
+        self._adapt_period(step_info, result)
+        self._record_step(step_info)
+        if self._tracemalloc_armed:
+            with iaas_exc.suppress_any(adapter=self._l):
+                self._trace_memory()
+        # base event
+        self._send_step_event(step_info, tb=bool(excs))
+        # on exception event
+        if excs:
+            self._send_exc_step_event(step_info,
+                                      error_type=excs[0][0],
+                                      error=repr(excs[0][1]))
+        # watchdog event
+        if wd_error is not None:
+            self._send_wd_error_event(
+                step_info,
+                minor=isinstance(wd_error[1],
+                                 wd_exc.WatchDogMinorException),
+                error_type=wd_error[0],
+                error=repr(wd_error[1]))
+
+    @contextlib.contextmanager
+    def _step_deadline(self):
+        """Abort the step on step timeout or drain timeout after stop"""
+        if self._drain_timeout is None:
+            with deadlines.get_deadline(self._step_timeout):
+                yield
+            return
+        deadline = deadlines.get_deadline(self._step_timeout, expirable=True)
+        with deadline:
+            self._step_deadlines.add(deadline)
+            try:
+                if not self._has_running:
+                    # the step is started after stop (e.g. the last batch)
+                    deadline.expire_in(self._drain_timeout)
+                yield
+            finally:
+                self._step_deadlines.discard(deadline)
+
+    def _drain_steps(self):
+        """Give running steps `drain_timeout` seconds to finish"""
+        if self._drain_timeout is None:
+            return
+        running = list(self._step_deadlines)
+        if running:
+            self._l(LOG).info("Draining %d running steps for up to %ss...",
+                              len(running), self._drain_timeout)
+            for deadline in running:
+                deadline.expire_in(self._drain_timeout)
+
+    def _execute_step(self, step_info, watchdog, prepare=None):
+        """Run the step within watchdog context and report its results
+
+        :param step_info: info of the step
+        :type step_info: class:`StepInfo`
+        :param watchdog: watchdog context of the step
+        :param prepare: callable to run before entering watchdog context,
+            its errors are handled as watchdog ones
+        :type prepare: callable, optional
+        :return: the step result or None if the step has failed
+        """
+        iteration = step_info.iteration
         excs = []
         wd_error = None
+        result = None
+        memory_usage = None
         try:
-            self._on_signum()
+            if prepare is not None:
+                prepare()
             self._l(LOG).debug("Starting iteration number %d", iteration)
-            with _measure(step_info):
-                with self._watchdog:
-                    step_info['skipped'] = False
-                    with _excs(excs):
-                        self._wrapped_step(step_info)
+            if self._memory_accounting:
+                memory_usage = self._get_memory_usage()
+            step_info.start()
+            try:
+                with watchdog:
+                    step_info.skipped = False
+                    try:
+                        with self._step_deadline():
+                            result = self._wrapped_step(step_info)
+                    except Exception:
+                        excs.append(sys.exc_info())
+                        raise
+            finally:
+                step_info.finish()
+                if memory_usage is not None:
+                    self._account_memory(step_info, memory_usage)
             self._l(LOG).debug(
                 "Finished iteration number %d in %0.5f seconds",
-                iteration, step_info['duration'].total_seconds())
-            with iaas_exc.suppress_any():
-                self._watchdog.generate_heartbeat()
+                iteration, step_info.duration_ns / 1e9)
+            self._generate_heartbeat()
         except Exception:
-            exc_info = sys.exc_info()
-
-            # <watchdog exception>
-            #
-            # watchdog error conditions & states:
-            #     "__enter__ exception"
-            #   or
-            #     "__exit__ exception when step succeeded"
-            #   or
-            #     "__exit__ exception when step failed" (different exceptions)
-            if (step_info['skipped']
-                    or (not excs)
-                    or (exc_info[1] is not excs[0][1])):
-                wd_error = exc_info
-                # ignore minor exception & generate heartbeat
-                if isinstance(wd_error[1], wd_exc.WatchDogMinorException):
-                    self._l(LOG).debug(
-                        "Ignoring minor watchdog error on iteration %d: %r",
-                        iteration, wd_error[1])
-                    with iaas_exc.suppress_any():
-                        self._watchdog.generate_heartbeat()
-                # log critical or unknown exceptions but do NOT heartbeat
-                else:
-                    self._l(LOG).log(
-                        logging.ERROR,
-                        "Unexpected watchdog exception within iteration %d:",
-                        iteration,
-                        exc_info=wd_error)
-                    self._sentry_capture_exception(wd_error[1])
-
-            # <step exception>
-            if excs:
-                self._l(LOG).log(
-                    logging.ERROR,
-                    "Unexpected step error during iteration number %d",
-                    iteration,
-                    exc_info=excs[0])
-                self._sentry_capture_exception(excs[0][1])
+            wd_error = self._handle_step_error(step_info, sys.exc_info(),
+                                               excs)
+        finally:
+            self._finish_step(step_info, result, excs, wd_error)
+        return result
+
+    def _loop_step(self):
+        step_info = self._make_step_info()
+        try:
+            return self._execute_step(step_info, self._watchdog,
+                                      prepare=self._on_signum)
         finally:
-            # base event
-            step_event = step_info.copy()
-            step_event['tb'] = bool(excs)
-            self._send_step_event(step_event)
-            # on exception event
-            if excs:
-                step_error_event = step_info.copy()
-                step_error_event['error_type'] = excs[0][0]
-                step_error_event['error'] = repr(excs[0][1])
-                self._send_exc_step_event(step_error_event)
-            # watchdog event
-            if wd_error is not None:
-                watchdog_error_event = step_info.copy()
-                watchdog_error_event['minor'] = isinstance(
-                    wd_error[1], wd_exc.WatchDogMinorException)
-                watchdog_error_event['error_type'] = wd_error[0]
-                watchdog_error_event['error'] = repr(wd_error[1])
-                self._send_wd_error_event(watchdog_error_event)
             # routine
             self._iteration_number += 1
 
+    def _start_running(self):
+        # stop may be requested before serving, e.g. right after the start
+        # of a thread serving the service
+        self._has_running = self._stop_requested_at is None
+
+    def _can_start_step(self):
+        """Check if the next step may be started right now"""
+        return True
+
     def _serve(self):
-        self._has_running = True
-        next_step_time = 0
+        self._start_running()
+        scheduler = self._scheduler
+        scheduler.start(schedulers.monotonic())
         while self._has_running:
-            current_time = time.time()
-
-            if current_time >= next_step_time:
-                next_step_time = current_time + self._step_period
+            if (schedulers.monotonic() >= scheduler.deadline
+                    and self._can_start_step()):
                 self._loop_step()
+                scheduler.step_finished(schedulers.monotonic())
 
             if self._next_step_delta is not None:
-                next_step_time = time.time() + self._next_step_delta
+                scheduler.reschedule(schedulers.monotonic(),
+                                     self._next_step_delta)
                 self._next_step_delta = None
 
             if self._loop_period == 0:
                 # just wait for next step efficiently
-                time_to_sleep = next_step_time - time.time()
+                time_to_sleep = scheduler.deadline - schedulers.monotonic()
                 if time_to_sleep > 0:
-                    time.sleep(time_to_sleep)
+                    self._waker.wait(time_to_sleep)
+                elif not self._can_start_step():
+                    # the step is overdue, wait until it may be started
+                    self._waker.wait()
             else:
-                time.sleep(self._loop_period)
+                self._waker.wait(self._loop_period)
+
+            # signum may be the reason of wakeup, react without delay
+            with iaas_exc.suppress_any(adapter=self._l):
+                self._on_signum()
 
     def _setup(self):
         super(SoftIrqService, self)._setup()
         self._launch_id = str(uuid.uuid4())
         self._pid = os.getpid()
-        self._set_pdeathsig()
+        # prctl() binds the signal to the calling thread, so it's set in
+        # processes serving the service only
+        if self.pdeathsig:
+            self._set_pdeathsig()
+
+    def _flush_sender(self):
+        flush = getattr(self._sender, 'flush', None)
+        if flush is not None:
+            with iaas_exc.suppress_any(adapter=self._l):
+                flush()
 
     def _teardown(self):
         super(SoftIrqService, self)._teardown()
+        if self._profiler is not None:
+            with iaas_exc.suppress_any(adapter=self._l):
+                self._profiler.stop()
+        self._flush_sender()
         self._launch_id = None
         self._pid = None
-        self._l(LOG).info("Service has been stopped")
+        if self._stop_requested_at is None:
+            self._l(LOG).info("Service has been stopped")
+        else:
+            self._l(LOG).info("Service has been stopped in %0.3f seconds "
+                              "after stop request",
+                              schedulers.monotonic()
+                              - self._stop_requested_at)
 
     def _schedule_next_step(self, delta):
         self._l(LOG).info("Rescheduling next step time with delta=%f", delta)
         self._next_step_delta = delta
+        self._waker.wakeup()
 
     def _wrapped_step(self, step_info):
         return self._step()
@@ -320,6 +682,40 @@ class SoftIrqService(base.AbstractService):
         elif root_logger.level == logging.DEBUG:
             root_logger.setLevel(logging.INFO)
 
+    def _on_sigusr2(self):
+        """React on signum == SIGUSR2.
+
+        Start or stop the sampling profiler.
+        """
+
+        if self._profiler is None:
+            self._l(LOG).info("No profiler is configured, ignoring")
+        elif self._profiler.is_running:
+            self._profiler.stop()
+        else:
+            self._profiler.start(
+                name="%s.%s" % (self._service_name,
+                                self.unit_uuid or self._launch_id))
+
+    def _on_sigprof(self):
+        """React on signum == SIGPROF.
+
+        Trace memory allocations and log the top growing allocation sites
+        between the next two iterations.
+        """
+
+        tracemalloc = _get_tracemalloc()
+        if tracemalloc is None:
+            self._l(LOG).info("tracemalloc isn't available, ignoring")
+            return
+        if self._tracemalloc_armed:
+            self._l(LOG).info("Memory allocations are being traced already")
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._tracemalloc_started = True
+        self._tracemalloc_armed = True
+
     def _on_signum(self):
         """React on signum."""
 
@@ -338,7 +734,15 @@ class SoftIrqService(base.AbstractService):
     def _step(self):
         raise NotImplementedError()
 
+    def wakeup(self):
+        """Interrupt waiting for the next step"""
+        self._waker.wakeup()
+
     def stop(self):
         """Stop service"""
         self._l(LOG).info("Stopping...")
         self._has_running = False
+        if self._stop_requested_at is None:
+            self._stop_requested_at = schedulers.monotonic()
+        self._drain_steps()
+        self._waker.wakeup()
@@ -0,0 +1,276 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import abc
+import asyncio
+import logging
+import sys
+
+from loopster.common import exc as iaas_exc
+
+from loopster import exceptions
+from loopster.services import schedulers
+from loopster.services import softirq
+
+
+LOG = logging.getLogger(__name__)
+
+
+class _AsyncWatchDogContext(object):
+    """Watchdog context shared by concurrent coroutine steps
+
+    Watchdogs implementing `__aenter__`/`__aexit__` are used
+    asynchronously, others are entered synchronously. Every step enters the
+    watchdog, but the context is left only by the last running step.
+    """
+
+    def __init__(self, watchdog):
+        super(_AsyncWatchDogContext, self).__init__()
+        self._watchdog = watchdog
+        self._is_async = hasattr(watchdog, '__aenter__')
+        self._users = 0
+
+    async def __aenter__(self):
+        if self._is_async:
+            await self._watchdog.__aenter__()
+        else:
+            self._watchdog.__enter__()
+        self._users += 1
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._users -= 1
+        if self._users:
+            return None
+        if self._is_async:
+            return await self._watchdog.__aexit__(exc_type, exc_val, exc_tb)
+        return self._watchdog.__exit__(exc_type, exc_val, exc_tb)
+
+
+class AsyncSoftIrqService(softirq.SoftIrqService):
+    """Soft IRQ service with coroutine steps driven by asyncio event loop
+
+    `_step()` must be a coroutine function. Up to `max_inflight` steps run
+    concurrently as tasks of the event loop. On stop no new steps are
+    started, the running ones get `drain_timeout` seconds to finish, then
+    they are cancelled, awaited and reported as failed with
+    class:`loopster.exceptions.StepTimeout`. Running steps are cancelled
+    at once, without drain, if the task serving the service is cancelled.
+
+    The service is served by `serve()` like any other service (e.g. in a
+    child process of `ProcessDriver`), `serve_async()` runs it within an
+    already running event loop.
+
+    :param max_inflight: max number of concurrently running steps,
+        defaults to 1
+    :type max_inflight: int, optional
+
+    Other parameters are the same as of
+    class:`loopster.services.softirq.SoftIrqService`.
+    """
+
+    SERVICE_TYPE = 'async_soft_irq'
+
+    def __init__(self, max_inflight=1, **kwargs):
+        super(AsyncSoftIrqService, self).__init__(**kwargs)
+        if max_inflight < 1:
+            raise ValueError("max_inflight must be positive: %r"
+                             % max_inflight)
+        self._max_inflight = max_inflight
+        self._drain_expired = False
+        self._wd_context = _AsyncWatchDogContext(self._watchdog)
+        self._tasks = set()
+        self._wakeup_event = None
+
+    async def _run_step(self, step_info):
+        try:
+            if not self._step_timeout:
+                return await self._wrapped_step(step_info)
+            try:
+                return await asyncio.wait_for(
+                    self._wrapped_step(step_info), self._step_timeout)
+            except asyncio.TimeoutError:
+                raise exceptions.StepTimeout()
+        except asyncio.CancelledError:
+            if not self._drain_expired:
+                raise
+            # the step is aborted after the drain timeout like a sync one
+            raise exceptions.StepTimeout()
+
+    async def _execute_step_async(self, step_info):
+        iteration = step_info.iteration
+        excs = []
+        wd_error = None
+        result = None
+        memory_usage = None
+        try:
+            self._l(LOG).debug("Starting iteration number %d", iteration)
+            if self._memory_accounting:
+                memory_usage = self._get_memory_usage()
+            step_info.start()
+            try:
+                async with self._wd_context:
+                    step_info.skipped = False
+                    try:
+                        result = await self._run_step(step_info)
+                    except Exception:
+                        excs.append(sys.exc_info())
+                        raise
+            finally:
+                step_info.finish()
+                if memory_usage is not None:
+                    self._account_memory(step_info, memory_usage)
+            self._l(LOG).debug(
+                "Finished iteration number %d in %0.5f seconds",
+                iteration, step_info.duration_ns / 1e9)
+            self._generate_heartbeat()
+        except asyncio.CancelledError:
+            self._l(LOG).info("Iteration number %d has been cancelled",
+                              iteration)
+            step_info['cancelled'] = True
+            raise
+        except Exception:
+            wd_error = self._handle_step_error(step_info, sys.exc_info(),
+                                               excs)
+        finally:
+            self._finish_step(step_info, result, excs, wd_error)
+        return result
+
+    def _can_start_step(self):
+        return len(self._tasks) < self._max_inflight
+
+    def _on_task_done(self, task):
+        self._tasks.discard(task)
+        self._wakeup_event.set()
+
+    def _loop_step(self):
+        step_info = self._make_step_info()
+        self._iteration_number += 1
+        task = asyncio.ensure_future(self._execute_step_async(step_info))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_wakeup(self):
+        # drain the waker, it's ready for reading
+        self._waker.wait(0)
+        self._wakeup_event.set()
+
+    async def _wait(self, timeout):
+        try:
+            await asyncio.wait_for(self._wakeup_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup_event.clear()
+
+    async def _abort_tasks(self, tasks):
+        self._l(LOG).info("Aborting %d running steps...", len(tasks))
+        self._drain_expired = True
+        for task in tasks:
+            task.cancel()
+        await asyncio.wait(tasks)
+
+    async def _stop_tasks(self):
+        if not self._tasks:
+            return
+        pending = set(self._tasks)
+        if not self._drain_expired:
+            timeout = None
+            if self._drain_timeout is not None:
+                stop_requested_at = (self._stop_requested_at
+                                     or schedulers.monotonic())
+                timeout = max(stop_requested_at + self._drain_timeout
+                              - schedulers.monotonic(), 0)
+            self._l(LOG).info("Draining %d running steps for up to %ss...",
+                              len(pending), self._drain_timeout)
+            try:
+                _, pending = await asyncio.wait(pending, timeout=timeout)
+            except asyncio.CancelledError:
+                # the service is cancelled while draining
+                await self._abort_tasks(pending)
+                raise
+        if pending:
+            await self._abort_tasks(pending)
+
+    async def _serve_loop(self):
+        self._start_running()
+        scheduler = self._scheduler
+        scheduler.start(schedulers.monotonic())
+        while self._has_running:
+            if (schedulers.monotonic() >= scheduler.deadline
+                    and self._can_start_step()):
+                self._loop_step()
+                scheduler.step_finished(schedulers.monotonic())
+
+            if self._next_step_delta is not None:
+                scheduler.reschedule(schedulers.monotonic(),
+                                     self._next_step_delta)
+                self._next_step_delta = None
+
+            if self._loop_period == 0:
+                timeout = scheduler.deadline - schedulers.monotonic()
+                if timeout > 0:
+                    await self._wait(timeout)
+                elif not self._can_start_step():
+                    await self._wait(None)
+            else:
+                await self._wait(self._loop_period)
+
+            # signum may be the reason of wakeup, react without delay
+            with iaas_exc.suppress_any(adapter=self._l):
+                self._on_signum()
+
+    async def serve_async(self):
+        """Serve within running event loop (without signal subscription)"""
+        loop = asyncio.get_event_loop()
+        self._wakeup_event = asyncio.Event()
+        self._drain_expired = False
+        loop.add_reader(self._waker.fileno(), self._on_wakeup)
+        try:
+            await self._serve_loop()
+        except asyncio.CancelledError:
+            # the service is killed, running steps aren't drained
+            self._drain_expired = True
+            raise
+        finally:
+            loop.remove_reader(self._waker.fileno())
+            await self._stop_tasks()
+
+    async def serve_operational_async(self):
+        """Set up, serve and tear down within running event loop"""
+        try:
+            self._l(LOG).info("Preparing to serve...")
+            self._setup()
+            self._l(LOG).info("Serving...")
+            await self.serve_async()
+            self._l(LOG).info("Finished serving normally.")
+        finally:
+            self._l(LOG).info("Tearing down...")
+            self._teardown()
+
+    def _serve(self):
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.serve_async())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    @abc.abstractmethod
+    async def _step(self):
+        raise NotImplementedError()
@@ -0,0 +1,129 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+import logging
+import threading
+
+from loopster.common import exc as iaas_exc
+
+from loopster.services import softirq
+
+
+LOG = logging.getLogger(__name__)
+
+
+class _SharedWatchDogContext(object):
+    """Watchdog context shared by concurrent steps
+
+    Every step enters the watchdog (health check & heartbeat), but the
+    context is left only by the last running step, so steps don't reset
+    the "in context" mark of each other.
+    """
+
+    def __init__(self, watchdog, lock):
+        super(_SharedWatchDogContext, self).__init__()
+        self._watchdog = watchdog
+        self._lock = lock
+        self._users = 0
+
+    def __enter__(self):
+        with self._lock:
+            self._watchdog.__enter__()
+            self._users += 1
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        with self._lock:
+            self._users -= 1
+            if self._users == 0:
+                return self._watchdog.__exit__(exc_type, exc_val, exc_tb)
+
+
+class ConcurrentSoftIrqService(softirq.SoftIrqService):
+    """Soft IRQ service running steps concurrently in a thread pool
+
+    Every scheduled step is dispatched to a pool of `max_inflight` threads,
+    if all of them are busy the step waits for a free one. It suits I/O
+    bound steps which would otherwise occupy many service processes.
+    Step events contain `worker_id` - the name of the thread which has run
+    the step. The sender must be thread-safe (e.g.
+    class:`loopster.senders.BufferedSender`).
+
+    :param max_inflight: max number of concurrently running steps,
+        defaults to 4
+    :type max_inflight: int, optional
+
+    Other parameters are the same as of
+    class:`loopster.services.softirq.SoftIrqService`.
+    """
+
+    SERVICE_TYPE = 'concurrent_soft_irq'
+
+    def __init__(self, max_inflight=4, **kwargs):
+        super(ConcurrentSoftIrqService, self).__init__(**kwargs)
+        if max_inflight < 1:
+            raise ValueError("max_inflight must be positive: %r"
+                             % max_inflight)
+        self._max_inflight = max_inflight
+        self._inflight = 0
+        self._inflight_lock = threading.Lock()
+        self._wd_lock = threading.Lock()
+        self._wd_context = _SharedWatchDogContext(self._watchdog,
+                                                  self._wd_lock)
+        self._executor = None
+
+    def _generate_heartbeat(self):
+        with self._wd_lock:
+            super(ConcurrentSoftIrqService, self)._generate_heartbeat()
+
+    def _can_start_step(self):
+        return self._inflight < self._max_inflight
+
+    def _run_step(self, step_info):
+        try:
+            step_info['worker_id'] = threading.current_thread().name
+            self._execute_step(step_info, self._wd_context)
+        finally:
+            with self._inflight_lock:
+                self._inflight -= 1
+            self._waker.wakeup()
+
+    def _loop_step(self):
+        step_info = self._make_step_info()
+        self._iteration_number += 1
+        with self._inflight_lock:
+            self._inflight += 1
+        try:
+            self._executor.submit(self._run_step, step_info)
+        except Exception:
+            with self._inflight_lock:
+                self._inflight -= 1
+            raise
+
+    def _serve(self):
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=self._max_inflight,
+            thread_name_prefix="%s-worker" % self._service_name)
+        try:
+            super(ConcurrentSoftIrqService, self)._serve()
+        finally:
+            self._l(LOG).info("Waiting for %d running steps...",
+                              self._inflight)
+            with iaas_exc.suppress_any(adapter=self._l):
+                self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,199 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#    All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import abc
+import ctypes
+import logging
+import multiprocessing as mp
+import queue
+
+from loopster.common import exc as iaas_exc
+
+from loopster.services import schedulers
+from loopster.services import softirq
+from loopster import wakeup
+
+
+LOG = logging.getLogger(__name__)
+
+# max time to wait for items which have been put but haven't reached the
+# pipe yet (they are flushed by the feeder thread of the producer)
+IN_FLIGHT_TIMEOUT = 0.1
+
+
+class WorkQueue(object):
+    """Multi-producer single-consumer queue of work items between processes
+
+    The queue is created before fork (e.g. in a hub) and passed to the
+    consumer service as `queue=`. Every put item wakes the consumer up.
+    The depth of the queue is kept in shared memory, so producers may apply
+    backpressure without asking the consumer.
+
+    :param maxsize: max number of queued items, `put()` blocks or raises
+        `queue.Full` on overflow, defaults to 0 - unlimited
+    :type maxsize: int, optional
+    """
+
+    def __init__(self, maxsize=0):
+        super(WorkQueue, self).__init__()
+        self._queue = mp.Queue(maxsize)
+        self._depth = mp.Value(ctypes.c_long, 0)
+        self._waker = wakeup.Waker()
+
+    @property
+    def waker(self):
+        return self._waker
+
+    def qsize(self):
+        """Return number of items put but not taken by the consumer yet"""
+        return self._depth.value
+
+    def put(self, item, block=True, timeout=None):
+        """Put work item and wake the consumer up
+
+        :raises queue.Full: if the queue is full and `block` is False or
+            `timeout` has expired
+        """
+        # count the item first, so the consumer never takes it uncounted
+        with self._depth.get_lock():
+            self._depth.value += 1
+        try:
+            self._queue.put(item, block, timeout)
+        except Exception:
+            with self._depth.get_lock():
+                self._depth.value -= 1
+            raise
+        self._waker.wakeup()
+
+    def get_batch(self, max_items):
+        """Take up to `max_items` queued items without waiting for new ones
+
+        Items are taken until the queue is empty, the depth counter is only
+        used to wait shortly for items which are still in flight.
+
+        :return: list of items, may be empty
+        """
+        batch = []
+        while len(batch) < max_items:
+            try:
+                if self._depth.value > 0:
+                    item = self._queue.get(timeout=IN_FLIGHT_TIMEOUT)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            with self._depth.get_lock():
+                self._depth.value -= 1
+            batch.append(item)
+        return batch
+
+
+class QueueSoftIrqService(softirq.SoftIrqService):
+    """Soft IRQ service running steps on batches of pushed work items
+
+    `_step(batch)` is run as soon as work items are put into the queue:
+    once the first item arrives the service waits up to `max_linger`
+    seconds for more of them, but no longer than the batch is full. While
+    the queue is empty, the watchdog heartbeat is generated every
+    `step_period` seconds (it must be positive). Items taken from the
+    queue are processed before the service stops, the rest remain in the
+    queue for the next launch.
+
+    :param queue: queue of work items
+    :type queue: class:`WorkQueue`
+    :param max_batch: max number of items in a batch, defaults to 100
+    :type max_batch: int, optional
+    :param max_linger: max time to wait for a full batch, defaults to 0 -
+        process already queued items at once
+    :type max_linger: float, optional
+
+    Other parameters are the same as of
+    class:`loopster.services.softirq.SoftIrqService`, step scheduling
+    parameters are not used.
+    """
+
+    SERVICE_TYPE = 'queue_soft_irq'
+
+    def __init__(self, queue, max_batch=100, max_linger=0, **kwargs):
+        super(QueueSoftIrqService, self).__init__(**kwargs)
+        if max_batch < 1:
+            raise ValueError("max_batch must be positive: %r" % max_batch)
+        if self._step_period <= 0:
+            raise ValueError("step_period must be positive: %r"
+                             % self._step_period)
+        self._queue = queue
+        self._max_batch = max_batch
+        self._max_linger = max_linger
+        self._batch = []
+        # wakeups of the queue are the wakeups of the serving loop
+        self._waker.close()
+        self._waker = queue.waker
+
+    def get_stats(self):
+        result = super(QueueSoftIrqService, self).get_stats()
+        result['queue_depth'] = self._queue.qsize()
+        return result
+
+    def _wrapped_step(self, step_info):
+        step_info['batch_size'] = len(self._batch)
+        return self._step(self._batch)
+
+    def _process_batch(self):
+        try:
+            self._loop_step()
+        finally:
+            self._batch = []
+
+    def _serve(self):
+        self._start_running()
+        linger_deadline = None
+        heartbeat_deadline = schedulers.monotonic() + self._step_period
+        while self._has_running:
+            self._batch.extend(
+                self._queue.get_batch(self._max_batch - len(self._batch)))
+            now = schedulers.monotonic()
+            if self._batch:
+                if linger_deadline is None:
+                    linger_deadline = now + self._max_linger
+                if (len(self._batch) >= self._max_batch
+                        or now >= linger_deadline):
+                    self._process_batch()
+                    linger_deadline = None
+                    heartbeat_deadline = (schedulers.monotonic()
+                                          + self._step_period)
+                    continue
+                timeout = linger_deadline - now
+            else:
+                if now >= heartbeat_deadline:
+                    self._generate_heartbeat()
+                    heartbeat_deadline = now + self._step_period
+                timeout = heartbeat_deadline - now
+
+            self._waker.wait(timeout)
+
+            with iaas_exc.suppress_any(adapter=self._l):
+                self._on_signum()
+
+        if self._batch:
+            self._l(LOG).info("Processing %d taken items before stop...",
+                              len(self._batch))
+            self._process_batch()
+
+    @abc.abstractmethod
+    def _step(self, batch):
+        raise NotImplementedError()
@@ -0,0 +1,128 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group.
+#
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import ctypes
+import multiprocessing
+import threading
+
+
+# each power of two is split into 2^SUB_BUCKET_BITS linear sub-buckets,
+# so the relative error of recorded values is less than 1/16
+SUB_BUCKET_BITS = 4
+# values are recorded in microseconds, up to 2^40us (~12 days)
+MAX_VALUE_BITS = 40
+
+_COUNT_INDEX = 0
+_SUM_INDEX = 1
+_MAX_INDEX = 2
+_OVERRUNS_INDEX = 3
+_SKIPPED_INDEX = 4
+_MISSED_INDEX = 5
+_HEADER_SIZE = 6
+
+
+def _bucket_index(value):
+    shift = max(value.bit_length() - (SUB_BUCKET_BITS + 1), 0)
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_value(index):
+    """Return the middle of the bucket value range"""
+    if index < (2 << SUB_BUCKET_BITS):
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    low = (index - (shift << SUB_BUCKET_BITS)) << shift
+    return low + (1 << shift) // 2
+
+
+_BUCKETS = _bucket_index((1 << MAX_VALUE_BITS) - 1) + 1
+
+
+class StepHistogram(object):
+    """HDR-style log-bucketed histogram of step durations
+
+    Counters live in a fixed-size shared memory block, so a histogram
+    created in a hub before fork is updated by the service process and
+    read by the hub without any IPC round-trips.
+    """
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self):
+        super(StepHistogram, self).__init__()
+        self._data = multiprocessing.RawArray(ctypes.c_uint64,
+                                              _HEADER_SIZE + _BUCKETS)
+        # NOTE: guards concurrent writers within a process only,
+        #       a service process is the only writer
+        self._lock = threading.Lock()
+
+    def record(self, duration_ns, overrun=False):
+        """Record step duration
+
+        :param duration_ns: step duration in nanoseconds
+        :type duration_ns: int
+        :param overrun: the step took longer than its period
+        :type overrun: bool
+        """
+        value = duration_ns // 1000
+        index = _HEADER_SIZE + min(_bucket_index(value), _BUCKETS - 1)
+        data = self._data
+        with self._lock:
+            data[index] += 1
+            data[_COUNT_INDEX] += 1
+            data[_SUM_INDEX] += value
+            if value > data[_MAX_INDEX]:
+                data[_MAX_INDEX] = value
+            if overrun:
+                data[_OVERRUNS_INDEX] += 1
+
+    def record_skipped(self):
+        """Record the step skipped by watchdog"""
+        with self._lock:
+            self._data[_SKIPPED_INDEX] += 1
+
+    def record_missed(self, count):
+        """Record schedule ticks missed because of overrunning steps"""
+        with self._lock:
+            self._data[_MISSED_INDEX] += count
+
+    def snapshot(self):
+        """Return current statistics, durations are in seconds"""
+        data = self._data[:]
+        count = data[_COUNT_INDEX]
+        result = {
+            'count': count,
+            'overruns': data[_OVERRUNS_INDEX],
+            'skipped': data[_SKIPPED_INDEX],
+            'missed': data[_MISSED_INDEX],
+            'max': data[_MAX_INDEX] / 1e6,
+            'mean': data[_SUM_INDEX] / 1e6 / count if count else 0.0,
+        }
+        buckets = data[_HEADER_SIZE:]
+        # recorded buckets may be updated meanwhile, rely on their own sum
+        total = sum(buckets)
+        seen = 0
+        index = 0
+        for percentile in self.PERCENTILES:
+            threshold = total * percentile / 100.0
+            while index < _BUCKETS - 1 and (
+                    seen + buckets[index] < threshold or not buckets[index]):
+                seen += buckets[index]
+                index += 1
+            value = _bucket_value(index) if total else 0
+            result['p%d' % percentile] = min(value, data[_MAX_INDEX]) / 1e6
+        return result
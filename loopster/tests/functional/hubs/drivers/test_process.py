@@ -24,7 +24,9 @@ import uuid
 from loopster import exceptions
 from loopster.hubs.drivers import process
 from loopster.services import base as base_service
+from loopster.services import softirq
 from loopster import states
+from loopster import units
 
 
 class BasicService(base_service.AbstractService):
@@ -194,3 +196,101 @@ class ProcessDriverTestCase(unittest.TestCase):
                           states.State.RUNNING, states.State.INITIAL)
 
         self.stop_process()
+
+
+class FastService(softirq.SoftIrqService):
+
+    def _step(self):
+        pass
+
+
+class ProcessDriverRecycleTestCase(unittest.TestCase):
+
+    def test_recycle_by_iterations(self):
+        service_uuid = uuid.uuid4()
+        driver = process.ProcessDriver()
+        driver.add_service(service_uuid, FastService, {'step_period': 0.01},
+                           recycle=units.RecyclePolicy(max_iterations=5))
+        svc_storage = driver._services[service_uuid]
+        driver.set_state(service_uuid, states.State.INITIAL,
+                         states.State.RUNNING)
+        old_process = svc_storage[process.PROCESS_KEY]
+
+        deadline = time.monotonic() + 10
+        while (svc_storage[process.PROCESS_KEY] is old_process
+               and time.monotonic() < deadline):
+            driver.recycle_services()
+            time.sleep(0.01)
+
+        self.assertIsNot(old_process, svc_storage[process.PROCESS_KEY])
+        self.assertEqual(states.State.RUNNING,
+                         driver.get_states()[service_uuid])
+
+        driver.stop_all_services()
+        driver.wait_all_services()
+
+        self.assertFalse(old_process.is_alive())
+        self.assertEqual([], svc_storage[process.RETIRING_KEY])
+        self.assertEqual(states.State.STOPPED,
+                         driver.get_states()[service_uuid])
+
+
+class SlowService(softirq.SoftIrqService):
+
+    def _step(self):
+        time.sleep(10)
+
+
+class ProcessDriverDrainTestCase(unittest.TestCase):
+
+    def _run_and_stop(self, svc_kwargs):
+        service_uuid = uuid.uuid4()
+        driver = process.ProcessDriver(stop_timeout=1)
+        driver.add_service(service_uuid, SlowService, svc_kwargs)
+        driver.set_state(service_uuid, states.State.INITIAL,
+                         states.State.RUNNING)
+        svc_process = driver._services[service_uuid][process.PROCESS_KEY]
+        # let the step start
+        time.sleep(0.3)
+
+        started_at = time.monotonic()
+        driver.stop_all_services()
+        driver.wait_all_services()
+
+        self.assertLess(time.monotonic() - started_at, 3)
+        return svc_process.exitcode, driver.get_states()[service_uuid]
+
+    def test_drain_step(self):
+        self.assertEqual((0, states.State.STOPPED),
+                         self._run_and_stop({'drain_timeout': 0.1}))
+
+    def test_kill_after_stop_timeout(self):
+        self.assertEqual((-9, states.State.STOPPED),
+                         self._run_and_stop({}))
+
+
+class ProcessDriverShutdownTestCase(unittest.TestCase):
+
+    def test_shutdown_all_services(self):
+        driver = process.ProcessDriver()
+        fast_uuid = uuid.uuid4()
+        slow_uuid = uuid.uuid4()
+        driver.add_service(fast_uuid, SlowService, {'drain_timeout': 0.1})
+        driver.add_service(slow_uuid, SlowService, {})
+        for target_uuid in (fast_uuid, slow_uuid):
+            driver.set_state(target_uuid, states.State.INITIAL,
+                             states.State.RUNNING)
+        # let the steps start
+        time.sleep(0.3)
+
+        started_at = time.monotonic()
+        report = driver.shutdown_all_services(timeout=1)
+
+        self.assertLess(time.monotonic() - started_at, 3)
+        self.assertEqual((0, False), (report[fast_uuid]['exitcode'],
+                                      report[fast_uuid]['killed']))
+        self.assertEqual((-9, True), (report[slow_uuid]['exitcode'],
+                                      report[slow_uuid]['killed']))
+        self.assertLess(report[fast_uuid]['duration'], 1)
+        self.assertEqual({states.State.STOPPED},
+                         set(driver.get_states().values()))
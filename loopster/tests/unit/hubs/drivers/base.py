@@ -0,0 +1,51 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+import uuid
+
+from loopster import states
+
+
+class LaunchDriverTestMixin(object):
+    """Helpers for test cases of drivers based on `LaunchDriver`
+
+    `setUp()` of the test case must create `self.driver`.
+    """
+
+    def setUp(self):
+        super(LaunchDriverTestMixin, self).setUp()
+        self.service_uuid = uuid.uuid4()
+
+    def _add_service(self, svc_class, svc_uuid=None, **svc_kwargs):
+        svc_uuid = svc_uuid or self.service_uuid
+        self.driver.add_service(svc_uuid, svc_class, svc_kwargs)
+        return self.driver._services[svc_uuid]
+
+    def _start(self, old_state=states.State.INITIAL, svc_uuid=None):
+        self.driver.set_state(svc_uuid or self.service_uuid, old_state,
+                              states.State.RUNNING)
+
+    def _get_state(self, svc_uuid=None):
+        return self.driver.get_states()[svc_uuid or self.service_uuid]
+
+    def _wait_state(self, state, timeout=5):
+        deadline = time.monotonic() + timeout
+        while self._get_state() is not state and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIs(state, self._get_state())
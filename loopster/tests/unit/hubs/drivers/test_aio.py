@@ -0,0 +1,202 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import time
+import unittest
+import uuid
+
+from loopster.hubs.drivers import aio
+from loopster.services import softirq
+from loopster.services import softirq_async
+from loopster import states
+from loopster.tests.unit.hubs.drivers import base
+
+
+class SleepyService(softirq_async.AsyncSoftIrqService):
+
+    async def _step(self):
+        pass
+
+
+class FailingService(softirq_async.AsyncSoftIrqService):
+
+    async def serve_async(self):
+        raise ValueError()
+
+    async def _step(self):
+        pass
+
+
+class StuckService(softirq_async.AsyncSoftIrqService):
+    step_started = False
+
+    async def _step(self):
+        self.step_started = True
+        await asyncio.sleep(100)
+
+
+class BlockingService(softirq_async.AsyncSoftIrqService):
+
+    async def _step(self):
+        time.sleep(0.5)
+
+
+class SyncService(softirq.SoftIrqService):
+
+    def _step(self):
+        pass
+
+
+class AsyncioDriverTestCase(base.LaunchDriverTestMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(AsyncioDriverTestCase, self).setUp()
+        self.driver = aio.AsyncioDriver(stop_timeout=1, max_loop_lag=0.2)
+        self.addCleanup(self.driver.close)
+        self.addCleanup(self.driver.shutdown_all_services, timeout=1)
+
+    def _wait_step_started(self, svc, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not svc.step_started:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_sync_service_rejected(self):
+        self.assertRaises(ValueError, self.driver.add_service,
+                          self.service_uuid, SyncService, {})
+
+    def test_start_stop(self):
+        svc_storage = self._add_service(SleepyService, step_period=0.01)
+        self.assertIs(states.State.INITIAL, self._get_state())
+        self.assertFalse(svc_storage[aio.SERVICE_KEY].pdeathsig)
+
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+
+        self.assertIs(states.State.RUNNING, self._get_state())
+
+        self.driver.set_state(self.service_uuid, states.State.RUNNING,
+                              states.State.STOPPED)
+        self.driver.wait_service(self.service_uuid)
+
+        self.assertIs(states.State.STOPPED, self._get_state())
+
+        self.driver.set_state(self.service_uuid, states.State.STOPPED,
+                              states.State.RUNNING)
+
+        self.assertIs(states.State.RUNNING, self._get_state())
+
+    def test_many_services(self):
+        svc_uuids = [uuid.uuid4() for _ in range(100)]
+        for svc_uuid in svc_uuids:
+            self._add_service(SleepyService, svc_uuid, step_period=0.01)
+            self.driver.set_state(svc_uuid, states.State.INITIAL,
+                                  states.State.RUNNING)
+
+        report = self.driver.shutdown_all_services(timeout=5)
+
+        self.assertEqual(set(svc_uuids), set(report))
+        for svc_report in report.values():
+            self.assertIs(states.State.STOPPED, svc_report['state'])
+            self.assertFalse(svc_report['killed'])
+
+    def test_stop_cancels_after_timeout(self):
+        self.driver._stop_timeout = 0.05
+        # the service drains its steps without limit by default
+        svc_storage = self._add_service(StuckService)
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+        self._wait_step_started(svc_storage[aio.SERVICE_KEY])
+
+        self.driver.set_state(self.service_uuid, states.State.RUNNING,
+                              states.State.STOPPED)
+        self.driver.wait_service(self.service_uuid)
+
+        self.assertTrue(svc_storage[aio.LAUNCH_KEY][aio.DONE_KEY].is_set())
+        self.assertIs(states.State.STOPPED, self._get_state())
+
+    def test_failed_restart(self):
+        svc_storage = self._add_service(FailingService)
+
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+
+        self._wait_state(states.State.FAILED)
+        old_launch = svc_storage[aio.LAUNCH_KEY]
+
+        self.driver.set_state(self.service_uuid, states.State.FAILED,
+                              states.State.RUNNING)
+
+        self.assertIsNot(old_launch, svc_storage[aio.LAUNCH_KEY])
+        self._wait_state(states.State.FAILED)
+
+    def test_numb_restart(self):
+        svc_storage = self._add_service(StuckService)
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+        old_launch = svc_storage[aio.LAUNCH_KEY]
+        self._wait_step_started(svc_storage[aio.SERVICE_KEY])
+        svc_storage[aio.SERVICE_KEY].get_watchdog().mark_failed()
+
+        self.assertIs(states.State.NUMB, self._get_state())
+
+        self.driver.set_state(self.service_uuid, states.State.NUMB,
+                              states.State.RUNNING)
+
+        self.assertTrue(old_launch[aio.DONE_KEY].is_set())
+        self.assertIsNot(old_launch, svc_storage[aio.LAUNCH_KEY])
+        self.assertIs(states.State.RUNNING, self._get_state())
+
+    def test_numb_kill_hung_step(self):
+        # the service drains its steps without limit by default
+        svc_storage = self._add_service(StuckService)
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+        launch = svc_storage[aio.LAUNCH_KEY]
+        self._wait_step_started(svc_storage[aio.SERVICE_KEY])
+        svc_storage[aio.SERVICE_KEY].get_watchdog().mark_failed()
+
+        self.driver.set_state(self.service_uuid, states.State.NUMB,
+                              states.State.STOPPED)
+
+        self.assertTrue(launch[aio.DONE_KEY].is_set())
+        self.assertIs(states.State.STOPPED, self._get_state())
+
+    def test_lagging_loop_isnt_numb(self):
+        svc_storage = self._add_service(BlockingService, step_period=0)
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+        time.sleep(0.4)
+        svc_storage[aio.SERVICE_KEY].get_watchdog().mark_failed()
+
+        self.assertGreater(self.driver.get_loop_lag(), 0.2)
+        self.assertIs(states.State.RUNNING, self._get_state())
+
+    def test_shutdown_cancels_stuck(self):
+        self.driver._stop_timeout = None
+        svc_storage = self._add_service(StuckService)
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+        self._wait_step_started(svc_storage[aio.SERVICE_KEY])
+
+        report = self.driver.shutdown_all_services(timeout=0.05)
+
+        self.assertTrue(report[self.service_uuid]['killed'])
+        self.assertIs(states.State.STOPPED,
+                      report[self.service_uuid]['state'])
@@ -0,0 +1,90 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+import uuid
+
+import mock
+
+from loopster.hubs.drivers import base
+from loopster import states
+
+
+class MinimalDriver(base.AbstractDriver):
+    """Driver implementing only the abstract methods"""
+
+    def validate_target_state(self, state):
+        pass
+
+    def get_states(self):
+        return {}
+
+    def set_state(self, target_uuid, old_state, new_state):
+        pass
+
+    def add_service(self, target_uuid, svc_class, svc_kwargs, recycle=None):
+        pass
+
+    def remove_service(self, target_uuid):
+        pass
+
+    def stop_service(self, target_uuid):
+        pass
+
+    def stop_all_services(self):
+        pass
+
+    def wait_service(self, target_uuid):
+        pass
+
+    def wait_all_services(self):
+        pass
+
+
+class AbstractDriverTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = MinimalDriver()
+
+    def test_no_wakeups(self):
+        self.assertIsNone(self.driver.wakeup_all_services())
+
+    def test_no_stats(self):
+        self.assertEqual({}, self.driver.get_services_stats())
+
+    def test_no_recycling(self):
+        self.assertIsNone(self.driver.recycle_services())
+
+    def test_no_exit_notifications(self):
+        self.assertIsNone(self.driver.fileno())
+        self.assertEqual([], self.driver.collect_exits())
+
+    def test_shutdown_all_services(self):
+        target_uuid = uuid.uuid4()
+        self.driver.get_states = mock.Mock(
+            return_value={target_uuid: states.State.STOPPED})
+        self.driver.stop_all_services = mock.Mock()
+        self.driver.wait_all_services = mock.Mock()
+
+        report = self.driver.shutdown_all_services(timeout=1)
+
+        self.driver.stop_all_services.assert_called_once_with()
+        self.driver.wait_all_services.assert_called_once_with()
+        self.assertEqual([target_uuid], list(report))
+        self.assertIs(states.State.STOPPED, report[target_uuid]['state'])
+        self.assertFalse(report[target_uuid]['killed'])
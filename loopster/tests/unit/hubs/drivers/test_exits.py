@@ -0,0 +1,70 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing as mp
+import select
+import time
+import unittest
+
+import mock
+
+from loopster.hubs.drivers import exits
+
+
+class ExitNotifierTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.notifier = exits.ExitNotifier()
+        self.addCleanup(self.notifier.close)
+
+    def _start_process(self, duration):
+        process = mp.Process(target=time.sleep, args=(duration,))
+        process.start()
+        self.addCleanup(process.join)
+        self.addCleanup(process.terminate)
+        return process
+
+    def _check_exit(self):
+        exiting = self._start_process(0)
+        running = self._start_process(10)
+        self.notifier.watch('exiting', exiting)
+        self.notifier.watch('running', running)
+
+        readable, _, _ = select.select([self.notifier.fileno()], [], [], 10)
+
+        self.assertTrue(readable)
+        self.assertEqual(['exiting'], self.notifier.poll())
+        self.assertFalse(self.notifier.is_watched('exiting'))
+        self.assertTrue(self.notifier.is_watched('running'))
+        self.assertEqual([], self.notifier.poll())
+
+    def test_exit(self):
+        self._check_exit()
+
+    @mock.patch.object(exits, '_HAS_PIDFD', False)
+    def test_exit_sentinel(self):
+        self._check_exit()
+
+    def test_unwatch(self):
+        process = self._start_process(0)
+        self.notifier.watch('key', process)
+        self.notifier.unwatch('key')
+        process.join()
+
+        self.assertEqual([], self.notifier.poll())
+        self.notifier.unwatch('key')
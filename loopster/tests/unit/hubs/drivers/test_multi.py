@@ -0,0 +1,198 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import select
+import unittest
+import uuid
+
+import mock
+
+from loopster import exceptions
+from loopster.hubs.drivers import multi
+from loopster import states
+
+
+class MultiDriverTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.service_uuid = uuid.uuid4()
+        self.process_driver = mock.MagicMock()
+        self.process_driver.fileno.return_value = None
+        self.thread_driver = mock.MagicMock()
+        self.thread_driver.fileno.return_value = None
+        self.svc_class = mock.Mock()
+        self.driver = multi.MultiDriver(
+            drivers={'processes': self.process_driver,
+                     'threads': self.thread_driver},
+            default='processes')
+
+    def test_unknown_default(self):
+        self.assertRaises(exceptions.DriverNotFound, multi.MultiDriver,
+                          drivers={'threads': self.thread_driver},
+                          default='processes')
+
+    def test_single_driver_is_default(self):
+        driver = multi.MultiDriver(drivers={'threads': self.thread_driver})
+
+        driver.add_service(self.service_uuid, self.svc_class, {})
+
+        self.thread_driver.add_service.assert_called_once_with(
+            self.service_uuid, self.svc_class, {})
+
+    def test_no_default(self):
+        driver = multi.MultiDriver(drivers={
+            'processes': self.process_driver,
+            'threads': self.thread_driver})
+
+        self.assertRaises(ValueError, driver.add_service,
+                          self.service_uuid, self.svc_class, {})
+
+    def test_add_service_default(self):
+        recycle = mock.Mock()
+
+        self.driver.add_service(self.service_uuid, self.svc_class, {},
+                                recycle=recycle)
+
+        self.process_driver.add_service.assert_called_once_with(
+            self.service_uuid, self.svc_class, {}, recycle=recycle)
+        self.assertEqual('processes',
+                         self.driver.get_target_driver_name(self.service_uuid))
+
+    def test_add_service_explicit(self):
+        self.driver.add_service(self.service_uuid, self.svc_class, {},
+                                driver='threads')
+
+        self.thread_driver.add_service.assert_called_once_with(
+            self.service_uuid, self.svc_class, {})
+        self.process_driver.add_service.assert_not_called()
+
+    def test_add_service_route(self):
+        route = mock.Mock(return_value='threads')
+        driver = multi.MultiDriver(
+            drivers={'processes': self.process_driver,
+                     'threads': self.thread_driver},
+            default='processes', route=route)
+
+        driver.add_service(self.service_uuid, self.svc_class, {'a': 1})
+
+        route.assert_called_once_with(self.svc_class, {'a': 1})
+        self.thread_driver.add_service.assert_called_once_with(
+            self.service_uuid, self.svc_class, {'a': 1})
+
+    def test_add_service_unknown_driver(self):
+        self.assertRaises(exceptions.DriverNotFound, self.driver.add_service,
+                          self.service_uuid, self.svc_class, {},
+                          driver='tasks')
+
+    def test_add_service_duplicate(self):
+        self.driver.add_service(self.service_uuid, self.svc_class, {})
+
+        self.assertRaises(exceptions.ServiceExists, self.driver.add_service,
+                          self.service_uuid, self.svc_class, {},
+                          driver='threads')
+
+    def test_set_state_routed(self):
+        self.driver.add_service(self.service_uuid, self.svc_class, {},
+                                driver='threads')
+
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+
+        self.thread_driver.set_state.assert_called_once_with(
+            self.service_uuid, states.State.INITIAL, states.State.RUNNING)
+        self.process_driver.set_state.assert_not_called()
+
+    def test_unknown_service(self):
+        self.assertRaises(exceptions.ServiceNotFound, self.driver.set_state,
+                          self.service_uuid, states.State.INITIAL,
+                          states.State.RUNNING)
+        self.assertRaises(exceptions.ServiceNotFound,
+                          self.driver.remove_service, self.service_uuid)
+
+    def test_remove_service(self):
+        self.driver.add_service(self.service_uuid, self.svc_class, {})
+
+        self.driver.remove_service(self.service_uuid)
+
+        self.process_driver.remove_service.assert_called_once_with(
+            self.service_uuid)
+        self.assertRaises(exceptions.ServiceNotFound,
+                          self.driver.get_target_driver_name,
+                          self.service_uuid)
+
+    def test_get_states_merged(self):
+        thread_uuid = uuid.uuid4()
+        self.process_driver.get_states.return_value = {
+            self.service_uuid: states.State.RUNNING}
+        self.thread_driver.get_states.return_value = {
+            thread_uuid: states.State.FAILED}
+
+        self.assertEqual({self.service_uuid: states.State.RUNNING,
+                          thread_uuid: states.State.FAILED},
+                         self.driver.get_states())
+
+    def test_validate_target_state_by_all(self):
+        self.thread_driver.validate_target_state.side_effect = (
+            exceptions.DriverUnsupportedState())
+
+        self.assertRaises(exceptions.DriverUnsupportedState,
+                          self.driver.validate_target_state,
+                          states.State.NUMB)
+
+    def test_shutdown_all_services(self):
+        thread_uuid = uuid.uuid4()
+        self.process_driver.shutdown_all_services.return_value = {
+            self.service_uuid: {'state': states.State.STOPPED,
+                                'killed': True, 'duration': 1}}
+        self.thread_driver.shutdown_all_services.return_value = {
+            thread_uuid: {'state': states.State.STOPPED,
+                          'killed': False, 'duration': 1}}
+
+        report = self.driver.shutdown_all_services(timeout=10)
+
+        self.process_driver.stop_all_services.assert_called_once_with()
+        self.thread_driver.stop_all_services.assert_called_once_with()
+        self.assertEqual({self.service_uuid, thread_uuid}, set(report))
+        self.assertTrue(report[self.service_uuid]['killed'])
+        for driver in (self.process_driver, self.thread_driver):
+            timeout = driver.shutdown_all_services.call_args[1]['timeout']
+            self.assertTrue(0 < timeout <= 10)
+
+    def test_fileno_none(self):
+        self.assertIsNone(self.driver.fileno())
+
+    def test_fileno_exits(self):
+        rfd, wfd = os.pipe()
+        self.addCleanup(os.close, rfd)
+        self.addCleanup(os.close, wfd)
+        self.thread_driver.fileno.return_value = rfd
+        self.thread_driver.collect_exits.side_effect = (
+            lambda: [os.read(rfd, 1)])
+        self.process_driver.collect_exits.return_value = []
+        driver = multi.MultiDriver(
+            drivers={'processes': self.process_driver,
+                     'threads': self.thread_driver})
+        fd = driver.fileno()
+
+        self.assertEqual([], select.select([fd], [], [], 0)[0])
+        os.write(wfd, b'x')
+        self.assertEqual([fd], select.select([fd], [], [], 0)[0])
+
+        self.assertEqual([b'x'], driver.collect_exits())
+        self.assertEqual([], select.select([fd], [], [], 0)[0])
@@ -16,7 +16,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import gc
 import logging
+import os
+import signal
 import time
 import unittest
 import uuid
@@ -28,6 +31,7 @@ from loopster import exceptions
 from loopster.hubs.drivers import process
 from loopster.services import softirq
 from loopster import states
+from loopster import units
 
 LOG = logging.getLogger(__name__)
 
@@ -64,6 +68,14 @@ class ProcessDriverTestCase(unittest.TestCase):
                           BasicService,
                           {})
 
+    def test_get_services_stats(self):
+        self.driver.add_service(self.service_uuid, BasicService, {})
+
+        stats = self.driver.get_services_stats()
+
+        self.assertEqual([self.service_uuid], list(stats))
+        self.assertEqual(0, stats[self.service_uuid]['count'])
+
     def test_get_process_state_initial(self):
         process = mock.MagicMock()
         process.pid = None
@@ -98,6 +110,12 @@ class ProcessDriverTestCase(unittest.TestCase):
         self.assertEqual(self.driver._get_service_state(None, svc_storage),
                          states.State.INITIAL)
 
+    def test_init_service_sets_unit_uuid(self):
+        svc_storage = {'svc_class': BasicService, 'svc_kwargs': {}}
+        self.driver._init_service('fake-uuid', svc_storage)
+
+        self.assertEqual('fake-uuid', svc_storage['service'].unit_uuid)
+
     def test_get_service_state_stopped_flag(self):
         svc_storage = {'svc_class': BasicService, 'svc_kwargs': {}}
         self.driver._init_service(None, svc_storage)
@@ -154,3 +172,309 @@ class ProcessDriverTestCase(unittest.TestCase):
             )
 
             self.assertIs(expected_state, overriden_state)
+
+
+class ProcessDriverForkTestCase(unittest.TestCase):
+
+    @mock.patch('importlib.import_module')
+    def test_preload(self, import_module):
+        preload = mock.Mock()
+
+        process.ProcessDriver(preload_modules=['loopster_fake_app'],
+                              preload=preload)
+
+        import_module.assert_called_once_with('loopster_fake_app')
+        preload.assert_called_once_with()
+
+    @unittest.skipUnless(hasattr(gc, 'freeze'), "gc.freeze() is missing")
+    @mock.patch('gc.freeze')
+    @mock.patch('gc.collect')
+    def test_gc_freeze(self, collect, freeze):
+        calls = mock.Mock()
+        calls.attach_mock(collect, 'collect')
+        calls.attach_mock(freeze, 'freeze')
+        svc = mock.Mock()
+
+        driver = process.ProcessDriver(gc_freeze=True)
+
+        self.assertEqual([mock.call.collect(), mock.call.freeze()],
+                         calls.mock_calls)
+        self.assertTrue(gc.isenabled())
+        self.assertIs(svc.serve, driver._create_process(svc)._target)
+
+    @unittest.skipUnless(hasattr(gc, 'freeze'), "gc.freeze() is missing")
+    @mock.patch('gc.freeze')
+    @mock.patch('gc.collect')
+    def test_gc_freeze_not_per_fork(self, collect, freeze):
+        driver = process.ProcessDriver(gc_freeze=True)
+        collect.reset_mock()
+        freeze.reset_mock()
+        int_state = {process.PROCESS_KEY: mock.Mock()}
+
+        driver._start_process(int_state)
+
+        collect.assert_not_called()
+        freeze.assert_not_called()
+        int_state[process.PROCESS_KEY].start.assert_called_once_with()
+
+    @unittest.skipUnless(hasattr(gc, 'freeze'), "gc.freeze() is missing")
+    def test_gc_freeze_restarts_dont_leak(self):
+        restarts = 200
+        self.addCleanup(gc.unfreeze)
+        driver = process.ProcessDriver(gc_freeze=True)
+        service_uuid = uuid.uuid4()
+        driver.add_service(service_uuid, BasicService, {})
+        svc_storage = driver._services[service_uuid]
+        fds_before = len(os.listdir('/proc/self/fd'))
+
+        for _ in range(restarts):
+            driver._init_service(service_uuid, svc_storage)
+
+        # every dropped service owns descriptors, they are closed only by
+        # the collector of the hub
+        self.assertLess(len(os.listdir('/proc/self/fd')) - fds_before,
+                        restarts // 4)
+
+    @mock.patch('gc.collect')
+    def test_no_gc_freeze(self, collect):
+        svc = mock.Mock()
+
+        driver = process.ProcessDriver()
+
+        collect.assert_not_called()
+        self.assertIs(svc.serve, driver._create_process(svc)._target)
+
+    @mock.patch.object(process, 'gc', spec=['collect'])
+    def test_gc_freeze_unsupported(self, gc_module):
+        process.ProcessDriver(gc_freeze=True)
+
+        gc_module.collect.assert_not_called()
+
+
+class ProcessDriverExitNotificationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.service_uuid = uuid.uuid4()
+        self.driver = process.ProcessDriver()
+        self.driver.add_service(self.service_uuid, BasicService, {})
+        self.svc_storage = self.driver._services[self.service_uuid]
+        self.process = mock.Mock(pid=100, exitcode=None)
+        self.svc_storage[process.PROCESS_KEY] = self.process
+        self.notifier = mock.Mock()
+        self.driver._exit_notifier = self.notifier
+
+    def test_watch_started_process(self):
+        with mock.patch.object(self.driver, '_start_process'):
+            self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                                  states.State.RUNNING)
+
+        self.notifier.watch.assert_called_once_with(self.service_uuid,
+                                                    self.process)
+        # the state of the watched process isn't polled
+        self.process.exitcode = 1
+        self.notifier.poll.return_value = []
+
+        self.assertEqual({self.service_uuid: states.State.RUNNING},
+                         self.driver.get_states())
+
+    def test_watch_failure(self):
+        self.notifier.watch.side_effect = OSError()
+
+        with mock.patch.object(self.driver, '_start_process'):
+            self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                                  states.State.RUNNING)
+        self.process.exitcode = 1
+        self.notifier.poll.return_value = []
+
+        self.assertEqual({self.service_uuid: states.State.FAILED},
+                         self.driver.get_states())
+
+    def test_collect_exits(self):
+        self.svc_storage[process.PROCESS_STATE_KEY] = states.State.RUNNING
+        self.process.exitcode = 1
+        self.notifier.poll.return_value = [self.service_uuid]
+
+        self.assertEqual({self.service_uuid: states.State.FAILED},
+                         self.driver.get_states())
+        self.assertIsNone(self.svc_storage[process.PROCESS_STATE_KEY])
+
+
+class ProcessDriverRecycleTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.service_uuid = uuid.uuid4()
+        self.driver = process.ProcessDriver()
+        self.driver.add_service(
+            self.service_uuid, BasicService, {},
+            recycle=units.RecyclePolicy(max_iterations=1, start_timeout=10))
+        self.svc_storage = self.driver._services[self.service_uuid]
+        self.pids = iter(range(100, 200))
+        start_process = mock.patch.object(self.driver, '_start_process',
+                                          side_effect=self._start_process)
+        start_process.start()
+        self.addCleanup(start_process.stop)
+        self.driver._start_process(self.svc_storage)
+
+    def _start_process(self, int_state):
+        int_state[process.PROCESS_KEY] = mock.Mock(pid=next(self.pids),
+                                                   exitcode=None)
+        int_state[process.STARTED_AT_KEY] = time.monotonic()
+
+    def _make_step(self, int_state):
+        int_state[process.SERVICE_KEY]._histogram.record(1000)
+
+    def test_within_limits(self):
+        self.driver.recycle_services()
+
+        self.assertNotIn(process.PENDING_KEY, self.svc_storage)
+
+    def test_graceful_replace(self):
+        old_process = self.svc_storage[process.PROCESS_KEY]
+        self._make_step(self.svc_storage)
+
+        self.driver.recycle_services()
+
+        pending = self.svc_storage[process.PENDING_KEY]
+        self.assertIs(old_process, self.svc_storage[process.PROCESS_KEY])
+
+        # the replacement hasn't made a step yet
+        self.driver.recycle_services()
+
+        self.assertIs(old_process, self.svc_storage[process.PROCESS_KEY])
+
+        self._make_step(pending)
+        self.driver.recycle_services()
+
+        self.assertNotIn(process.PENDING_KEY, self.svc_storage)
+        self.assertEqual(101, self.svc_storage[process.PROCESS_KEY].pid)
+        old_process.terminate.assert_called_once_with()
+        self.assertEqual([old_process],
+                         self.svc_storage[process.RETIRING_KEY])
+
+        old_process.exitcode = -15
+        self.driver.recycle_services()
+
+        old_process.join.assert_called_once_with()
+        self.assertEqual([], self.svc_storage[process.RETIRING_KEY])
+
+    def test_failed_replacement(self):
+        self._make_step(self.svc_storage)
+        self.driver.recycle_services()
+        pending_process = self.svc_storage[process.PENDING_KEY][
+            process.PROCESS_KEY]
+        pending_process.exitcode = 1
+
+        self.driver.recycle_services()
+
+        self.assertNotIn(process.PENDING_KEY, self.svc_storage)
+        self.assertEqual(100, self.svc_storage[process.PROCESS_KEY].pid)
+
+    def test_stop_discards_replacement(self):
+        self._make_step(self.svc_storage)
+        self.driver.recycle_services()
+        pending_process = self.svc_storage[process.PENDING_KEY][
+            process.PROCESS_KEY]
+
+        self.driver.stop_service(self.service_uuid)
+
+        self.assertNotIn(process.PENDING_KEY, self.svc_storage)
+        pending_process.terminate.assert_called_once_with()
+        current_process = self.svc_storage[process.PROCESS_KEY]
+        current_process.terminate.assert_called_once_with()
+
+
+class ProcessDriverStopTimeoutTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.service_uuid = uuid.uuid4()
+        self.driver = process.ProcessDriver(stop_timeout=0.01)
+        self.driver.add_service(self.service_uuid, BasicService, {})
+        self.svc_storage = self.driver._services[self.service_uuid]
+        self.process = mock.Mock(pid=100, exitcode=None)
+        self.svc_storage[process.PROCESS_KEY] = self.process
+
+    @mock.patch('os.kill')
+    def test_exited_in_time(self, kill):
+        self.process.is_alive.return_value = False
+
+        self.driver.stop_service(self.service_uuid)
+        self.driver.wait_service(self.service_uuid)
+
+        self.process.terminate.assert_called_once_with()
+        kill.assert_not_called()
+        self.assertLessEqual(self.process.join.call_args[1]['timeout'], 0.01)
+
+    @mock.patch('os.kill')
+    def test_kill_after_timeout(self, kill):
+        self.process.is_alive.return_value = True
+
+        self.driver.stop_service(self.service_uuid)
+        self.driver.wait_service(self.service_uuid)
+
+        kill.assert_called_once_with(100, signal.SIGKILL)
+        self.process.join.assert_called_with()
+        self.assertTrue(self.svc_storage[process.FORCIBLY_STOPPED_KEY])
+
+    @mock.patch('os.kill')
+    def test_kill_service_timeout(self, kill):
+        self.process.is_alive.return_value = False
+
+        self.driver._kill_service(self.service_uuid, self.svc_storage)
+
+        self.process.join.assert_called_once_with(timeout=0.1)
+
+
+class ProcessDriverShutdownTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = process.ProcessDriver()
+        self.processes = {}
+        for pid in (100, 101):
+            target_uuid = uuid.uuid4()
+            self.driver.add_service(target_uuid, BasicService, {})
+            svc_process = mock.Mock(pid=pid, exitcode=None, sentinel=pid)
+            svc_process.is_alive.return_value = False
+            self.driver._services[target_uuid][process.PROCESS_KEY] = (
+                svc_process)
+            self.processes[target_uuid] = svc_process
+        self.fast_uuid, self.slow_uuid = list(self.processes)
+
+    @mock.patch('os.kill')
+    @mock.patch('multiprocessing.connection.wait')
+    def test_kill_after_deadline(self, wait, kill):
+        def wait_exits(sentinels, timeout):
+            if 100 in sentinels:
+                self.processes[self.fast_uuid].exitcode = 0
+                return [100]
+            time.sleep(timeout)
+            return []
+
+        wait.side_effect = wait_exits
+
+        report = self.driver.shutdown_all_services(timeout=0.01)
+
+        for svc_process in self.processes.values():
+            svc_process.terminate.assert_called_once_with()
+        kill.assert_called_once_with(101, signal.SIGKILL)
+        self.assertEqual(0, report[self.fast_uuid]['exitcode'])
+        self.assertFalse(report[self.fast_uuid]['killed'])
+        self.assertTrue(report[self.slow_uuid]['killed'])
+        self.assertEqual(101, report[self.slow_uuid]['pid'])
+        self.assertGreaterEqual(report[self.slow_uuid]['duration'], 0.01)
+
+    @mock.patch('os.kill')
+    @mock.patch('multiprocessing.connection.wait')
+    def test_all_exited(self, wait, kill):
+        def wait_exits(sentinels, timeout):
+            self.assertIsNone(timeout)
+            for svc_process in self.processes.values():
+                svc_process.exitcode = -15
+            return list(sentinels)
+
+        wait.side_effect = wait_exits
+
+        report = self.driver.shutdown_all_services()
+
+        kill.assert_not_called()
+        self.assertEqual({states.State.STOPPED},
+                         {r['state'] for r in report.values()})
@@ -0,0 +1,139 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import logging
+import os
+import signal
+import sys
+import time
+import unittest
+
+from loopster.hubs.drivers import spawn
+from loopster.services import softirq
+from loopster import states
+from loopster.tests.unit.hubs.drivers import base
+
+
+class SleepyService(softirq.SoftIrqService):
+
+    def _step(self):
+        pass
+
+
+class SubprocessDriverTestCase(base.LaunchDriverTestMixin,
+                               unittest.TestCase):
+
+    def setUp(self):
+        super(SubprocessDriverTestCase, self).setUp()
+        self.driver = spawn.SubprocessDriver(stop_timeout=1)
+        self.addCleanup(self.driver.shutdown_all_services)
+
+    def _add_command(self, argv, **kwargs):
+        return self._add_service(spawn.Command, argv=argv, **kwargs)
+
+    def test_empty_argv(self):
+        self.assertRaises(ValueError, spawn.Command, argv=[])
+
+    def test_non_command_rejected(self):
+        self.assertRaises(ValueError, self.driver.add_service,
+                          self.service_uuid, SleepyService, {})
+
+    def test_start_stop(self):
+        svc_storage = self._add_command(['sleep', '100'])
+        self.assertIs(states.State.INITIAL, self._get_state())
+
+        self._start()
+
+        self.assertIs(states.State.RUNNING, self._get_state())
+
+        self.driver.set_state(self.service_uuid, states.State.RUNNING,
+                              states.State.STOPPED)
+        self.driver.wait_service(self.service_uuid)
+
+        self.assertIs(states.State.STOPPED, self._get_state())
+        self.assertEqual(-signal.SIGTERM,
+                         svc_storage[spawn.POPEN_KEY].returncode)
+        old_popen = svc_storage[spawn.POPEN_KEY]
+
+        self._start(states.State.STOPPED)
+
+        self.assertIsNot(old_popen, svc_storage[spawn.POPEN_KEY])
+        self.assertIs(states.State.RUNNING, self._get_state())
+
+    def test_exit_codes(self):
+        self._add_command(['true'])
+        self._start()
+        self._wait_state(states.State.STOPPED)
+
+        self.driver.remove_service(self.service_uuid)
+        self._add_command(['false'])
+        self._start()
+        self._wait_state(states.State.FAILED)
+
+    def test_failed_restart(self):
+        svc_storage = self._add_command(['false'])
+        self._start()
+        self._wait_state(states.State.FAILED)
+        old_popen = svc_storage[spawn.POPEN_KEY]
+
+        self._start(states.State.FAILED)
+
+        self.assertIsNot(old_popen, svc_storage[spawn.POPEN_KEY])
+
+    def test_output_logged(self):
+        self._add_command([sys.executable, '-c',
+                           'import sys; print("out"); '
+                           'sys.stderr.write("err\\n")'])
+
+        with self.assertLogs(spawn.LOG, 'INFO') as logs:
+            self._start()
+            self._wait_state(states.State.STOPPED)
+            deadline = time.monotonic() + 5
+            while (len([r for r in logs.records if 'pid=' in r.getMessage()
+                        and r.getMessage().endswith(('out', 'err'))]) < 2
+                   and time.monotonic() < deadline):
+                time.sleep(0.01)
+
+        levels = {r.getMessage()[-3:]: r.levelno for r in logs.records}
+        self.assertEqual(logging.INFO, levels['out'])
+        self.assertEqual(logging.WARNING, levels['err'])
+
+    def test_descriptors_not_inherited(self):
+        rfd, wfd = os.pipe()
+        self.addCleanup(os.close, rfd)
+        self.addCleanup(os.close, wfd)
+        os.set_inheritable(wfd, True)
+        self._add_command(['sh', '-c', 'echo x >&%d' % wfd])
+
+        self._start()
+
+        self._wait_state(states.State.FAILED)
+
+    def test_shutdown_kills_stuck(self):
+        self._add_command(['sh', '-c', 'trap "" TERM; sleep 100'])
+        self._start()
+        # let the shell set the trap
+        time.sleep(0.2)
+
+        report = self.driver.shutdown_all_services(timeout=0.1)
+
+        self.assertTrue(report[self.service_uuid]['killed'])
+        self.assertEqual(-signal.SIGKILL,
+                         report[self.service_uuid]['exitcode'])
+        self.assertIs(states.State.STOPPED,
+                      report[self.service_uuid]['state'])
@@ -0,0 +1,131 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+import unittest
+
+import mock
+
+from loopster.hubs.drivers import thread
+from loopster.services import softirq
+from loopster import states
+from loopster.tests.unit.hubs.drivers import base
+
+
+class SleepyService(softirq.SoftIrqService):
+
+    def _step(self):
+        pass
+
+
+class FailingService(softirq.SoftIrqService):
+
+    def _serve(self):
+        raise ValueError()
+
+    def _step(self):
+        pass
+
+
+class StuckService(softirq.SoftIrqService):
+
+    def _step(self):
+        while True:
+            time.sleep(0.001)
+
+
+class ThreadDriverTestCase(base.LaunchDriverTestMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(ThreadDriverTestCase, self).setUp()
+        self.driver = thread.ThreadDriver(stop_timeout=1)
+        self.addCleanup(self.driver.shutdown_all_services)
+
+    def test_start_stop(self):
+        svc_storage = self._add_service(SleepyService, step_period=0.01)
+        self.assertIs(states.State.INITIAL, self._get_state())
+        self.assertFalse(svc_storage[thread.SERVICE_KEY].subscribe_signals)
+        self.assertFalse(svc_storage[thread.SERVICE_KEY].pdeathsig)
+
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+
+        self.assertIs(states.State.RUNNING, self._get_state())
+
+        self.driver.set_state(self.service_uuid, states.State.RUNNING,
+                              states.State.STOPPED)
+        self.driver.wait_service(self.service_uuid)
+
+        self.assertIs(states.State.STOPPED, self._get_state())
+
+        self.driver.set_state(self.service_uuid, states.State.STOPPED,
+                              states.State.RUNNING)
+
+        self.assertIs(states.State.RUNNING, self._get_state())
+
+    def test_failed(self):
+        self._add_service(FailingService)
+
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+
+        self._wait_state(states.State.FAILED)
+
+    def test_numb_restart(self):
+        svc_storage = self._add_service(StuckService)
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+        old_thread = svc_storage[thread.THREAD_KEY]
+        svc_storage[thread.SERVICE_KEY].get_watchdog().mark_failed()
+
+        self.assertIs(states.State.NUMB, self._get_state())
+
+        self.driver.set_state(self.service_uuid, states.State.NUMB,
+                              states.State.RUNNING)
+
+        self.assertFalse(old_thread.is_alive())
+        self.assertIsNot(old_thread, svc_storage[thread.THREAD_KEY])
+        self.assertIs(states.State.RUNNING, self._get_state())
+
+    def test_numb_loop_stops_without_interrupt(self):
+        svc_storage = self._add_service(SleepyService)
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+        old_thread = svc_storage[thread.THREAD_KEY]
+        svc_storage[thread.SERVICE_KEY].get_watchdog().mark_failed()
+
+        with mock.patch.object(thread.deadlines,
+                               'set_async_exc') as set_async_exc:
+            self.driver.set_state(self.service_uuid, states.State.NUMB,
+                                  states.State.STOPPED)
+
+        set_async_exc.assert_not_called()
+        self.assertFalse(old_thread.is_alive())
+
+    def test_shutdown_interrupts_stuck(self):
+        self._add_service(StuckService)
+        self.driver.set_state(self.service_uuid, states.State.INITIAL,
+                              states.State.RUNNING)
+        # let the step start
+        time.sleep(0.1)
+
+        report = self.driver.shutdown_all_services(timeout=0.05)
+
+        self.assertTrue(report[self.service_uuid]['killed'])
+        self.assertIs(states.State.STOPPED,
+                      report[self.service_uuid]['state'])
@@ -0,0 +1,90 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import uuid
+
+import mock
+
+from loopster.hubs.drivers import process
+from loopster.hubs.drivers import zygote
+
+MODULE_NAME = 'loopster_zygote_test_app'
+MODULE_TEMPLATE = """
+from loopster.services import softirq
+
+
+class AppService(softirq.SoftIrqService):
+    VERSION = %d
+
+    def _step(self):
+        pass
+"""
+
+
+class ZygoteProcessDriverTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        sys.path.insert(0, self.path)
+        self.addCleanup(sys.path.remove, self.path)
+        self.addCleanup(sys.modules.pop, MODULE_NAME, None)
+        self._write_module(1)
+        self.preload = mock.Mock()
+        self.driver = zygote.ZygoteProcessDriver(
+            preload_modules=[MODULE_NAME], preload=self.preload)
+
+    def _write_module(self, version):
+        module_path = os.path.join(self.path, MODULE_NAME + '.py')
+        with open(module_path, 'w') as f:
+            f.write(MODULE_TEMPLATE % version)
+        # make the change visible despite the same mtime
+        os.utime(module_path, (version, version))
+
+    def test_preload(self):
+        self.assertIn(MODULE_NAME, sys.modules)
+        self.preload.assert_called_once_with()
+
+    def test_fork_process(self):
+        target_uuid = uuid.uuid4()
+        self.driver.add_service(
+            target_uuid, sys.modules[MODULE_NAME].AppService, {})
+
+        svc_process = self.driver._services[target_uuid][process.PROCESS_KEY]
+
+        self.assertEqual(process.FORK_START_METHOD,
+                         svc_process._start_method)
+
+    def test_reload_zygote(self):
+        target_uuid = uuid.uuid4()
+        self.driver.add_service(
+            target_uuid, sys.modules[MODULE_NAME].AppService, {})
+        self._write_module(2)
+
+        self.driver.reload_zygote()
+
+        svc_class = self.driver._services[target_uuid][
+            process.SERVICE_CLASS_KEY]
+        self.assertEqual(2, svc_class.VERSION)
+        self.assertIs(sys.modules[MODULE_NAME].AppService, svc_class)
+        self.assertEqual(2, self.preload.call_count)
@@ -16,6 +16,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
 import time
 import unittest
 import uuid
@@ -38,6 +39,7 @@ class BaseHubTestCase(unittest.TestCase):
     def setUp(self):
         self.service_uuid = uuid.uuid4()
         self.driver = mock.MagicMock()
+        self.driver.fileno.return_value = None
         self.controller = mock.MagicMock()
         self.hub = base.BaseHub(driver=self.driver, controller=self.controller,
                                 step_period=0, loop_period=0)
@@ -116,6 +118,91 @@ class BaseHubTestCase(unittest.TestCase):
         self.assertRaises(
             exceptions.UnitNotFound, self.hub.remove_unit, unit)
 
+    def test_phase_spread(self):
+        hub = base.BaseHub(driver=self.driver, controller=self.controller,
+                           phase_spread=True)
+        hub.add_service(BasicService, {'step_period': 10})
+        hub.add_service(BasicService, {'step_period': 10})
+        hub.add_service(BasicService, {'start_delay': 3})
+
+        delays = [c[0][2]['start_delay']
+                  for c in self.driver.add_service.call_args_list]
+        self.assertEqual(0, delays[0])
+        self.assertAlmostEqual(6.18, delays[1], places=2)
+        self.assertEqual(3, delays[2])
+
+    def test_no_phase_spread(self):
+        self.hub.add_service(BasicService, {'step_period': 10})
+
+        self.assertEqual({'step_period': 10},
+                         self.driver.add_service.call_args[0][2])
+
+    def test_hash_jitter_key(self):
+        unit = self.hub.add_service(BasicService, {'jitter_mode': 'hash'})
+
+        self.assertEqual(str(unit.uuid),
+                         self.driver.add_service.call_args[0][2]['jitter_key'])
+
+    def test_add_unit_recycle(self):
+        recycle = units.RecyclePolicy(max_iterations=10)
+        unit = units.Unit(BasicService, {}, states.State.RUNNING,
+                          recycle=recycle)
+        self.hub.add_unit(unit)
+
+        self.driver.add_service.assert_called_once_with(
+            unit.uuid, BasicService, {}, recycle=recycle)
+
+    def test_add_unit_driver_without_named_drivers(self):
+        unit = units.Unit(BasicService, {}, states.State.RUNNING,
+                          driver='threads')
+
+        self.assertRaises(ValueError, self.hub.add_unit, unit)
+        self.driver.add_service.assert_not_called()
+        self.assertEqual({}, self.hub.get_target_states())
+
+    def test_named_drivers(self):
+        process_driver = mock.MagicMock()
+        process_driver.fileno.return_value = None
+        thread_driver = mock.MagicMock()
+        thread_driver.fileno.return_value = None
+        hub = base.BaseHub(
+            driver={'processes': process_driver, 'threads': thread_driver},
+            controller=self.controller)
+        unit = units.Unit(BasicService, {}, states.State.RUNNING,
+                          driver='threads')
+
+        hub.add_unit(unit)
+
+        thread_driver.add_service.assert_called_once_with(
+            unit.uuid, BasicService, {})
+        process_driver.add_service.assert_not_called()
+
+    def test_step_recycles_services(self):
+        self.hub._has_running = True
+
+        self.hub._step()
+
+        self.controller.manage.assert_called_once_with(self.hub, self.driver)
+        self.driver.recycle_services.assert_called_once_with()
+
+    def test_service_exit_wakes_up(self):
+        rfd, wfd = os.pipe()
+        self.addCleanup(os.close, rfd)
+        self.addCleanup(os.close, wfd)
+        self.driver.fileno.return_value = rfd
+        self.driver.collect_exits.side_effect = lambda: [os.read(rfd, 1)]
+        hub = base.BaseHub(driver=self.driver, controller=self.controller)
+        hub._has_running = True
+        os.write(wfd, b'x')
+
+        self.assertTrue(hub._waker.wait(0))
+        self.driver.collect_exits.assert_called_once_with()
+        self.assertEqual(0, hub._next_step_delta)
+
+    def test_get_unit_stats(self):
+        self.assertIs(self.driver.get_services_stats.return_value,
+                      self.hub.get_unit_stats())
+
     def test_serve(self):
         self.hub.add_service(BasicService)
         # stop cycle by exception on second iteration
@@ -128,6 +215,18 @@ class BaseHubTestCase(unittest.TestCase):
         self.driver.stop_all_services.assert_called_once()
         self.driver.wait_all_services.assert_called_once()
 
+    def test_shutdown_timeout(self):
+        hub = base.BaseHub(driver=self.driver, controller=self.controller,
+                           shutdown_timeout=5)
+        self.driver.shutdown_all_services.return_value = {
+            self.service_uuid: {'state': states.State.STOPPED}}
+
+        hub._shutdown()
+
+        self.driver.shutdown_all_services.assert_called_once_with(timeout=5)
+        self.driver.stop_all_services.assert_not_called()
+        self.driver.wait_all_services.assert_not_called()
+
     def test_serve_stop_same_iteration(self):
         self.hub.add_service(BasicService)
         # stop cycle by exception on first iteration
@@ -0,0 +1,153 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import signal
+import threading
+import time
+import unittest
+
+from loopster import exceptions
+from loopster.services import deadlines
+
+
+def busy_wait(duration):
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        pass
+
+
+class AlarmDeadlineTestCase(unittest.TestCase):
+
+    def test_abort_blocking_call(self):
+        with self.assertRaises(exceptions.StepTimeout):
+            with deadlines.AlarmDeadline(0.01):
+                time.sleep(5)
+
+    def test_swallowed_timeout_reraised(self):
+        with self.assertRaises(exceptions.StepTimeout):
+            with deadlines.AlarmDeadline(0.01):
+                try:
+                    time.sleep(5)
+                except Exception:
+                    pass
+
+    def test_restore_handler(self):
+        prev = signal.getsignal(signal.SIGALRM)
+
+        with deadlines.AlarmDeadline(5):
+            pass
+
+        self.assertIs(prev, signal.getsignal(signal.SIGALRM))
+        self.assertEqual((0, 0), signal.getitimer(signal.ITIMER_REAL))
+
+    def test_expire_in(self):
+        with self.assertRaises(exceptions.StepTimeout):
+            with deadlines.AlarmDeadline(None) as deadline:
+                deadline.expire_in(0.01)
+                time.sleep(5)
+
+    def test_expire_in_later(self):
+        with deadlines.AlarmDeadline(5) as deadline:
+            deadline.expire_in(10)
+
+            self.assertLessEqual(signal.getitimer(signal.ITIMER_REAL)[0], 5)
+
+
+class ThreadDeadlineTestCase(unittest.TestCase):
+
+    def _run_in_thread(self, func):
+        result = []
+
+        def target():
+            try:
+                func()
+            except Exception as e:
+                result.append(e)
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+        return result
+
+    def test_abort_busy_block(self):
+        def func():
+            with deadlines.ThreadDeadline(0.01):
+                busy_wait(5)
+
+        result = self._run_in_thread(func)
+
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], exceptions.StepTimeout)
+
+    def test_swallowed_timeout_reraised(self):
+        def func():
+            with deadlines.ThreadDeadline(0.01):
+                try:
+                    busy_wait(5)
+                except Exception:
+                    pass
+
+        result = self._run_in_thread(func)
+
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], exceptions.StepTimeout)
+
+    def test_no_abort(self):
+        def func():
+            with deadlines.ThreadDeadline(5):
+                pass
+            # the cancelled timer doesn't fire later
+            busy_wait(0.05)
+
+        self.assertEqual([], self._run_in_thread(func))
+
+    def test_expire_in(self):
+        def func():
+            with deadlines.ThreadDeadline(None) as deadline:
+                deadline.expire_in(0.01)
+                busy_wait(5)
+
+        result = self._run_in_thread(func)
+
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], exceptions.StepTimeout)
+
+
+class GetDeadlineTestCase(unittest.TestCase):
+
+    def test_no_timeout(self):
+        self.assertNotIsInstance(deadlines.get_deadline(None),
+                                 (deadlines.AlarmDeadline,
+                                  deadlines.ThreadDeadline))
+
+    def test_expirable(self):
+        self.assertIsInstance(deadlines.get_deadline(None, expirable=True),
+                              deadlines.AlarmDeadline)
+
+    def test_main_thread(self):
+        self.assertIsInstance(deadlines.get_deadline(1),
+                              deadlines.AlarmDeadline)
+
+    def test_other_thread(self):
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(deadlines.get_deadline(1)))
+        thread.start()
+        thread.join()
+
+        self.assertIsInstance(result[0], deadlines.ThreadDeadline)
@@ -0,0 +1,398 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import unittest
+
+import mock
+
+from loopster.services import schedulers
+
+MSK = datetime.timezone(datetime.timedelta(hours=3))
+
+
+class LocalizingZone(datetime.tzinfo):
+    """Zone built like pytz ones, its own offset is of local mean time"""
+
+    def utcoffset(self, dt):
+        return datetime.timedelta(hours=2, minutes=30, seconds=17)
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
+
+    def fromutc(self, dt):
+        return (dt + MSK.utcoffset(None)).replace(tzinfo=MSK)
+
+    def localize(self, dt):
+        return dt.replace(tzinfo=MSK)
+
+
+def get_timestamp(*args):
+    return datetime.datetime(*args, tzinfo=MSK).timestamp()
+
+
+class FixedRateSchedulerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = schedulers.FixedRateScheduler(period=10)
+        self.scheduler.start(100)
+
+    def test_start(self):
+        self.assertEqual(100, self.scheduler.deadline)
+
+    def test_overrun(self):
+        self.assertFalse(self.scheduler.is_overrun(10))
+        self.assertTrue(self.scheduler.is_overrun(10.5))
+
+    def test_no_drift(self):
+        # late wakeups and step durations don't shift the grid
+        for tick, finished in [(110, 103.5), (120, 117), (130, 121.2)]:
+            self.scheduler.step_finished(finished)
+            self.assertEqual(tick, self.scheduler.deadline)
+
+    def test_overrun_keeps_grid(self):
+        self.scheduler.step_finished(135)
+
+        self.assertEqual(130, self.scheduler.deadline)
+
+        self.scheduler.step_finished(131)
+
+        self.assertEqual(140, self.scheduler.deadline)
+
+    def test_zero_period(self):
+        scheduler = schedulers.FixedRateScheduler(period=0)
+        scheduler.start(100)
+        scheduler.step_finished(105)
+
+        self.assertEqual(105, scheduler.deadline)
+
+    def test_reschedule_reanchors(self):
+        self.scheduler.reschedule(103, 2)
+        self.assertEqual(105, self.scheduler.deadline)
+
+        self.scheduler.step_finished(106)
+
+        self.assertEqual(115, self.scheduler.deadline)
+
+
+class CatchUpTestCase(unittest.TestCase):
+
+    def _get_scheduler(self, catch_up, **kwargs):
+        scheduler = schedulers.FixedRateScheduler(period=10,
+                                                  catch_up=catch_up, **kwargs)
+        scheduler.start(100)
+        return scheduler
+
+    def test_in_time(self):
+        scheduler = self._get_scheduler(schedulers.CATCH_UP_SKIP)
+        scheduler.step_finished(110)
+
+        self.assertEqual((110, 0), (scheduler.deadline, scheduler.missed))
+
+    def test_skip(self):
+        scheduler = self._get_scheduler(schedulers.CATCH_UP_SKIP)
+        scheduler.step_finished(135)
+
+        self.assertEqual((140, 3), (scheduler.deadline, scheduler.missed))
+
+    def test_coalesce(self):
+        scheduler = self._get_scheduler(schedulers.CATCH_UP_COALESCE)
+        scheduler.step_finished(135)
+
+        self.assertEqual((130, 2), (scheduler.deadline, scheduler.missed))
+
+    def test_burst(self):
+        scheduler = self._get_scheduler(schedulers.CATCH_UP_BURST,
+                                        max_burst=2)
+        scheduler.step_finished(145)
+
+        self.assertEqual((130, 2), (scheduler.deadline, scheduler.missed))
+
+        # backlog steps run back to back
+        scheduler.step_finished(146)
+
+        self.assertEqual((140, 0), (scheduler.deadline, scheduler.missed))
+
+        scheduler.step_finished(147)
+
+        self.assertEqual((150, 0), (scheduler.deadline, scheduler.missed))
+
+    def test_invalid_policy(self):
+        self.assertRaises(ValueError, schedulers.FixedRateScheduler,
+                          period=1, catch_up='unknown')
+        self.assertRaises(ValueError, schedulers.FixedRateScheduler,
+                          period=1, catch_up=schedulers.CATCH_UP_BURST,
+                          max_burst=0)
+
+
+class FixedDelaySchedulerTestCase(unittest.TestCase):
+
+    def test_delay_from_step_end(self):
+        scheduler = schedulers.FixedDelayScheduler(period=10)
+        scheduler.start(100)
+        scheduler.step_finished(103.5)
+
+        self.assertEqual(113.5, scheduler.deadline)
+
+
+class JitterTestCase(unittest.TestCase):
+
+    def test_start_delay(self):
+        scheduler = schedulers.FixedRateScheduler(period=10, start_delay=3)
+        scheduler.start(100)
+
+        self.assertEqual(103, scheduler.deadline)
+
+    def test_uniform_jitter_keeps_grid(self):
+        scheduler = schedulers.FixedRateScheduler(period=10, start_jitter=5,
+                                                  period_jitter=2)
+        scheduler.start(100)
+        start = scheduler.deadline
+
+        self.assertTrue(100 <= start <= 105)
+
+        for tick in range(1, 4):
+            scheduler.step_finished(scheduler.deadline + 0.1)
+            self.assertTrue(0 <= scheduler.deadline - start - tick * 10 <= 2)
+
+    def test_hash_jitter_is_stable(self):
+        def get_deadlines(key):
+            scheduler = schedulers.FixedDelayScheduler(
+                period=10, start_jitter=5, period_jitter=2,
+                jitter_mode=schedulers.JITTER_HASH, jitter_key=key)
+            scheduler.start(100)
+            result = [scheduler.deadline]
+            scheduler.step_finished(110)
+            result.append(scheduler.deadline)
+            return result
+
+        self.assertEqual(get_deadlines('a'), get_deadlines('a'))
+        self.assertNotEqual(get_deadlines('a'), get_deadlines('b'))
+
+    def test_reschedule_is_exact(self):
+        scheduler = schedulers.FixedRateScheduler(period=10, period_jitter=2)
+        scheduler.start(100)
+        scheduler.step_finished(101)
+        scheduler.reschedule(103, 1)
+
+        self.assertEqual(104, scheduler.deadline)
+
+    def test_invalid_jitter_mode(self):
+        self.assertRaises(ValueError, schedulers.FixedRateScheduler,
+                          period=1, jitter_mode='unknown')
+
+    def test_hash_jitter_requires_key(self):
+        self.assertRaises(ValueError, schedulers.FixedRateScheduler,
+                          period=1, jitter_mode=schedulers.JITTER_HASH)
+
+    def test_hash_fraction(self):
+        fraction = schedulers.hash_fraction('key')
+
+        self.assertTrue(0 <= fraction < 1)
+        self.assertEqual(fraction, schedulers.hash_fraction('key'))
+
+
+class CronSchedulerTestCase(unittest.TestCase):
+
+    def _get_next_times(self, expression, start, count=3):
+        scheduler = schedulers.CronScheduler(expression=expression, tz=MSK)
+        result = []
+        timestamp = get_timestamp(*start)
+        for _ in range(count):
+            timestamp = scheduler._get_next_time(timestamp)
+            result.append(datetime.datetime.fromtimestamp(timestamp, MSK)
+                          .replace(tzinfo=None))
+        return result
+
+    def test_every_15_minutes(self):
+        self.assertEqual(
+            [datetime.datetime(2026, 1, 1, 10, 15),
+             datetime.datetime(2026, 1, 1, 10, 30),
+             datetime.datetime(2026, 1, 1, 10, 45)],
+            self._get_next_times('*/15 * * * *', (2026, 1, 1, 10, 0)))
+
+    def test_daily_alias(self):
+        self.assertEqual(
+            [datetime.datetime(2026, 1, 2), datetime.datetime(2026, 1, 3)],
+            self._get_next_times('@daily', (2026, 1, 1, 0, 0, 30), count=2))
+
+    def test_workdays(self):
+        # 2026-01-02 is Friday
+        self.assertEqual(
+            [datetime.datetime(2026, 1, 2, 9, 30),
+             datetime.datetime(2026, 1, 5, 9, 30)],
+            self._get_next_times('30 9 * * 1-5', (2026, 1, 1, 12, 0),
+                                 count=2))
+
+    def test_day_or_weekday(self):
+        # the 1st day of month or Sundays
+        self.assertEqual(
+            [datetime.datetime(2026, 1, 4), datetime.datetime(2026, 1, 11)],
+            self._get_next_times('0 0 1 * 0', (2026, 1, 1, 12, 0), count=2))
+
+    def test_month_list(self):
+        self.assertEqual(
+            [datetime.datetime(2026, 3, 1, 3),
+             datetime.datetime(2026, 6, 1, 3),
+             datetime.datetime(2027, 3, 1, 3)],
+            self._get_next_times('0 3 1 3,6 *', (2026, 1, 10)))
+
+    def test_invalid_expressions(self):
+        for expression in ['* * * *', '60 * * * *', '*/0 * * * *',
+                           '5-1 * * * *', 'x * * * *', '0 0 30 2 *']:
+            self.assertRaises(ValueError, schedulers.CronScheduler,
+                              expression=expression)
+
+    @mock.patch.object(schedulers, 'monotonic', return_value=1000)
+    def test_deadline(self, monotonic):
+        now = get_timestamp(2026, 1, 1, 10, 0, 50)
+        with mock.patch.object(schedulers, 'wall_time', return_value=now):
+            scheduler = schedulers.CronScheduler(expression='* * * * *',
+                                                 tz=MSK)
+            scheduler.start(1000)
+
+            self.assertAlmostEqual(1010, scheduler.deadline)
+
+            # the step is finished within the same minute
+            scheduler.step_finished(1000)
+
+            self.assertAlmostEqual(1070, scheduler.deadline)
+
+
+class AlignedIntervalSchedulerTestCase(unittest.TestCase):
+
+    def test_aligned_to_local_time(self):
+        scheduler = schedulers.AlignedIntervalScheduler(
+            interval=3600, offset=900, tz=MSK)
+
+        self.assertEqual(
+            get_timestamp(2026, 1, 1, 11, 15),
+            scheduler._get_next_time(get_timestamp(2026, 1, 1, 10, 20)))
+        self.assertEqual(
+            get_timestamp(2026, 1, 1, 12, 15),
+            scheduler._get_next_time(get_timestamp(2026, 1, 1, 11, 15)))
+
+    def test_localizing_zone(self):
+        scheduler = schedulers.AlignedIntervalScheduler(
+            interval=3600, tz=LocalizingZone())
+
+        self.assertEqual(
+            get_timestamp(2026, 1, 1, 11),
+            scheduler._get_next_time(get_timestamp(2026, 1, 1, 10, 20)))
+
+    def test_every_5_minutes(self):
+        scheduler = schedulers.AlignedIntervalScheduler(interval=300, tz=MSK)
+
+        self.assertEqual(
+            get_timestamp(2026, 1, 1, 10, 5),
+            scheduler._get_next_time(get_timestamp(2026, 1, 1, 10, 3, 7)))
+
+    def test_aligned_to_midnight(self):
+        # 7 hours don't divide a day, the grid restarts at midnight
+        scheduler = schedulers.AlignedIntervalScheduler(interval=25200,
+                                                        tz=MSK)
+
+        self.assertEqual(
+            get_timestamp(2026, 1, 1, 21),
+            scheduler._get_next_time(get_timestamp(2026, 1, 1, 14, 0, 1)))
+        self.assertEqual(
+            get_timestamp(2026, 1, 2),
+            scheduler._get_next_time(get_timestamp(2026, 1, 1, 22)))
+        self.assertEqual(
+            get_timestamp(2026, 1, 2, 7),
+            scheduler._get_next_time(get_timestamp(2026, 1, 2, 3)))
+
+    def test_overrun(self):
+        scheduler = schedulers.AlignedIntervalScheduler(interval=300, tz=MSK)
+        with mock.patch.object(schedulers, 'wall_time',
+                               return_value=get_timestamp(2026, 1, 1, 10, 3)):
+            scheduler.start(1000)
+
+        with mock.patch.object(schedulers, 'wall_time',
+                               return_value=get_timestamp(2026, 1, 1, 10, 9)):
+            self.assertFalse(scheduler.is_overrun(1000))
+
+        with mock.patch.object(schedulers, 'wall_time',
+                               return_value=get_timestamp(2026, 1, 1, 10, 10)):
+            self.assertTrue(scheduler.is_overrun(1))
+
+    def test_invalid_interval(self):
+        self.assertRaises(ValueError, schedulers.AlignedIntervalScheduler,
+                          interval=0)
+
+
+class AdaptivePeriodPolicyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = schedulers.AdaptivePeriodPolicy(min_period=0.5,
+                                                      max_period=4)
+
+    def test_invalid_range(self):
+        self.assertRaises(ValueError, schedulers.AdaptivePeriodPolicy,
+                          min_period=2, max_period=1)
+
+    def test_idle_backoff(self):
+        periods = [self.policy.get_period(schedulers.STEP_IDLE)
+                   for _ in range(5)]
+
+        self.assertEqual([1, 2, 4, 4, 4], periods)
+
+    def test_busy_resets(self):
+        self.policy.get_period(schedulers.STEP_IDLE)
+        self.policy.get_period(schedulers.STEP_IDLE)
+
+        self.assertEqual(0.5, self.policy.get_period(schedulers.STEP_BUSY))
+        self.assertEqual(1, self.policy.get_period(schedulers.STEP_IDLE))
+
+    def test_none_keeps_period(self):
+        self.policy.get_period(schedulers.STEP_IDLE)
+
+        self.assertEqual(1, self.policy.get_period(None))
+
+    def test_unsupported_result_keeps_period(self):
+        self.policy.get_period(schedulers.STEP_IDLE)
+
+        for step_result in ({'items': 1}, 'busy', object()):
+            self.assertEqual(1, self.policy.get_period(step_result))
+
+    def test_explicit_delay(self):
+        self.assertEqual(10, self.policy.get_period(10))
+        # backoff continues from the clamped delay
+        self.assertEqual(4, self.policy.get_period(schedulers.STEP_IDLE))
+        self.assertEqual(0, self.policy.get_period(-1))
+
+    def test_zero_min_period(self):
+        policy = schedulers.AdaptivePeriodPolicy(min_period=0, max_period=64)
+
+        self.assertEqual(1, policy.get_period(schedulers.STEP_IDLE))
+        self.assertEqual(0, policy.get_period(schedulers.STEP_BUSY))
+
+
+class GetSchedulerTestCase(unittest.TestCase):
+
+    def test_modes(self):
+        self.assertIsInstance(
+            schedulers.get_scheduler(schedulers.FIXED_RATE, period=1),
+            schedulers.FixedRateScheduler)
+        self.assertIsInstance(
+            schedulers.get_scheduler(schedulers.FIXED_DELAY, period=1),
+            schedulers.FixedDelayScheduler)
+
+    def test_unknown_mode(self):
+        self.assertRaises(ValueError,
+                          schedulers.get_scheduler, 'unknown', period=1)
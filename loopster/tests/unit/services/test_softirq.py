@@ -18,10 +18,15 @@
 
 import logging
 import multiprocessing
+import signal
+import time
+import tracemalloc
 import unittest
 
 import mock
 
+from loopster import exceptions
+from loopster.services import schedulers
 from loopster.services import softirq
 from loopster.watchdogs import exceptions as wdxc
 
@@ -203,7 +208,7 @@ class SoftIRQLoopStepMinorWatchdogErrorInTryTestCase(unittest.TestCase):
         self.assertEqual(3, err_send.call_count)
         wd_send.assert_not_called()
 
-    @mock.patch('time.sleep', return_value=None)
+    @mock.patch('loopster.wakeup.Waker.wait', return_value=False)
     def test_loop_period_positive(self, time_sleep):
         s = TestServiceEventualStop(step_period=0, loop_period=1)
 
@@ -213,7 +218,7 @@ class SoftIRQLoopStepMinorWatchdogErrorInTryTestCase(unittest.TestCase):
         time_sleep.assert_has_calls(calls)
         assert time_sleep.call_count == 5
 
-    @mock.patch('time.sleep', return_value=None)
+    @mock.patch('loopster.wakeup.Waker.wait', return_value=False)
     def test_loop_period_zero_not_slept(self, time_sleep):
         s = TestServiceEventualStop(step_period=0, loop_period=0)
 
@@ -221,7 +226,7 @@ class SoftIRQLoopStepMinorWatchdogErrorInTryTestCase(unittest.TestCase):
 
         time_sleep.assert_not_called()
 
-    @mock.patch('time.sleep', return_value=None)
+    @mock.patch('loopster.wakeup.Waker.wait', return_value=False)
     def test_loop_period_zero_wait_for_next_step(self, time_sleep):
         s = TestServiceEventualStop(step_period=0.01, loop_period=0)
 
@@ -229,3 +234,357 @@ class SoftIRQLoopStepMinorWatchdogErrorInTryTestCase(unittest.TestCase):
 
         assert 0 < time_sleep.call_args[0][0] < 0.01
         assert time_sleep.call_count > 10
+
+
+class SoftIRQScheduleModeTestCase(unittest.TestCase):
+
+    def test_unknown_schedule_mode(self):
+        self.assertRaises(ValueError, TestService, schedule_mode='unknown')
+
+    def test_fixed_delay_schedule_mode(self):
+        s = TestService(schedule_mode=schedulers.FIXED_DELAY)
+
+        self.assertIsInstance(s._scheduler, schedulers.FixedDelayScheduler)
+
+
+class SoftIRQWakeupTestCase(unittest.TestCase):
+
+    def test_stop_wakes_up(self):
+        s = TestService()
+
+        s.stop()
+
+        self.assertTrue(s._waker.wait(0))
+
+    def test_schedule_next_step_wakes_up(self):
+        s = TestService()
+
+        s._schedule_next_step(0)
+
+        self.assertTrue(s._waker.wait(0))
+
+    def test_signum_on_wakeup(self):
+        s = TestService(step_period=60,
+                        signum=multiprocessing.Value("i", 0))
+        on_sighup = mock.Mock(side_effect=s.stop)
+        s._subscribe_signums({1: on_sighup})
+
+        def send_sighup(timeout):
+            s._signum.value = 1
+            return True
+
+        with mock.patch.object(s._waker, 'wait', side_effect=send_sighup):
+            s.serve()
+
+        on_sighup.assert_called_once()
+        self.assertEqual(0, s._signum.value)
+
+
+class SoftIRQSenderTestCase(unittest.TestCase):
+
+    def test_teardown_flushes_sender(self):
+        sender = mock.Mock()
+        s = TestService(sender=sender)
+
+        s._teardown()
+
+        sender.flush.assert_called_once_with()
+
+
+class SoftIRQStopTestCase(unittest.TestCase):
+
+    def test_stop_before_serve(self):
+        s = TestService()
+
+        s.stop()
+        with mock.patch.object(s, '_step') as step:
+            s.serve()
+
+        step.assert_not_called()
+
+
+class SoftIRQPdeathsigTestCase(unittest.TestCase):
+
+    @mock.patch.object(softirq.SoftIrqService, '_set_pdeathsig')
+    def test_setup_sets_pdeathsig(self, set_pdeathsig):
+        TestService()._setup()
+
+        set_pdeathsig.assert_called_once_with()
+
+    @mock.patch.object(softirq.SoftIrqService, '_set_pdeathsig')
+    def test_setup_in_process(self, set_pdeathsig):
+        s = TestService()
+        s.pdeathsig = False
+
+        s._setup()
+
+        set_pdeathsig.assert_not_called()
+
+
+class StepInfoTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.step_info = softirq.StepInfo(1, 2, 'svc', 'soft_irq', 3, 'id')
+
+    def test_fields(self):
+        self.step_info['skipped'] = False
+
+        self.assertFalse(self.step_info.skipped)
+        self.assertEqual(1, self.step_info['iteration'])
+        self.assertNotIn('duration', self.step_info)
+        self.assertRaises(KeyError, self.step_info.__getitem__, 'duration')
+
+    def test_extra_fields(self):
+        self.assertIsNone(self.step_info.get('locked'))
+
+        self.step_info['locked'] = True
+
+        self.assertIn('locked', self.step_info)
+        self.assertTrue(self.step_info['locked'])
+        self.assertTrue(self.step_info.setdefault('locked', False))
+
+    def test_to_dict(self):
+        self.step_info.start()
+        self.step_info.finish()
+        self.step_info['locked'] = True
+
+        event = self.step_info.to_dict()
+
+        self.assertEqual(
+            {'iteration', 'step_period', 'effective_period', 'service',
+             'service_type', 'pid', 'launch_id', 'skipped', 'missed',
+             'start', 'end', 'timestamp', 'duration', 'locked'},
+            set(event))
+        self.assertEqual(event['duration'], event['end'] - event['start'])
+        self.assertEqual(event['duration'], self.step_info['duration'])
+
+
+class SoftIRQEventsTestCase(unittest.TestCase):
+
+    def test_no_sender_fast_path(self):
+        s = TestService()
+
+        with mock.patch.object(softirq.StepInfo, 'to_dict') as to_dict:
+            s._loop_step()
+
+        to_dict.assert_not_called()
+
+    def test_step_events(self):
+        sender = mock.Mock()
+        s = TestService(sender=sender)
+        error = ValueError('fake')
+
+        with mock.patch.object(s, '_step', side_effect=error):
+            s._loop_step()
+
+        step_event, error_event = [c[0][0]
+                                   for c in sender.send_event.call_args_list]
+        self.assertEqual(s._event_type, step_event['event_type'])
+        self.assertTrue(step_event['tb'])
+        self.assertFalse(step_event['skipped'])
+        self.assertEqual(0, step_event['iteration'])
+        self.assertIn('duration', step_event)
+        self.assertEqual(s._error_event_type, error_event['event_type'])
+        self.assertIs(ValueError, error_event['error_type'])
+        self.assertEqual(repr(error), error_event['error'])
+
+
+class SoftIRQStatsTestCase(unittest.TestCase):
+
+    def test_step_stats(self):
+        s = TestService(step_period=0.001)
+        s._loop_step()
+        with mock.patch.object(s, '_step', side_effect=lambda: time.sleep(
+                0.002)):
+            s._loop_step()
+        with mock.patch('loopster.watchdogs.base.WatchDogBase.__enter__',
+                        side_effect=FAKE_WD_MINOR_EXCEPTION):
+            s._loop_step()
+
+        stats = s.get_stats()
+
+        self.assertEqual(2, stats['count'])
+        self.assertEqual(1, stats['overruns'])
+        self.assertEqual(1, stats['skipped'])
+        self.assertGreaterEqual(stats['max'], 0.002)
+
+
+class SoftIRQPeriodPolicyTestCase(unittest.TestCase):
+
+    def test_period_policy(self):
+        sender = mock.Mock()
+        s = TestService(step_period=1, sender=sender,
+                        period_policy=schedulers.AdaptivePeriodPolicy(
+                            min_period=0, max_period=8, idle_period=1))
+
+        for result, period in [(schedulers.STEP_IDLE, 1),
+                               (schedulers.STEP_IDLE, 2),
+                               (schedulers.STEP_BUSY, 0)]:
+            with mock.patch.object(s, '_step', return_value=result):
+                s._loop_step()
+            self.assertEqual(period, s._scheduler.period)
+            self.assertEqual(
+                period, sender.send_event.call_args[0][0]['effective_period'])
+
+    def test_step_result_ignored_by_default(self):
+        s = TestService(step_period=1)
+
+        with mock.patch.object(s, '_step', return_value=5):
+            s._loop_step()
+
+        self.assertEqual(1, s._scheduler.period)
+
+
+class SoftIRQStepTimeoutTestCase(unittest.TestCase):
+
+    def test_step_timeout(self):
+        sender = mock.Mock()
+        s = TestService(step_timeout=0.01, sender=sender)
+
+        with mock.patch.object(s, '_step', side_effect=lambda: time.sleep(5)):
+            s._loop_step()
+        s._loop_step()
+
+        events = [c[0][0] for c in sender.send_event.call_args_list]
+        self.assertEqual([0, 0, 1], [e['iteration'] for e in events])
+        self.assertEqual(exceptions.StepTimeout, events[1]['error_type'])
+        self.assertFalse(events[2]['tb'])
+
+
+class SoftIRQCatchUpTestCase(unittest.TestCase):
+
+    def test_missed_ticks(self):
+        sender = mock.Mock()
+        s = TestService(step_period=1, sender=sender,
+                        catch_up=schedulers.CATCH_UP_SKIP)
+        s._scheduler.start(100)
+        s._scheduler.step_finished(103.5)
+
+        s._loop_step()
+
+        self.assertEqual(3, sender.send_event.call_args[0][0]['missed'])
+        self.assertEqual(3, s.get_stats()['missed'])
+
+
+class SoftIRQCalendarScheduleTestCase(unittest.TestCase):
+
+    def test_custom_schedule(self):
+        schedule = schedulers.CronScheduler(expression='@hourly')
+        s = TestService(schedule=schedule)
+
+        self.assertIs(schedule, s._scheduler)
+
+
+class SoftIRQProfilerTestCase(unittest.TestCase):
+
+    def test_sigusr2_toggles_profiler(self):
+        profiler = mock.Mock(is_running=False)
+        s = TestService(profiler=profiler, signum=multiprocessing.Value('i'))
+        s.unit_uuid = 'fake-uuid'
+        s._signum.value = signal.SIGUSR2
+
+        s._on_signum()
+
+        profiler.start.assert_called_once_with(name='TestService.fake-uuid')
+        self.assertEqual(0, s._signum.value)
+
+        profiler.is_running = True
+        s._signum.value = signal.SIGUSR2
+        s._on_signum()
+
+        profiler.stop.assert_called_once_with()
+
+    def test_sigusr2_without_profiler(self):
+        s = TestService(signum=multiprocessing.Value('i'))
+        s._signum.value = signal.SIGUSR2
+
+        s._on_signum()
+
+        self.assertEqual(0, s._signum.value)
+
+
+class SoftIRQMemoryTestCase(unittest.TestCase):
+
+    def test_memory_accounting(self):
+        sender = mock.Mock()
+        s = TestService(memory_accounting=True, sender=sender)
+        data = []
+
+        # many small objects, a single big one isn't counted in heap blocks
+        with mock.patch.object(
+                s, '_step',
+                side_effect=lambda: data.extend([i] for i in range(10000))):
+            s._loop_step()
+
+        event = sender.send_event.call_args[0][0]
+        self.assertGreater(event['rss'], 0)
+        self.assertIn('rss_delta', event)
+        self.assertGreater(event['heap_blocks'], 0)
+        self.assertGreater(event['heap_blocks_delta'], 0)
+
+    def test_no_memory_accounting(self):
+        sender = mock.Mock()
+        s = TestService(sender=sender)
+
+        with mock.patch.object(s, '_get_memory_usage') as get_memory_usage:
+            s._loop_step()
+
+        get_memory_usage.assert_not_called()
+        self.assertNotIn('rss', sender.send_event.call_args[0][0])
+
+    def test_sigprof_traces_memory(self):
+        s = TestService(signum=multiprocessing.Value('i'))
+        s._signum.value = signal.SIGPROF
+        data = []
+
+        with self.assertLogs(softirq.LOG, logging.WARNING) as logs:
+            with mock.patch.object(
+                    s, '_step', side_effect=lambda: data.append([0] * 10000)):
+                s._loop_step()
+                self.assertTrue(tracemalloc.is_tracing())
+                s._loop_step()
+
+        self.assertIn("growing allocation sites", logs.output[0])
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertFalse(s._tracemalloc_armed)
+
+    @mock.patch.object(softirq, '_get_tracemalloc', return_value=None)
+    def test_sigprof_without_tracemalloc(self, get_tracemalloc):
+        s = TestService(signum=multiprocessing.Value('i'))
+        s._signum.value = signal.SIGPROF
+
+        with mock.patch.object(s, '_step'):
+            s._loop_step()
+
+        self.assertFalse(s._tracemalloc_armed)
+
+
+class SoftIRQDrainTestCase(unittest.TestCase):
+
+    def test_drain_timeout(self):
+        sender = mock.Mock()
+        s = TestService(drain_timeout=0.01, sender=sender)
+        s._has_running = True
+
+        def step():
+            s.stop()
+            time.sleep(5)
+
+        with mock.patch.object(s, '_step', side_effect=step):
+            s._loop_step()
+
+        event = sender.send_event.call_args[0][0]
+        self.assertEqual(exceptions.StepTimeout, event['error_type'])
+        self.assertEqual(set(), s._step_deadlines)
+
+    def test_drain_timeout_finished_step(self):
+        sender = mock.Mock()
+        s = TestService(drain_timeout=0.05, sender=sender)
+        s._has_running = True
+
+        with mock.patch.object(s, '_step', side_effect=s.stop):
+            s._loop_step()
+        # the timer of the finished step doesn't fire later
+        time.sleep(0.1)
+
+        self.assertNotIn('error_type', sender.send_event.call_args[0][0])
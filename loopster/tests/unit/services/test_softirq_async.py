@@ -0,0 +1,208 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import asyncio
+import unittest
+
+import mock
+
+from loopster import exceptions
+from loopster.services import softirq_async
+
+
+class AsyncService(softirq_async.AsyncSoftIrqService):
+    steps_to_stop = 8
+    step_duration = 0.05
+
+    def __init__(self, **kwargs):
+        super(AsyncService, self).__init__(**kwargs)
+        self.running = 0
+        self.max_running = 0
+        self.started = 0
+        self.cancelled = 0
+
+    async def _step(self):
+        self.started += 1
+        if self.started >= self.steps_to_stop:
+            self.stop()
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.step_duration)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.running -= 1
+
+
+class AsyncWatchDog(object):
+
+    def __init__(self):
+        self.entered = 0
+        self.exited = 0
+
+    async def __aenter__(self):
+        self.entered += 1
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.exited += 1
+
+
+class AsyncSoftIrqServiceTestCase(unittest.TestCase):
+
+    def _cancel_serving(self, s, stop_first):
+        async def cancel_serving():
+            task = asyncio.ensure_future(s.serve_async())
+            await asyncio.sleep(0.05)
+            if stop_first:
+                s.stop()
+                await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.wait([task], timeout=1)
+            return task
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(cancel_serving())
+        finally:
+            loop.close()
+
+    def test_invalid_max_inflight(self):
+        self.assertRaises(ValueError, AsyncService, max_inflight=0)
+
+    def test_concurrent_steps(self):
+        sender = mock.Mock()
+        s = AsyncService(step_period=0, max_inflight=3,
+                         sender=sender)
+
+        s.serve()
+
+        self.assertEqual(0, s.running)
+        self.assertEqual(0, s.cancelled)
+        self.assertEqual(3, s.max_running)
+        events = [c[0][0] for c in sender.send_event.call_args_list]
+        self.assertEqual(s._iteration_number, len(events))
+        self.assertEqual(list(range(len(events))),
+                         sorted(e['iteration'] for e in events))
+        self.assertEqual(len(events), s.get_stats()['count'])
+
+    def test_drain_timeout(self):
+        s = AsyncService(step_period=0, max_inflight=4, drain_timeout=0.05)
+        s.step_duration = 10
+        s.steps_to_stop = 4
+
+        with mock.patch.object(s, '_send_exc_step_event') as err_send:
+            s.serve()
+
+        self.assertEqual(0, s.running)
+        self.assertEqual(s.started, s.cancelled)
+        self.assertEqual(s.started, err_send.call_count)
+        self.assertTrue(all(c[1]['error_type'] is exceptions.StepTimeout
+                            for c in err_send.call_args_list))
+
+    def test_drain_finished_steps(self):
+        s = AsyncService(step_period=0, max_inflight=4, drain_timeout=5)
+        s.steps_to_stop = 4
+
+        with mock.patch.object(s, '_send_exc_step_event') as err_send:
+            s.serve()
+
+        self.assertEqual(0, s.cancelled)
+        err_send.assert_not_called()
+
+    def test_cancel_aborts_steps(self):
+        s = AsyncService(step_period=0, max_inflight=2)
+        s.step_duration = 100
+
+        task = self._cancel_serving(s, stop_first=False)
+
+        self.assertTrue(task.cancelled())
+        self.assertEqual(2, s.started)
+        self.assertEqual(s.started, s.cancelled)
+
+    def test_cancel_aborts_drain(self):
+        s = AsyncService(step_period=0, max_inflight=2)
+        s.step_duration = 100
+
+        task = self._cancel_serving(s, stop_first=True)
+
+        self.assertTrue(task.cancelled())
+        self.assertEqual(2, s.started)
+        self.assertEqual(s.started, s.cancelled)
+
+    def test_step_error(self):
+        s = AsyncService(step_period=0)
+
+        async def step():
+            s.stop()
+            raise ValueError()
+
+        with mock.patch.object(s, '_send_exc_step_event') as err_send:
+            with mock.patch.object(s, '_step', side_effect=step):
+                s.serve()
+
+        err_send.assert_called_once()
+
+    def test_signum_handler_error(self):
+        s = AsyncService(step_period=0)
+
+        with mock.patch.object(s, '_on_signum', side_effect=ValueError):
+            s.serve()
+
+        self.assertEqual(s.steps_to_stop, s.started)
+
+    def test_step_own_timeout_error(self):
+        s = AsyncService(step_period=0)
+
+        async def step():
+            s.stop()
+            raise asyncio.TimeoutError()
+
+        with mock.patch.object(s, '_send_exc_step_event') as err_send:
+            with mock.patch.object(s, '_step', side_effect=step):
+                s.serve()
+
+        self.assertEqual(asyncio.TimeoutError,
+                         err_send.call_args[1]['error_type'])
+
+    def test_step_timeout(self):
+        s = AsyncService(step_period=0, step_timeout=0.01)
+        s.step_duration = 5
+        s.steps_to_stop = 1
+
+        with mock.patch.object(s, '_send_exc_step_event') as err_send:
+            s.serve()
+
+        self.assertEqual(1, s.cancelled)
+        self.assertEqual(exceptions.StepTimeout,
+                         err_send.call_args[1]['error_type'])
+
+    def test_async_watchdog(self):
+        watchdog = AsyncWatchDog()
+        watchdog.generate_heartbeat = mock.Mock()
+        watchdog.teardown = mock.Mock()
+        s = AsyncService(step_period=0, max_inflight=2,
+                         watchdog=watchdog)
+        watchdog = s.get_watchdog()
+
+        s.serve()
+
+        self.assertEqual(s.started, watchdog.entered)
+        self.assertLessEqual(watchdog.exited, watchdog.entered)
+        self.assertEqual(s.started, watchdog.generate_heartbeat.call_count)
@@ -0,0 +1,109 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+import unittest
+
+import mock
+
+from loopster.services import softirq_concurrent
+
+
+class ConcurrentService(softirq_concurrent.ConcurrentSoftIrqService):
+    steps_to_stop = 8
+
+    def __init__(self, **kwargs):
+        super(ConcurrentService, self).__init__(**kwargs)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.started = 0
+
+    def _step(self):
+        with self.lock:
+            self.started += 1
+            if self.started >= self.steps_to_stop:
+                self.stop()
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+
+
+class ConcurrentSoftIrqServiceTestCase(unittest.TestCase):
+
+    def test_invalid_max_inflight(self):
+        self.assertRaises(ValueError, ConcurrentService, max_inflight=0)
+
+    def test_concurrent_steps(self):
+        sender = mock.Mock()
+        s = ConcurrentService(step_period=0, max_inflight=3, sender=sender)
+
+        s.serve()
+
+        # all dispatched steps are finished on stop
+        self.assertEqual(0, s.running)
+        self.assertEqual(0, s._inflight)
+        self.assertEqual(3, s.max_running)
+        events = [c[0][0] for c in sender.send_event.call_args_list]
+        self.assertEqual(s._iteration_number, len(events))
+        self.assertEqual(list(range(len(events))),
+                         sorted(e['iteration'] for e in events))
+        self.assertTrue(all(e['worker_id'].startswith('ConcurrentService')
+                            for e in events))
+        self.assertEqual(len(events), s.get_stats()['count'])
+
+    def test_step_error(self):
+        s = ConcurrentService(step_period=0, max_inflight=2)
+
+        def step():
+            s.stop()
+            raise ValueError()
+
+        with mock.patch.object(s, '_send_exc_step_event') as err_send:
+            with mock.patch.object(s, '_step', side_effect=step):
+                s.serve()
+
+        err_send.assert_called()
+
+
+class SharedWatchDogContextTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.watchdog = mock.MagicMock()
+        self.context = softirq_concurrent._SharedWatchDogContext(
+            self.watchdog, threading.Lock())
+
+    def test_exit_by_last_step(self):
+        with self.context:
+            with self.context:
+                pass
+            self.watchdog.__exit__.assert_not_called()
+
+        self.assertEqual(2, self.watchdog.__enter__.call_count)
+        self.watchdog.__exit__.assert_called_once()
+
+    def test_enter_error(self):
+        self.watchdog.__enter__.side_effect = [None, ValueError()]
+
+        with self.context:
+            self.assertRaises(ValueError, self.context.__enter__)
+
+        self.watchdog.__exit__.assert_called_once()
@@ -0,0 +1,136 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import queue
+import threading
+import time
+import unittest
+
+import mock
+
+from loopster.services import softirq_queue
+
+
+class QueueService(softirq_queue.QueueSoftIrqService):
+    items_to_stop = 10
+
+    def __init__(self, **kwargs):
+        super(QueueService, self).__init__(**kwargs)
+        self.batches = []
+
+    def _step(self, batch):
+        self.batches.append(list(batch))
+        if sum(len(b) for b in self.batches) >= self.items_to_stop:
+            self.stop()
+
+
+class WorkQueueTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = softirq_queue.WorkQueue(maxsize=3)
+
+    def test_get_batch(self):
+        for i in range(3):
+            self.queue.put(i)
+
+        self.assertEqual(3, self.queue.qsize())
+        self.assertTrue(self.queue.waker.wait(0))
+        self.assertEqual([0, 1], self.queue.get_batch(2))
+        self.assertEqual([2], self.queue.get_batch(2))
+        self.assertEqual([], self.queue.get_batch(2))
+        self.assertEqual(0, self.queue.qsize())
+
+    def test_full(self):
+        for i in range(3):
+            self.queue.put(i)
+
+        self.assertRaises(queue.Full, self.queue.put, 3, block=False)
+
+    def test_full_keeps_depth(self):
+        for i in range(3):
+            self.queue.put(i)
+
+        self.assertRaises(queue.Full, self.queue.put, 3, timeout=0.01)
+        self.assertEqual(3, self.queue.qsize())
+
+    def test_depth_isnt_repaired(self):
+        self.queue._depth.value = 1
+
+        self.assertEqual([], self.queue.get_batch(2))
+        self.assertEqual(1, self.queue.qsize())
+
+        self.queue.put(0)
+
+        self.assertEqual([0], self.queue.get_batch(2))
+        self.assertEqual(1, self.queue.qsize())
+
+
+class QueueSoftIrqServiceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = softirq_queue.WorkQueue()
+
+    def test_invalid_args(self):
+        self.assertRaises(ValueError, QueueService, queue=self.queue,
+                          max_batch=0)
+        self.assertRaises(ValueError, QueueService, queue=self.queue,
+                          step_period=0)
+
+    def test_batches(self):
+        sender = mock.Mock()
+        s = QueueService(queue=self.queue, max_batch=4, sender=sender)
+        for i in range(10):
+            self.queue.put(i)
+
+        s.serve()
+
+        self.assertEqual([[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]], s.batches)
+        self.assertEqual(
+            [4, 4, 2],
+            [c[0][0]['batch_size'] for c in sender.send_event.call_args_list])
+        self.assertEqual(0, s.get_stats()['queue_depth'])
+
+    def test_push_wakes_up(self):
+        s = QueueService(queue=self.queue, step_period=10, max_linger=0.05)
+
+        def produce():
+            for i in range(10):
+                self.queue.put(i)
+                time.sleep(0.01)
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        started = time.monotonic()
+        s.serve()
+        thread.join()
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(list(range(10)), sum(s.batches, []))
+        # items arriving within the linger time are batched
+        self.assertLess(len(s.batches), 10)
+
+    def test_idle_heartbeat(self):
+        s = QueueService(queue=self.queue, step_period=0.01)
+        timer = threading.Timer(0.1, s.stop)
+
+        with mock.patch.object(s, '_generate_heartbeat') as heartbeat:
+            timer.start()
+            s.serve()
+
+        self.assertGreater(heartbeat.call_count, 1)
+        self.assertEqual([], s.batches)
@@ -0,0 +1,76 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from loopster import profiler
+
+
+def busy_loop(duration):
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        pass
+
+
+class SamplingProfilerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        self.profiler = profiler.SamplingProfiler(
+            output_dir=os.path.join(self.output_dir, 'profiles'),
+            interval=0.001)
+
+    def test_profile(self):
+        path = self.profiler.start(name='unit')
+        busy_loop(0.1)
+
+        self.assertTrue(self.profiler.is_running)
+        self.assertEqual(path, self.profiler.stop())
+        self.assertFalse(self.profiler.is_running)
+        self.assertTrue(os.path.basename(path).startswith('unit.'))
+        with open(path) as f:
+            lines = f.read().splitlines()
+        stacks = dict(line.rsplit(' ', 1) for line in lines)
+        busy_stacks = [stack for stack in stacks if ':busy_loop' in stack]
+        self.assertTrue(busy_stacks)
+        self.assertTrue(all(stack.startswith('MainThread;')
+                            for stack in busy_stacks))
+        self.assertTrue(all(int(count) > 0 for count in stacks.values()))
+
+    def test_duration(self):
+        p = profiler.SamplingProfiler(output_dir=self.output_dir,
+                                      duration=0.01, interval=0.001)
+        path = p.start(name='unit')
+        p._thread.join(5)
+
+        self.assertFalse(p.is_running)
+        self.assertTrue(os.path.exists(path))
+
+    def test_double_start(self):
+        self.profiler.start(name='unit')
+        self.addCleanup(self.profiler.stop)
+
+        self.assertRaises(RuntimeError, self.profiler.start, name='unit')
+
+    def test_stop_not_started(self):
+        self.assertIsNone(self.profiler.stop())
@@ -0,0 +1,159 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import threading
+import time
+import unittest
+
+import mock
+
+from loopster import senders
+
+
+class FakeSender(object):
+
+    def __init__(self):
+        self.events = []
+
+    def send_event(self, event_data):
+        self.events.append(event_data)
+
+
+class FakeBatchSender(FakeSender):
+
+    def __init__(self):
+        super(FakeBatchSender, self).__init__()
+        self.batches = []
+
+    def send_events(self, events):
+        self.batches.append(events)
+        self.events.extend(events)
+
+
+class BufferedSenderTestCase(unittest.TestCase):
+
+    def test_unknown_overflow_policy(self):
+        self.assertRaises(ValueError, senders.BufferedSender,
+                          sender=FakeSender(), overflow_policy='unknown')
+
+    def test_send_and_flush(self):
+        sender = FakeSender()
+        buffered = senders.BufferedSender(sender=sender, flush_interval=60)
+
+        for i in range(3):
+            buffered.send_event({'i': i})
+
+        self.assertTrue(buffered.flush(timeout=10))
+        self.assertEqual([{'i': 0}, {'i': 1}, {'i': 2}], sender.events)
+        self.assertEqual(
+            {'queued': 0, 'sent': 3, 'failed': 0, 'dropped': 0},
+            buffered.get_stats())
+
+    def test_batches(self):
+        sender = FakeBatchSender()
+        buffered = senders.BufferedSender(sender=sender, flush_interval=60,
+                                          flush_size=2)
+
+        for i in range(5):
+            buffered.send_event(i)
+        buffered.flush(timeout=10)
+
+        self.assertEqual(list(range(5)), sender.events)
+        self.assertTrue(all(len(b) <= 2 for b in sender.batches))
+
+    def test_failed(self):
+        sender = mock.Mock(spec=['send_event'])
+        sender.send_event.side_effect = [ValueError(), None]
+        buffered = senders.BufferedSender(sender=sender, flush_interval=60)
+
+        buffered.send_event(1)
+        buffered.send_event(2)
+        buffered.flush(timeout=10)
+
+        stats = buffered.get_stats()
+        self.assertEqual(1, stats['failed'])
+        self.assertEqual(1, stats['sent'])
+
+    def _blocked_sender(self):
+        unblock = threading.Event()
+        sender = FakeSender()
+        sender.send_event = mock.Mock(
+            side_effect=lambda e: unblock.wait(10))
+        return sender, unblock
+
+    def test_drop_oldest(self):
+        sender, unblock = self._blocked_sender()
+        buffered = senders.BufferedSender(sender=sender, max_queue_size=2,
+                                          flush_size=1, flush_interval=0)
+
+        buffered.send_event(0)
+        # wait for the first event to be taken by the sending thread
+        buffered.flush(timeout=0.5)
+        for i in range(1, 5):
+            buffered.send_event(i)
+        unblock.set()
+        buffered.flush(timeout=10)
+
+        self.assertEqual([mock.call(0), mock.call(3), mock.call(4)],
+                         sender.send_event.call_args_list)
+        self.assertEqual(2, buffered.get_stats()['dropped'])
+
+    def test_block_timeout(self):
+        sender, unblock = self._blocked_sender()
+        buffered = senders.BufferedSender(sender=sender, max_queue_size=1,
+                                          flush_size=1, flush_interval=0,
+                                          overflow_policy=senders.BLOCK,
+                                          block_timeout=0.01)
+
+        buffered.send_event(0)
+        buffered.flush(timeout=0.5)
+        buffered.send_event(1)
+        buffered.send_event(2)
+        unblock.set()
+        buffered.flush(timeout=10)
+
+        self.assertEqual([mock.call(0), mock.call(1)],
+                         sender.send_event.call_args_list)
+        self.assertEqual(1, buffered.get_stats()['dropped'])
+
+    def test_started_once_by_concurrent_callers(self):
+        buffered = senders.BufferedSender(sender=FakeSender())
+        callers = [threading.Thread(target=buffered.send_event, args=(i,))
+                   for i in range(4)]
+        pid = os.getpid()
+
+        def slow_getpid():
+            # let all callers check the pid before any of them starts
+            time.sleep(0.05)
+            return pid
+
+        with mock.patch('threading.Thread') as thread_cls:
+            with mock.patch('os.getpid', side_effect=slow_getpid):
+                for caller in callers:
+                    caller.start()
+                for caller in callers:
+                    caller.join()
+
+        thread_cls.assert_called_once()
+        self.assertEqual(4, buffered.get_stats()['queued'])
+
+    def test_flush_not_started(self):
+        buffered = senders.BufferedSender(sender=FakeSender())
+
+        self.assertTrue(buffered.flush())
@@ -0,0 +1,91 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+import unittest
+
+from loopster import stats
+
+
+MS = 1000000
+
+
+class BucketsTestCase(unittest.TestCase):
+
+    def test_bucket_boundaries(self):
+        prev_index = -1
+        for value in range(0, 1 << 12):
+            index = stats._bucket_index(value)
+            self.assertIn(index - prev_index, (0, 1))
+            prev_index = index
+
+    def test_relative_error(self):
+        for value in [1, 15, 16, 100, 12345, 10 ** 9]:
+            approx = stats._bucket_value(stats._bucket_index(value))
+            self.assertLessEqual(abs(approx - value), value / 16.0)
+
+
+class StepHistogramTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.histogram = stats.StepHistogram()
+
+    def test_empty(self):
+        self.assertEqual(
+            {'count': 0, 'overruns': 0, 'skipped': 0, 'missed': 0, 'max': 0,
+             'mean': 0, 'p50': 0, 'p90': 0, 'p99': 0},
+            self.histogram.snapshot())
+
+    def test_percentiles(self):
+        for i in range(1, 101):
+            self.histogram.record(i * MS, overrun=i > 95)
+        self.histogram.record_skipped()
+        self.histogram.record_missed(3)
+
+        snapshot = self.histogram.snapshot()
+
+        self.assertEqual(100, snapshot['count'])
+        self.assertEqual(5, snapshot['overruns'])
+        self.assertEqual(1, snapshot['skipped'])
+        self.assertEqual(3, snapshot['missed'])
+        self.assertAlmostEqual(0.1, snapshot['max'])
+        self.assertAlmostEqual(0.0505, snapshot['mean'])
+        self.assertAlmostEqual(0.05, snapshot['p50'], delta=0.05 / 16)
+        self.assertAlmostEqual(0.09, snapshot['p90'], delta=0.09 / 16)
+        self.assertAlmostEqual(0.099, snapshot['p99'], delta=0.099 / 16)
+
+    def test_single_value(self):
+        self.histogram.record(3 * MS)
+
+        snapshot = self.histogram.snapshot()
+
+        self.assertEqual(snapshot['max'], snapshot['p50'])
+        self.assertEqual(snapshot['max'], snapshot['p99'])
+
+    def test_huge_value(self):
+        self.histogram.record(10 ** 20)
+
+        self.assertEqual(1, self.histogram.snapshot()['count'])
+
+    def test_shared_with_child_process(self):
+        process = multiprocessing.Process(target=self.histogram.record,
+                                          args=(5 * MS,))
+        process.start()
+        process.join()
+
+        self.assertEqual(1, self.histogram.snapshot()['count'])
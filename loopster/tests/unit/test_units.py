@@ -0,0 +1,58 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+from loopster import units
+
+
+class RecyclePolicyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = units.RecyclePolicy(max_iterations=100,
+                                          max_rss=1024, max_lifetime=60)
+
+    def test_within_limits(self):
+        self.assertIsNone(self.policy.get_reason(iterations=99, rss=1000,
+                                                 lifetime=59))
+
+    def test_exceeded_limits(self):
+        self.assertIn('iterations', self.policy.get_reason(
+            iterations=100, rss=1000, lifetime=59))
+        self.assertIn('rss', self.policy.get_reason(
+            iterations=99, rss=2048, lifetime=59))
+        self.assertIn('lifetime', self.policy.get_reason(
+            iterations=99, rss=1000, lifetime=61))
+
+    def test_unknown_values(self):
+        self.assertIsNone(self.policy.get_reason(iterations=None, rss=None,
+                                                 lifetime=59))
+
+    def test_scale(self):
+        self.assertIsNotNone(self.policy.get_reason(iterations=50, rss=None,
+                                                    lifetime=0, scale=0.5))
+
+    def test_jitter(self):
+        policy = units.RecyclePolicy(max_iterations=100, jitter=0.2)
+        scales = [policy.get_scale() for _ in range(100)]
+
+        self.assertTrue(all(0.8 <= scale <= 1 for scale in scales))
+        self.assertEqual(1, self.policy.get_scale())
+
+    def test_invalid_jitter(self):
+        self.assertRaises(ValueError, units.RecyclePolicy, jitter=1)
@@ -0,0 +1,83 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+# Copyright 2026 Mail.ru Group
+#
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import threading
+import time
+import unittest
+
+import mock
+
+from loopster import wakeup
+
+
+class WakerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.waker = wakeup.Waker()
+
+    def tearDown(self):
+        self.waker.close()
+
+    def test_timeout(self):
+        start = time.monotonic()
+
+        self.assertFalse(self.waker.wait(0.05))
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_pending_wakeup(self):
+        self.waker.wakeup()
+        self.waker.wakeup()
+
+        self.assertTrue(self.waker.wait(0))
+        # all pending wakeups are consumed at once
+        self.assertFalse(self.waker.wait(0))
+
+    def test_wakeup_from_thread(self):
+        timer = threading.Timer(0.05, self.waker.wakeup)
+        timer.start()
+        start = time.monotonic()
+
+        self.assertTrue(self.waker.wait(10))
+        self.assertLess(time.monotonic() - start, 5)
+        timer.join()
+
+    def test_reader(self):
+        rfd, wfd = os.pipe()
+        self.addCleanup(os.close, rfd)
+        self.addCleanup(os.close, wfd)
+        callback = mock.Mock(side_effect=lambda: os.read(rfd, 1))
+        self.waker.add_reader(rfd, callback)
+
+        self.assertFalse(self.waker.wait(0))
+        os.write(wfd, b'x')
+
+        self.assertTrue(self.waker.wait(0))
+        callback.assert_called_once_with()
+        self.assertFalse(self.waker.wait(0))
+
+        self.waker.remove_reader(rfd)
+        os.write(wfd, b'x')
+
+        self.assertFalse(self.waker.wait(0))
+
+    def test_close(self):
+        self.waker.close()
+
+        self.assertIsNone(self.waker.fileno())
+        self.waker.close()
@@ -15,18 +15,80 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import random
 import uuid
 
 
+class RecyclePolicy(object):
+    """Limits of a service launch, it's gracefully replaced on exceeding
+
+    Limits of every launch are randomly lowered by up to `jitter` fraction,
+    so services started together aren't recycled simultaneously.
+
+    :param max_iterations: max number of steps (including skipped ones)
+    :type max_iterations: int, optional
+    :param max_rss: max resident set size in bytes
+    :type max_rss: int, optional
+    :param max_lifetime: max lifetime in seconds
+    :type max_lifetime: float, optional
+    :param jitter: max fraction to lower limits by, defaults to 0
+    :type jitter: float, optional
+    :param start_timeout: max time for a replacement to get healthy,
+        defaults to 60
+    :type start_timeout: float, optional
+    """
+
+    def __init__(self, max_iterations=None, max_rss=None, max_lifetime=None,
+                 jitter=0, start_timeout=60):
+        super(RecyclePolicy, self).__init__()
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be in [0, 1): %r" % jitter)
+        self._max_iterations = max_iterations
+        self._max_rss = max_rss
+        self._max_lifetime = max_lifetime
+        self._jitter = jitter
+        self._start_timeout = start_timeout
+
+    def __repr__(self):
+        return ("RecyclePolicy(max_iterations=%r, max_rss=%r, "
+                "max_lifetime=%r, jitter=%r, start_timeout=%r)"
+                % (self._max_iterations, self._max_rss, self._max_lifetime,
+                   self._jitter, self._start_timeout))
+
+    @property
+    def start_timeout(self):
+        return self._start_timeout
+
+    def get_scale(self):
+        """Return random scale of limits for a new launch"""
+        return 1 - random.uniform(0, self._jitter)
+
+    def get_reason(self, iterations, rss, lifetime, scale=1):
+        """Return the reason to recycle the launch or None
+
+        Unknown (None) values aren't checked.
+        """
+        for name, value, limit in (
+                ('iterations', iterations, self._max_iterations),
+                ('rss', rss, self._max_rss),
+                ('lifetime', lifetime, self._max_lifetime)):
+            if value is not None and limit and value >= limit * scale:
+                return "%s %s exceeds %s" % (name, value, limit * scale)
+        return None
+
+
 class Unit(object):
 
-    def __init__(self, svc_class, svc_kwargs, state, unit_uuid=None):
+    def __init__(self, svc_class, svc_kwargs, state, unit_uuid=None,
+                 recycle=None, driver=None):
         super(Unit, self).__init__()
         self._uuid = unit_uuid or uuid.uuid4()
         self._svc_class = svc_class
         # TODO(g.melikov): use something like ReadOnlyDictProxy from RA here
         self._svc_kwargs = svc_kwargs
         self._state = state
+        self._recycle = recycle
+        self._driver = driver
 
     def __repr__(self):
         return ("Unit(unit_uuid=%r, svc_class=%r, svc_kwargs=%r, state=%r)"
@@ -44,6 +106,14 @@ class Unit(object):
     def svc_kwargs(self):
         return self._svc_kwargs  # TODO(d.burmistrov): read-only view
 
+    @property
+    def recycle(self):
+        return self._recycle
+
+    @property
+    def driver(self):
+        return self._driver
+
     @property
     def state(self):
         return self._state
@@ -0,0 +1,124 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+#
+#    Copyright 2026 Mail.ru Group
+#
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import errno
+import math
+import os
+import select
+
+
+_HAS_EVENTFD = hasattr(os, 'eventfd')
+_HAS_POLL = hasattr(select, 'poll')
+
+
+class Waker(object):
+    """Wakeup primitive for blocking serving loops
+
+    The waker is built on eventfd (or a self-pipe where eventfd is not
+    available), so it's created in a parent process and shared with a
+    forked child: any side may wake the loop up. `wakeup()` is safe to call
+    from signal handlers and other threads.
+
+    Other descriptors may be waited for along with wakeups by
+    `add_reader()`.
+    """
+
+    def __init__(self):
+        super(Waker, self).__init__()
+        if _HAS_EVENTFD:
+            self._rfd = self._wfd = os.eventfd(
+                0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        else:
+            self._rfd, self._wfd = os.pipe()
+            os.set_blocking(self._rfd, False)
+            os.set_blocking(self._wfd, False)
+        self._poller = None
+        self._readers = {}
+
+    def __del__(self):
+        self.close()
+
+    def fileno(self):
+        return self._rfd
+
+    def close(self):
+        rfd = getattr(self, '_rfd', None)
+        wfd = getattr(self, '_wfd', None)
+        self._rfd = self._wfd = None
+        for fd in {rfd, wfd} - {None}:
+            os.close(fd)
+
+    def add_reader(self, fd, callback):
+        """Interrupt `wait()` when `fd` is ready for reading
+
+        `callback()` is called by `wait()` and it must consume the
+        readiness of the descriptor.
+        """
+        self._readers[fd] = callback
+        self._poller = None
+
+    def remove_reader(self, fd):
+        self._readers.pop(fd, None)
+        self._poller = None
+
+    def wakeup(self):
+        """Interrupt current or next `wait()`"""
+        try:
+            os.write(self._wfd, b'\x01\x00\x00\x00\x00\x00\x00\x00')
+        except OSError as e:
+            # wakeup is pending already
+            if e.errno != errno.EAGAIN:
+                raise
+
+    def _drain(self):
+        try:
+            while os.read(self._rfd, 512):
+                pass
+        except OSError as e:
+            if e.errno != errno.EAGAIN:
+                raise
+
+    def _poll(self, timeout):
+        if not _HAS_POLL:
+            readable, _, _ = select.select(
+                [self._rfd] + list(self._readers), [], [], timeout)
+            return readable
+
+        if self._poller is None:
+            self._poller = select.poll()
+            self._poller.register(self._rfd, select.POLLIN)
+            for fd in self._readers:
+                self._poller.register(fd, select.POLLIN)
+        if timeout is not None:
+            # round up to avoid busy looping just before the deadline
+            timeout = int(math.ceil(timeout * 1000))
+        return [fd for fd, _ in self._poller.poll(timeout)]
+
+    def wait(self, timeout=None):
+        """Wait for wakeup, readiness of added readers or timeout
+
+        :param timeout: timeout in seconds, None waits forever
+        :type timeout: float, optional
+        :return: True if the waker has been woken up
+        """
+        ready = self._poll(timeout)
+        for fd in ready:
+            if fd == self._rfd:
+                self._drain()
+            else:
+                self._readers[fd]()
+        return bool(ready)